@@ -0,0 +1,42 @@
+import time
+from argparse import ArgumentParser
+
+from benchmarks.corpus import generate_c_source
+from naming_check.analyzers.c_analyzer import CAnalyzer
+
+
+def measure(code, repeat: int) -> float:
+    """
+    Measures the throughput of `CAnalyzer` over the given lines.
+
+    Args:
+        code (List[str]): The lines of C code to analyze.
+        repeat (int): The number of runs; the fastest one is kept.
+
+    Returns:
+        float: The number of lines analyzed per second in the fastest run.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        CAnalyzer(code).analyze()
+        best = min(best, time.perf_counter() - start)
+    return len(code) / best
+
+
+def main():
+    """
+    Runs the line classifier benchmark over a generated C corpus and prints its throughput.
+    """
+    parser = ArgumentParser(description="Measures the lines/sec of CAnalyzer on a generated C corpus.")
+    parser.add_argument("--lines", type=int, default=200000, help="Size of the generated corpus.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs; the fastest is reported.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the corpus generator.")
+    args = parser.parse_args()
+
+    code = generate_c_source(args.lines, args.seed)
+    print(f"CAnalyzer: {measure(code, args.repeat):,.0f} lines/sec over {len(code):,} lines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+import os
+import random
+from typing import Callable, Dict, List, Optional
+
+C_TYPES = ["int", "char", "float", "double", "long"]
+
+C_PRE_DECLARATION_TYPES = ["static", "extern", "unsigned"]
+
+WORDS = ["employee", "count", "buffer", "size", "total", "revenue", "item", "node", "value", "index"]
+
+
+def c_identifier(rng: random.Random) -> str:
+    """
+    Builds a random C identifier, mixing snake_case, camelCase, uppercase and one letter names.
+
+    Args:
+        rng (random.Random): The random generator used to build the identifier.
+
+    Returns:
+        str: The identifier.
+    """
+    words = rng.sample(WORDS, rng.randint(1, 3))
+    style = rng.random()
+    if style < 0.5:
+        return "_".join(words)
+    if style < 0.75:
+        return words[0] + "".join(word.capitalize() for word in words[1:])
+    if style < 0.9:
+        return "_".join(words).upper()
+    return rng.choice("abcdefghijklmnopqrstuvwxyz")
+
+
+def python_identifier(rng: random.Random) -> str:
+    """
+    Builds a random Python identifier, mixing snake_case, camelCase, uppercase and one letter names.
+
+    Args:
+        rng (random.Random): The random generator used to build the identifier.
+
+    Returns:
+        str: The identifier.
+    """
+    return c_identifier(rng)
+
+
+def c_block_comment(rng: random.Random, struct_types: List[str]) -> List[str]:
+    """
+    Generates a block comment spanning three lines.
+    """
+    return ["/*", f" * {' '.join(rng.sample(WORDS, 4))}", " */"]
+
+
+def c_line_comment(rng: random.Random, struct_types: List[str]) -> List[str]:
+    """
+    Generates a line comment.
+    """
+    return [f"// {' '.join(rng.sample(WORDS, 3))}"]
+
+
+def c_define(rng: random.Random, struct_types: List[str]) -> List[str]:
+    """
+    Generates a `#define` constant, not always in uppercase.
+    """
+    return [f"#define {c_identifier(rng)} {rng.randint(0, 1000)}"]
+
+
+def c_enum(rng: random.Random, struct_types: List[str]) -> List[str]:
+    """
+    Generates a one line enum declaration.
+    """
+    name = c_identifier(rng).capitalize() if rng.random() < 0.6 else c_identifier(rng)
+    members = ", ".join(c_identifier(rng).upper() for _ in range(3))
+    return [f"enum {name} {{{members}}};"]
+
+
+def c_typedef(rng: random.Random, struct_types: List[str]) -> List[str]:
+    """
+    Generates a typedef struct and remembers its name so declarations can use it.
+    """
+    name = c_identifier(rng)
+    struct_types.append(name)
+    code = ["typedef struct {"]
+    for _ in range(rng.randint(1, 4)):
+        code.append(f"    {rng.choice(C_TYPES)} {c_identifier(rng)};")
+    code.append(f"}} {name};")
+    return code
+
+
+def c_prototype(rng: random.Random, struct_types: List[str]) -> List[str]:
+    """
+    Generates a function prototype, sometimes static/extern or returning a pointer.
+    """
+    prefix = f"{rng.choice(C_PRE_DECLARATION_TYPES)} " if rng.random() < 0.3 else ""
+    pointer = "*" if rng.random() < 0.2 else ""
+    return [f"{prefix}{rng.choice(C_TYPES + ['void'])}{pointer} {c_identifier(rng)}();"]
+
+
+def c_function(rng: random.Random, struct_types: List[str]) -> List[str]:
+    """
+    Generates a function definition with local declarations and a `for` loop.
+    """
+    code = [f"{rng.choice(C_TYPES + ['void'])} {c_identifier(rng)}(int {c_identifier(rng)}) {{"]
+    for _ in range(rng.randint(1, 5)):
+        code.append(f"    {rng.choice(C_TYPES)} {c_identifier(rng)} = {rng.randint(0, 9)};")
+    code.append(f"    for(int i = 0; i < {rng.randint(1, 9)}; i++){{")
+    code.append('        printf("Hello World!");')
+    code.append("    }")
+    code.append("    return 0;")
+    code.append("}")
+    return code
+
+
+def c_declaration(rng: random.Random, struct_types: List[str]) -> List[str]:
+    """
+    Generates a declaration of one to three variables, mixing pointers and initializers.
+    """
+    variable_type = rng.choice(struct_types) if struct_types and rng.random() < 0.2 else rng.choice(C_TYPES)
+    variables = []
+    for _ in range(rng.randint(1, 3)):
+        variable = ("*" if rng.random() < 0.2 else "") + c_identifier(rng)
+        if rng.random() < 0.6:
+            variable += f" = {rng.randint(0, 100)}"
+        variables.append(variable)
+    return [f"{variable_type} {', '.join(variables)};"]
+
+
+def blank(rng: random.Random, state: List[str]) -> List[str]:
+    """
+    Generates an empty line.
+    """
+    return [""]
+
+
+def python_comment(rng: random.Random, state: List[str]) -> List[str]:
+    """
+    Generates a comment.
+    """
+    return [f"# {' '.join(rng.sample(WORDS, 3))}"]
+
+
+def python_assignment(rng: random.Random, state: List[str]) -> List[str]:
+    """
+    Generates a module-level assignment.
+    """
+    return [f"{python_identifier(rng)} = {rng.randint(0, 1000)}"]
+
+
+def python_unpacking(rng: random.Random, state: List[str]) -> List[str]:
+    """
+    Generates a tuple unpacking assignment.
+    """
+    return [f"{python_identifier(rng)}, {python_identifier(rng)} = {rng.randint(0, 9)}, {rng.randint(0, 9)}"]
+
+
+def python_annotated(rng: random.Random, state: List[str]) -> List[str]:
+    """
+    Generates an annotated assignment.
+    """
+    return [f"{python_identifier(rng)}: int = {rng.randint(0, 1000)}"]
+
+
+def python_class(rng: random.Random, state: List[str]) -> List[str]:
+    """
+    Generates a class with a docstring and a class attribute.
+    """
+    return [
+        f"class {python_identifier(rng).capitalize()}:",
+        f'    """{" ".join(rng.sample(WORDS, 4))}."""',
+        f"    {python_identifier(rng)} = {rng.randint(0, 9)}",
+        "",
+    ]
+
+
+def python_function(rng: random.Random, state: List[str]) -> List[str]:
+    """
+    Generates a function with arguments, a docstring, local assignments and a `for` loop.
+    """
+    code = [f"def {python_identifier(rng)}({python_identifier(rng)}, {python_identifier(rng)}):"]
+    if rng.random() < 0.5:
+        code.append(f'    """{" ".join(rng.sample(WORDS, 4))}."""')
+    else:
+        code.extend(['    """', f"    {' '.join(rng.sample(WORDS, 4))}.", '    """'])
+    for _ in range(rng.randint(1, 4)):
+        code.append(f"    {python_identifier(rng)} = {rng.randint(0, 9)}")
+    code.append(f"    for {python_identifier(rng)} in range({rng.randint(1, 9)}):")
+    code.append('        print("Hello world")')
+    code.append("    return None")
+    code.append("")
+    return code
+
+
+C_CONSTRUCTS: Dict[str, Callable[[random.Random, List[str]], List[str]]] = {
+    "block_comment": c_block_comment,
+    "line_comment": c_line_comment,
+    "define": c_define,
+    "enum": c_enum,
+    "typedef": c_typedef,
+    "prototype": c_prototype,
+    "function": c_function,
+    "declaration": c_declaration,
+    "blank": blank,
+}
+
+DEFAULT_C_MIX = {
+    "block_comment": 8,
+    "line_comment": 6,
+    "define": 8,
+    "enum": 6,
+    "typedef": 8,
+    "prototype": 10,
+    "function": 10,
+    "declaration": 30,
+    "blank": 14,
+}
+
+PYTHON_CONSTRUCTS: Dict[str, Callable[[random.Random, List[str]], List[str]]] = {
+    "comment": python_comment,
+    "assignment": python_assignment,
+    "unpacking": python_unpacking,
+    "annotated": python_annotated,
+    "class": python_class,
+    "function": python_function,
+    "blank": blank,
+}
+
+DEFAULT_PYTHON_MIX = {
+    "comment": 10,
+    "assignment": 25,
+    "unpacking": 5,
+    "annotated": 5,
+    "class": 10,
+    "function": 35,
+    "blank": 10,
+}
+
+
+def generate_source(
+    constructs: Dict[str, Callable], mix: Dict[str, float], header: List[str], lines: int, seed: int
+) -> List[str]:
+    """
+    Generates a reproducible synthetic source by drawing constructs until it is long enough.
+
+    Args:
+        constructs (Dict[str, Callable]): The generator of each construct.
+        mix (Dict[str, float]): The relative weight of each construct. Constructs left out
+                                are never generated.
+        header (List[str]): The lines the source starts with.
+        lines (int): The minimum number of lines to generate.
+        seed (int): The seed of the random generator, so the same corpus is produced every time.
+
+    Returns:
+        List[str]: The lines of the generated source.
+
+    Raises:
+        ValueError: If the mix names an unknown construct.
+    """
+    unknown = set(mix) - set(constructs)
+    if unknown:
+        raise ValueError(f"Unknown constructs: {', '.join(sorted(unknown))}")
+    rng = random.Random(seed)
+    names = [name for name in constructs if mix.get(name, 0) > 0]
+    weights = [mix[name] for name in names]
+    code = list(header)
+    state = []
+    while len(code) < lines:
+        code.extend(constructs[rng.choices(names, weights)[0]](rng, state))
+    return code
+
+
+def generate_c_source(lines: int, seed: int = 0, mix: Optional[Dict[str, float]] = None) -> List[str]:
+    """
+    Generates a reproducible synthetic C source with a realistic mix of constructs.
+
+    The source contains comments, constants, enums, typedef structs, function prototypes and
+    definitions, single and multi-variable declarations, pointers and statements.
+
+    Args:
+        lines (int): The minimum number of lines to generate.
+        seed (int): The seed of the random generator, so the same corpus is produced every time.
+        mix (Optional[Dict[str, float]]): The relative weight of each construct of
+                                          `C_CONSTRUCTS`. Defaults to `DEFAULT_C_MIX`.
+
+    Returns:
+        List[str]: The lines of the generated source.
+    """
+    return generate_source(C_CONSTRUCTS, mix or DEFAULT_C_MIX, ["#include <stdio.h>", ""], lines, seed)
+
+
+def generate_python_source(lines: int, seed: int = 0, mix: Optional[Dict[str, float]] = None) -> List[str]:
+    """
+    Generates a reproducible synthetic Python source with a realistic mix of constructs.
+
+    The source contains comments, module-level assignments, tuple unpacking, annotated
+    assignments, classes, functions with docstrings and arguments, and `for` loops.
+
+    Args:
+        lines (int): The minimum number of lines to generate.
+        seed (int): The seed of the random generator, so the same corpus is produced every time.
+        mix (Optional[Dict[str, float]]): The relative weight of each construct of
+                                          `PYTHON_CONSTRUCTS`. Defaults to `DEFAULT_PYTHON_MIX`.
+
+    Returns:
+        List[str]: The lines of the generated source.
+    """
+    return generate_source(PYTHON_CONSTRUCTS, mix or DEFAULT_PYTHON_MIX, ["import os", ""], lines, seed)
+
+
+def write_corpus(
+    directory: str,
+    files: int,
+    lines: int,
+    seed: int = 0,
+    c_mix: Optional[Dict[str, float]] = None,
+    python_mix: Optional[Dict[str, float]] = None,
+) -> List[str]:
+    """
+    Writes a reproducible tree of synthetic C and Python files, half of each.
+
+    Args:
+        directory (str): The directory the files are written to.
+        files (int): The number of files to write.
+        lines (int): The minimum number of lines of each file.
+        seed (int): The seed of the corpus; each file derives its own seed from it.
+        c_mix (Optional[Dict[str, float]]): The construct mix of the C files.
+        python_mix (Optional[Dict[str, float]]): The construct mix of the Python files.
+
+    Returns:
+        List[str]: The paths of the written files.
+    """
+    paths = []
+    for index in range(files):
+        subdirectory = os.path.join(directory, f"module_{index % 10}")
+        os.makedirs(subdirectory, exist_ok=True)
+        file_seed = seed * 1000003 + index
+        if index % 2 == 0:
+            path = os.path.join(subdirectory, f"file_{index}.c")
+            code = generate_c_source(lines, file_seed, c_mix)
+        else:
+            path = os.path.join(subdirectory, f"file_{index}.py")
+            code = generate_python_source(lines, file_seed, python_mix)
+        with open(path, "w") as file:
+            file.write("\n".join(code))
+            file.write("\n")
+        paths.append(path)
+    return paths
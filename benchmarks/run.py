@@ -0,0 +1,271 @@
+import json
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks import c_classifier, python_engines, startup
+from benchmarks.corpus import DEFAULT_C_MIX, DEFAULT_PYTHON_MIX, generate_c_source, generate_python_source, write_corpus
+from naming_check.analyzers.c_analyzer import CAnalyzer
+from naming_check.main import PYTHON_ENGINES, analyze_files, discover_files
+from naming_check.profiling import Profiler
+from naming_check.rules.registry import default_registry
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+RULE_IDS = frozenset(default_registry().rule_ids())
+
+DEFAULT_TOLERANCE = 0.1
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """
+    Parses a construct mix given as `name=weight` pairs separated by commas.
+
+    Args:
+        value (str): The mix, e.g. `declaration=30,function=10,blank=5`.
+
+    Returns:
+        Dict[str, float]: The weight of each construct.
+
+    Raises:
+        ValueError: If a pair has no weight or its weight is not a number.
+    """
+    mix = {}
+    for pair in value.split(","):
+        name, separator, weight = pair.partition("=")
+        if not separator:
+            raise ValueError(f"Expected name=weight, got {pair!r}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def peak_rss_megabytes() -> Optional[float]:
+    """
+    Returns the peak resident set size of the current process.
+
+    Returns:
+        Optional[float]: The peak RSS in megabytes, or None where `resource` is not available.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / (1 << 10)
+
+
+def measure_c(options: dict) -> float:
+    """
+    Measures the lines/sec of `CAnalyzer` over a generated C corpus.
+    """
+    code = generate_c_source(options["lines"], options["seed"], options["c_mix"])
+    return c_classifier.measure(code, options["repeat"])
+
+
+def measure_python(options: dict, engine: str) -> float:
+    """
+    Measures the lines/sec of a Python analysis engine over a generated Python corpus.
+    """
+    code = generate_python_source(options["lines"], options["seed"], options["python_mix"])
+    return python_engines.measure(PYTHON_ENGINES[engine], code, options["repeat"])
+
+
+def measure_files(options: dict, jobs: int) -> float:
+    """
+    Measures the files/sec of `analyze_files` over the generated corpus tree.
+    """
+    files = discover_files([options["directory"]])
+    best = float("inf")
+    for _ in range(options["repeat"]):
+        start = time.perf_counter()
+        for _ in analyze_files(files, jobs=jobs):
+            pass
+        best = min(best, time.perf_counter() - start)
+    return len(files) / best
+
+
+def measure_startup(options: dict) -> float:
+    """
+    Measures how many cold `naming_check file.c` runs complete per second, on a C file of
+    the generated tree.
+    """
+    path = min(path for path in discover_files([options["directory"]]) if path.endswith(".c"))
+    command, _ = startup.measure(path, max(options["repeat"], 10))
+    return 1000 / command
+
+
+MEASUREMENTS = {
+    "c.lines_per_sec": (measure_c, ()),
+    "python.regex.lines_per_sec": (measure_python, ("regex",)),
+    "python.ast.lines_per_sec": (measure_python, ("ast",)),
+    "files.sequential.files_per_sec": (measure_files, (1,)),
+    "files.parallel.files_per_sec": (measure_files, (0,)),
+    "startup.runs_per_sec": (measure_startup, ()),
+}
+
+
+def _measure_in_child(name: str, options: dict) -> Tuple[float, Optional[float]]:
+    """
+    Runs one measurement and reports the peak RSS of the process it ran in.
+    """
+    function, arguments = MEASUREMENTS[name]
+    return function(options, *arguments), peak_rss_megabytes()
+
+
+def measure_isolated(name: str, options: dict) -> Tuple[float, Optional[float]]:
+    """
+    Runs one measurement in a fresh process, so its peak RSS is not inflated by the others.
+
+    Args:
+        name (str): The name of the measurement in `MEASUREMENTS`.
+        options (dict): The options of the run.
+
+    Returns:
+        Tuple[float, Optional[float]]: The throughput and the peak RSS in megabytes.
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+        return executor.submit(_measure_in_child, name, options).result()
+
+
+def profile_rules(options: dict) -> Dict[str, float]:
+    """
+    Measures the time spent in each rule while analyzing the generated C and Python corpora.
+
+    Args:
+        options (dict): The options of the run.
+
+    Returns:
+        Dict[str, float]: The total seconds spent in each rule, slowest first.
+    """
+    profiler = Profiler()
+    python_code = generate_python_source(options["lines"], options["seed"], options["python_mix"])
+    analyzers = [CAnalyzer(generate_c_source(options["lines"], options["seed"], options["c_mix"]), "corpus.c")]
+    analyzers.extend(engine(python_code, f"corpus.{name}.py") for name, engine in PYTHON_ENGINES.items())
+    for analyzer in analyzers:
+        with profiler.profile(analyzer):
+            analyzer.analyze()
+    return {name: stats.seconds for name, stats in profiler.hot_rules() if name in RULE_IDS}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """
+    Compares a run against a saved baseline.
+
+    Throughputs regress when they drop, peak RSS regresses when it grows, each by more than
+    the tolerance. Measurements missing from either side are ignored.
+
+    Args:
+        results (dict): The results of the current run.
+        baseline (dict): The results of the baseline run.
+        tolerance (float): The accepted relative change, e.g. 0.1 for 10%.
+
+    Returns:
+        List[str]: A description of each regression.
+    """
+    regressions = []
+    for name, current in results["measurements"].items():
+        previous = baseline.get("measurements", {}).get(name)
+        if previous is None:
+            continue
+        if current["throughput"] < previous["throughput"] * (1 - tolerance):
+            regressions.append(f"{name}: {previous['throughput']:,.0f} -> {current['throughput']:,.0f}")
+        if current["peak_rss_mb"] and previous["peak_rss_mb"]:
+            if current["peak_rss_mb"] > previous["peak_rss_mb"] * (1 + tolerance):
+                regressions.append(
+                    f"{name} peak RSS: {previous['peak_rss_mb']:.1f} MB -> {current['peak_rss_mb']:.1f} MB"
+                )
+    return regressions
+
+
+def build_parser() -> ArgumentParser:
+    """
+    Builds the command line parser of the benchmark suite.
+
+    Returns:
+        ArgumentParser: The parser.
+    """
+    parser = ArgumentParser(description="Runs the naming_check benchmark suite on a generated corpus.")
+    parser.add_argument("--lines", type=int, default=100000, help="Size of the generated C and Python corpora.")
+    parser.add_argument("--files", type=int, default=200, help="Number of files of the generated tree.")
+    parser.add_argument("--file-lines", type=int, default=500, help="Size of each file of the generated tree.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs; the fastest is reported.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the corpus generator.")
+    parser.add_argument(
+        "--c-mix", type=parse_mix, help="Weights of the C constructs, e.g. declaration=30,function=10."
+    )
+    parser.add_argument(
+        "--python-mix", type=parse_mix, help="Weights of the Python constructs, e.g. function=35,class=10."
+    )
+    parser.add_argument(
+        "--only", action="append", choices=sorted(MEASUREMENTS), help="Run only the given measurement."
+    )
+    parser.add_argument("--no-rules", action="store_true", help="Skip the per-rule timings.")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Save the results as a baseline.")
+    parser.add_argument("--compare", metavar="PATH", help="Compare the results against a saved baseline.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"Relative change accepted by --compare (default: {DEFAULT_TOLERANCE}).",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Runs the benchmark suite, prints its results and optionally saves or compares a baseline.
+
+    Exits with status 1 when `--compare` finds a regression.
+    """
+    args = build_parser().parse_args(argv)
+    options = {
+        "lines": args.lines,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "c_mix": args.c_mix or DEFAULT_C_MIX,
+        "python_mix": args.python_mix or DEFAULT_PYTHON_MIX,
+    }
+    results = {"options": dict(options, files=args.files, file_lines=args.file_lines), "measurements": {}}
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_corpus(directory, args.files, args.file_lines, args.seed, args.c_mix, args.python_mix)
+        options["directory"] = directory
+        for name in args.only or MEASUREMENTS:
+            throughput, peak_rss = measure_isolated(name, options)
+            results["measurements"][name] = {"throughput": throughput, "peak_rss_mb": peak_rss}
+            rss = f"{peak_rss:8.1f} MB" if peak_rss is not None else "       n/a"
+            print(f"{name:<34} {throughput:>14,.0f}/sec   peak RSS {rss}")
+            sys.stdout.flush()
+
+    if not args.no_rules:
+        results["rules"] = profile_rules(options)
+        total = sum(results["rules"].values()) or 1
+        print("\nTime per rule:")
+        for rule, seconds in results["rules"].items():
+            print(f"  {rule:<56} {seconds * 1000:10.1f} ms {seconds / total:7.1%}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regression beyond {args.tolerance:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
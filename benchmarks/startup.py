@@ -0,0 +1,144 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from typing import List, Tuple
+
+import naming_check
+from benchmarks.corpus import generate_c_source
+
+# The time `naming_check file.c` may take on top of starting the interpreter, in milliseconds.
+DEFAULT_BUDGET_MS = 50.0
+
+# The console script of the package, run as `naming_check` is once installed.
+ENTRY_POINT = "from naming_check.main import analyze; analyze()"
+
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s*(\d+) \|\s*(\d+) \|( *)(\S+)$")
+
+
+def _environment() -> dict:
+    """
+    Returns the environment of the measured processes, in which the package being
+    benchmarked is importable.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(naming_check.__file__)))
+    path = os.environ.get("PYTHONPATH")
+    return dict(os.environ, PYTHONPATH=root if not path else os.pathsep.join((root, path)))
+
+
+def time_command(arguments: List[str], repeat: int) -> float:
+    """
+    Measures the wall time of a command, each run in a fresh process.
+
+    Args:
+        arguments (List[str]): The command and its arguments.
+        repeat (int): The number of runs; the fastest one is kept.
+
+    Returns:
+        float: The wall time of the fastest run, in milliseconds.
+    """
+    environment = _environment()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(arguments, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=environment)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def measure(path: str, repeat: int) -> Tuple[float, float]:
+    """
+    Measures the cold startup of `naming_check` on a single file.
+
+    Args:
+        path (str): The file to analyze.
+        repeat (int): The number of runs; the fastest one is kept.
+
+    Returns:
+        Tuple[float, float]: The wall time of `naming_check path` and of starting the bare
+                             interpreter, in milliseconds.
+    """
+    command = time_command([sys.executable, "-c", ENTRY_POINT, path], repeat)
+    interpreter = time_command([sys.executable, "-c", "pass"], repeat)
+    return command, interpreter
+
+
+def import_times(path: str) -> List[Tuple[str, int, int]]:
+    """
+    Breaks the imports of `naming_check path` down with `python -X importtime`.
+
+    Args:
+        path (str): The file to analyze.
+
+    Returns:
+        List[Tuple[str, int, int]]: Each module imported by the command, with the time
+                                    spent importing it alone and with its own imports, in
+                                    microseconds, in import order. Modules already imported
+                                    by the bare interpreter are left out.
+    """
+    def run(arguments: List[str]) -> List[Tuple[str, int, int]]:
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime"] + arguments,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            env=_environment(),
+            text=True,
+        )
+        modules = []
+        for line in process.stderr.splitlines():
+            match = IMPORT_TIME_PATTERN.match(line)
+            if match:
+                modules.append((match.group(4), int(match.group(1)), int(match.group(2))))
+        return modules
+
+    startup = {name for name, _, _ in run(["-c", "pass"])}
+    return [module for module in run(["-c", ENTRY_POINT, path]) if module[0] not in startup]
+
+
+def main(argv: List[str] = None):
+    """
+    Measures the cold startup of `naming_check` on a generated C file, prints the slowest
+    imports and exits with status 1 when the time spent on top of the interpreter exceeds
+    the budget.
+    """
+    parser = ArgumentParser(description="Measures the cold startup time of naming_check on a single file.")
+    parser.add_argument("--lines", type=int, default=200, help="Size of the generated C file.")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of runs; the fastest is reported.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the corpus generator.")
+    parser.add_argument("--top", type=int, default=15, help="Number of imports listed, slowest first.")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help=f"Milliseconds allowed on top of the interpreter startup (default: {DEFAULT_BUDGET_MS:g}).",
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "file.c")
+        with open(path, "w") as file:
+            file.write("\n".join(generate_c_source(args.lines, args.seed)))
+            file.write("\n")
+        command, interpreter = measure(path, args.repeat)
+        modules = import_times(path)
+
+    overhead = command - interpreter
+    print(f"naming_check file.c: {command:.1f} ms, interpreter {interpreter:.1f} ms, overhead {overhead:.1f} ms")
+    total = sum(own for _, own, _ in modules)
+    package = sum(own for name, own, _ in modules if name.split(".")[0] == "naming_check")
+    print(f"\n{len(modules)} modules imported in {total / 1000:.1f} ms, {package / 1000:.1f} ms of them in naming_check.")
+    print("Slowest imports (self / cumulative):")
+    for name, own, cumulative in sorted(modules, key=lambda module: module[1], reverse=True)[:args.top]:
+        print(f"  {name:<48} {own / 1000:8.1f} ms {cumulative / 1000:8.1f} ms")
+
+    if overhead > args.budget:
+        print(f"\nOver budget: {overhead:.1f} ms > {args.budget:g} ms")
+        sys.exit(1)
+    print(f"\nWithin budget: {overhead:.1f} ms <= {args.budget:g} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import asyncio
+import os
+from collections import deque, namedtuple
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AsyncIterator, Iterable, List, Optional, Tuple, Union
+
+from naming_check.main import DEFAULT_PYTHON_ENGINE, analyze_file, create_analyzer
+from naming_check.reader import iter_lines
+from naming_check.warning import NamingWarning
+
+# A file to analyze: its path, or a name and its content. The extension of the name selects
+# the analyzer, as for paths.
+Source = Union[str, Tuple[str, Union[str, bytes]]]
+
+AnalysisResult = namedtuple("AnalysisResult", ["name", "warnings", "error"])
+AnalysisResult.__doc__ = """
+The outcome of the analysis of a source.
+
+Attributes:
+    name (str): The path of the source, or the name it was given with.
+    warnings (List[NamingWarning]): The warnings found, empty when the analysis failed.
+    error (Optional[Exception]): The error that stopped the analysis, such as a
+                                 `FileNotFoundError` or a `TimeoutError`, or None.
+"""
+
+
+async def analyze_many(
+    sources: Iterable[Source],
+    jobs: int = 0,
+    timeout: Optional[float] = None,
+    max_pending: Optional[int] = None,
+    ordered: bool = True,
+    executor: Optional[Executor] = None,
+    **options,
+) -> AsyncIterator[AnalysisResult]:
+    """
+    Analyzes files or in-memory buffers without blocking the event loop.
+
+    The analyses run in a process pool, so large files do not stall the other coroutines
+    of the service. Results are streamed as an async iterator:
+
+        async for result in analyze_many(["src/", ("snippet.c", text)]):
+            ...
+
+    Sources are only submitted while fewer than `max_pending` results wait to be consumed,
+    so a slow consumer holds back the analysis instead of accumulating results, and the
+    sources themselves are read lazily. Breaking out of the loop, closing the iterator or
+    cancelling the task consuming it cancels the analyses not started yet.
+
+    Args:
+        sources (Iterable[Source]): The paths of the files, or `(name, content)` pairs whose
+                                    content is a string or bytes. Bytes are decoded as files
+                                    are (see `naming_check.reader`). Directories are not
+                                    expanded; use `discover_files` first.
+        jobs (int): The number of worker processes of the pool created for the call, `0`
+                    meaning one per CPU. At most `jobs` sources are analyzed at a time.
+        timeout (Optional[float]): The number of seconds an analysis may run. An analysis
+                                   that takes longer is reported with a `TimeoutError`; a
+                                   worker already running it finishes it in the background,
+                                   and keeps one of the `jobs` slots until then. The clock
+                                   starts when the source is submitted to the pool, which
+                                   is when a worker starts it unless a shared `executor`
+                                   is busy with other work.
+        max_pending (Optional[int]): The number of results buffered ahead of the consumer.
+                                     Defaults to twice the number of jobs.
+        ordered (bool): Whether results come in the order of `sources`. Otherwise they come
+                        as soon as they are ready.
+        executor (Optional[Executor]): A pool to run the analyses in, shared with other calls
+                                       and left open. A pool is created, and shut down at the
+                                       end, when not given.
+        **options: Keyword arguments forwarded to `analyze_file`, such as `python_engine`
+                   or `enabled_rules`.
+
+    Yields:
+        AnalysisResult: The outcome of each source. Errors are reported in the results
+                        rather than raised, so one bad file does not stop the batch.
+    """
+    loop = asyncio.get_running_loop()
+    jobs = jobs or os.cpu_count() or 1
+    max_pending = max_pending or 2 * jobs
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+    running = asyncio.Semaphore(jobs)
+
+    async def run(source: Source) -> AnalysisResult:
+        if isinstance(source, str):
+            name, function, arguments = source, _analyze_path, (source, options)
+        else:
+            name, content = source
+            function, arguments = _analyze_buffer, (name, content, options)
+        # The slot of a job is only freed when its worker is, even after a timeout: a source
+        # is then submitted when a worker is free to start it, so its clock does not run
+        # while it waits behind an analysis that timed out.
+        await running.acquire()
+        try:
+            future = loop.run_in_executor(executor, function, *arguments)
+        except BaseException:
+            running.release()
+            raise
+        future.add_done_callback(lambda _: running.release())
+        try:
+            warnings = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            return AnalysisResult(name, [], TimeoutError(f"The analysis of '{name}' took more than {timeout} seconds."))
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            return AnalysisResult(name, [], e)
+        return AnalysisResult(name, warnings, None)
+
+    sources = iter(sources)
+    pending = deque()
+    try:
+        while True:
+            while len(pending) < max_pending:
+                source = next(sources, None)
+                if source is None:
+                    break
+                pending.append(asyncio.ensure_future(run(source)))
+            if not pending:
+                return
+            if ordered:
+                task = pending.popleft()
+            else:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                task = next(task for task in pending if task in done)
+                pending.remove(task)
+            yield await task
+    finally:
+        for task in pending:
+            task.cancel()
+        if owns_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _analyze_path(path: str, options: dict) -> List[NamingWarning]:
+    """
+    Analyzes a file, in a worker process.
+    """
+    return analyze_file(path, **options)
+
+
+def _analyze_buffer(name: str, content: Union[str, bytes], options: dict) -> List[NamingWarning]:
+    """
+    Analyzes the content of a file, in a worker process.
+    """
+    lines = iter_lines(content) if isinstance(content, bytes) else content.splitlines()
+    analyzer = create_analyzer(
+        lines, name, options.get("python_engine", DEFAULT_PYTHON_ENGINE), options.get("enabled_rules")
+    )
+    return [] if analyzer is None else analyzer.analyze()
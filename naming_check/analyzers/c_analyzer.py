@@ -1,8 +1,22 @@
-import re 
-from typing import List
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
+from naming_check.analyzers.c_lexer import DIRECTIVE, IDENTIFIER, CLexer, Token
+from naming_check.baseline import INLINE_SUPPRESSIONS, Suppressions
 from naming_check.constants import FUNCTION_DECLARATION_TYPES, PRE_DECLARATION_TYPES, RESERVED_WORDS, VARIABLE_DECLARATION_TYPES
-from naming_check.rules.c_rules import all_constants_should_be_declared_in_uppercase, enums_should_be_pascal_case, functions_should_be_lower_cased, pointers_should_not_be_declared_with_non_pointers, rule_initialized_all_variables, struct_declaration_should_be_in_lower_case, struct_typedef_name_should_be_in_lower_case, variables_should_be_snake_cased, variables_should_have_length_greater_than_one
+from naming_check.rules.c_rules import parse_declaration, struct_name, struct_typedef_name
+from naming_check.rules.registry import C, Rule, default_registry
+from naming_check.warning import NamingWarning
+
+ENUM = 1
+CONSTANT = 2
+STRUCT = 4
+FUNCTION = 8
+VARIABLE = 16
+
+RESERVED_WORD_SET = frozenset(RESERVED_WORDS)
+FUNCTION_DECLARATION_TYPE_SET = frozenset(FUNCTION_DECLARATION_TYPES)
+PRE_DECLARATION_TYPE_SET = frozenset(PRE_DECLARATION_TYPES)
+VARIABLE_DECLARATION_TYPE_SET = frozenset(VARIABLE_DECLARATION_TYPES)
 
 class CAnalyzer:
     """
@@ -11,14 +25,43 @@ class CAnalyzer:
     This class provides methods to check for warnings related to variable and function naming conventions,
     struct and enum declarations, pointer and variable initialization, constants, and other
     predefined coding rules.
+
+    The code can be any iterable of lines, such as a list, an open file or a generator. It is
+    consumed once, as a stream, so memory use does not grow with the size of the input.
+
+    The rules are taken from the rule registry, grouped by the construct kind they consume.
+    Each construct is parsed once and every rule of its kind is run on the parsed result.
+
+    The struct types declared in other files, such as the headers the code includes, can be
+    given as `known_types` (see `naming_check.type_index`), so the variables declared with
+    them are checked too.
+
+    Warnings suppressed by a `// naming-check: ignore` comment on their line, or by the
+    baseline of `suppressions`, are dropped as they are raised.
     
     """
-    def __init__(self, code):
+    def __init__(
+        self,
+        code,
+        file=None,
+        rules: Optional[Dict[str, Tuple[Rule, ...]]] = None,
+        known_types: FrozenSet[str] = frozenset(),
+        suppressions: Optional[Suppressions] = None,
+    ):
         self.code = code
+        self.file = file
+        self.rules = rules if rules is not None else default_registry().dispatch(C)
+        self.known_types = known_types
+        self.suppressions = suppressions if suppressions is not None else INLINE_SUPPRESSIONS
+        self.current_text = ""
         self.current_line = 1
+        self.current_column = 1
         self.warnings = []
+        self.line_warnings = []
         self.struct_types = []
+        self.struct_type_set = set()
         self.is_watching_struct = False
+        self.lexer = CLexer()
         
     def analyze(self):
         """
@@ -27,17 +70,22 @@ class CAnalyzer:
         This method triggers the process of checking for warnings and returns a list of detected warnings.
 
         Returns:
-            list: A list of warning messages related to code style violations.
+            List[NamingWarning]: A list of warnings related to code style violations.
         """
         self.check_warnings()
         return self.warnings
-    
+
     def check_warnings(self):
+        """
+        Checks the whole code and adds every warning found to the `warnings` list.
+        """
+        self.warnings.extend(self.iter_warnings())
+
+    def iter_warnings(self):
         """
         Checks the code for various warnings related to coding standards and style guidelines.
 
-        This method iterates through each line of code and applies different style checks, such as:
-        - Comment checks
+        This method tokenizes each line of code with `CLexer` and applies different style checks, such as:
         - Struct declaration checks
         - Enum capitalization checks
         - Constant uppercase checks
@@ -45,254 +93,227 @@ class CAnalyzer:
         - Variable initialization checks
         - Pointer declaration checks
 
-        Any violations of the guidelines result in warning messages being added to the `warnings` list.
+        Comments and the continuation lines of preprocessor directives are skipped. Each
+        remaining line is classified once by `classify` and the handlers are dispatched from
+        that single result.
+
+        Warnings are yielded as soon as the line that raised them has been checked, so a
+        consumer can filter them or stop early without the rest of the code being analyzed.
+        When every rule is disabled, the code is not read at all.
+
+        Yields:
+            NamingWarning: Each violation of the guidelines, in line order.
         """
+        if not any(self.rules.values()):
+            return
         for line in self.code:
-            if self.is_comment(line):
-                self.current_line+=1
-                continue
-            if self.is_watching_struct:
-                self.struct_typedef_handler(line)
-            if "enum" in line:
-                self.enum_handler(line)
-            if "#define" in line:
-                self.constant_handler(line)
-            if self.is_struct_declaration(line):
-                self.struct_handler(line)
-            if self.is_function_declaration(line):
-                self.function_handler(line)
-            if self.is_variable_declaration(line, self.struct_types):
-                self.variable_handler(line)
+            self.check_line(line)
             self.current_line += 1
+            if self.line_warnings:
+                yield from self.line_warnings
+                self.line_warnings = []
+
+    def check_line(self, line: str) -> None:
+        """
+        Tokenizes one line of code and runs the handlers of the constructs it contains.
+
+        Args:
+            line (str): The line of code to be checked.
+        """
+        tokens = self.lexer.tokenize(line)
+        if not tokens or self.lexer.is_continuation:
+            return
+        self.current_text = line
+        self.current_column = tokens[0].column
+        kinds, variable_type = self.classify(tokens)
+        if self.is_watching_struct:
+            self.struct_typedef_handler(tokens)
+        rules = self.rules
+        if kinds & ENUM and rules["enum"]:
+            self.enum_handler(tokens)
+        if kinds & CONSTANT and rules["constant"]:
+            self.constant_handler(tokens)
+        if kinds & STRUCT:
+            self.struct_handler(tokens)
+        if kinds & FUNCTION and rules["function"]:
+            self.function_handler(tokens)
+        if kinds & VARIABLE and rules["declaration"] and (
+            variable_type in VARIABLE_DECLARATION_TYPE_SET
+            or variable_type in self.struct_type_set
+            or variable_type in self.known_types
+        ):
+            self.variable_handler(tokens)
+
+    def get_state(self) -> tuple:
+        """
+        Returns the state carried over from one line to the next, so the analysis can be
+        resumed at a line boundary, as in incremental re-analysis.
+
+        Returns:
+            tuple: The state of the lexer, whether a typedef struct is being watched for its
+                   name, and the struct types seen so far. States can be compared for equality.
+        """
+        return self.lexer.get_state(), self.is_watching_struct, tuple(self.struct_types)
+
+    def set_state(self, state: tuple) -> None:
+        """
+        Restores a state returned by `get_state`.
+
+        Args:
+            state (tuple): The state to restore.
+        """
+        lexer_state, self.is_watching_struct, struct_types = state
+        self.lexer.set_state(lexer_state)
+        self.struct_types = list(struct_types)
+        self.struct_type_set = set(struct_types)
+
+    def classify(self, tokens: List[Token]):
+        """
+        Classifies the tokens of a line of code in a single pass.
+
+        The result is a bit mask of the constructs found on the line (`ENUM`, `CONSTANT`,
+        `STRUCT`, `FUNCTION` and `VARIABLE`) along with the type of the possible variable
+        declaration. `VARIABLE` only means that the line has the shape of a declaration:
+        whether its type is known depends on the struct types seen so far, so it is checked
+        by the caller.
+
+        Args:
+            tokens (List[Token]): The tokens of the line of code to be classified.
+
+        Returns:
+            Tuple[int, str]: The bit mask of constructs and the declared variable type.
+        """
+        if tokens[0].kind == DIRECTIVE:
+            return (CONSTANT if tokens[0].text == "define" else 0), ""
+
+        texts = [token.text for token in tokens]
+        kinds = 0
+        if "enum" in texts:
+            kinds |= ENUM
+        if (texts[0] == "struct" or texts[:2] == ["typedef", "struct"]) and ";" not in texts:
+            kinds |= STRUCT
+
+        index = 0
+        while index < len(texts) and texts[index] in PRE_DECLARATION_TYPE_SET:
+            index += 1
+        if index == len(texts) or tokens[index].kind != IDENTIFIER:
+            return kinds, ""
+        declared_type = texts[index]
+        index += 2 if declared_type == "struct" else 1
+        while index < len(texts) and (texts[index] == "*" or texts[index] in VARIABLE_DECLARATION_TYPE_SET):
+            index += 1
+        if index >= len(texts) or tokens[index].kind != IDENTIFIER:
+            return kinds, ""
+
+        if index + 1 < len(texts) and texts[index + 1] == "(":
+            if declared_type in FUNCTION_DECLARATION_TYPE_SET:
+                kinds |= FUNCTION
+        elif RESERVED_WORD_SET.isdisjoint(texts):
+            kinds |= VARIABLE
+        return kinds, declared_type
             
-    def struct_typedef_handler(self, line) -> None:
+    def struct_typedef_handler(self, tokens) -> None:
         """
         Checks a line of code for potential struct typedef-related issues and appends relevant warnings.
 
         Args:
-            line (str): The line of code to be checked for struct typedef-related conventions.
+            tokens (List[Token]): The tokens of the line to be checked for struct typedef-related conventions.
     """
-        if "}" in line:
+        if any(token.text == "}" for token in tokens):
             self.is_watching_struct = False
-            warning = not struct_typedef_name_should_be_in_lower_case(
-                line, self.struct_types
-            )
-            if warning:
-                self.append_warning("Structs should be declared in lowercase.")
+            name = struct_typedef_name(tokens)
+            if name is not None:
+                self.add_struct_type(name.text)
+            self.run_rules("struct_typedef", tokens)
             
-    def enum_handler(self, line) -> None:
+    def enum_handler(self, tokens) -> None:
         """
             Checks a line of code for potential enum-related issues and appends relevant warnings.
 
             Args:
-                line (str): The line of code to be checked for enum-related conventions.
+                tokens (List[Token]): The tokens of the line to be checked for enum-related conventions.
         """
-        warning = not enums_should_be_pascal_case(line)
-        if warning:
-            self.append_warning("Enums declaration should be in pascalcase.")
+        self.run_rules("enum", tokens)
             
-    def constant_handler(self, line) -> None:
+    def constant_handler(self, tokens) -> None:
         """
             Checks a line of code for potential constant-related issues and appends relevant warnings.
 
             Args:
-                line (str): The line of code to be checked for constant-related conventions.
+                tokens (List[Token]): The tokens of the line to be checked for constant-related conventions.
         """
-        warning = not all_constants_should_be_declared_in_uppercase(line)
-        if warning:
-            self.append_warning("All constants should be declared in uppercase.")
+        self.run_rules("constant", tokens)
             
-    def struct_handler(self, line) -> None:
+    def struct_handler(self, tokens) -> None:
         """
             Checks a line of code for potential struct-related issues and appends relevant warnings.
 
+            The struct name is recorded as a type, whether or not any struct rule is enabled, so
+            the declarations that use it are still checked. An anonymous struct being typedef'd is
+            named after its body, so the following lines are watched for its name.
+
             Args:
-                line (str): The line of code to be checked for struct-related conventions.
+                tokens (List[Token]): The tokens of the line to be checked for struct-related conventions.
         """
-        warning = struct_declaration_should_be_in_lower_case(line, self.struct_types)
-        if warning is not None:
-            if not warning:
-                self.append_warning("Structs should be declared in lowercase.")
-        else:
+        name = struct_name(tokens)
+        if name is not None:
+            self.add_struct_type(name.text)
+        elif tokens[0].text == "typedef":
             self.is_watching_struct = True
+        self.run_rules("struct", tokens)
 
-    def function_handler(self, line) -> None:
+    def function_handler(self, tokens) -> None:
         """
             Checks a line of code for potential function-related issues and appends relevant warnings.
 
             Args:
-                line (str): The line of code to be checked for function-related conventions.
+                tokens (List[Token]): The tokens of the line to be checked for function-related conventions.
         """
-        warning = not functions_should_be_lower_cased(line)
-        if warning:
-            self.append_warning("Functions names should be declared in snakecase.")
+        self.run_rules("function", tokens)
         
-    def variable_handler(self, line) -> None:
+    def variable_handler(self, tokens) -> None:
         """
             Checks a line of code for potential variable-related issues and appends relevant warnings.
 
-            Args:
-                line (str): The line of code to be checked for variable-related conventions.
-        """
-        warning = not rule_initialized_all_variables(line)
-        if warning:
-            self.append_warning("If you initialize one variable, you should initialize the others.")
-        warning = not pointers_should_not_be_declared_with_non_pointers(line)
-        if warning:
-            self.append_warning("Pointers variables should not be declared with no pointers variables.")
-        warning = not variables_should_be_snake_cased(line)
-        if warning:
-            self.append_warning("Variables names should be declared in snake case.")
-        warning = not variables_should_have_length_greater_than_one(line)
-        if warning:
-            self.append_warning("Variables names should have length greater than one.")
-
-    def append_warning(self, warning_message) -> None:
-        """
-            Appends a warning message to the list of warnings with the current line number.
+            The declaration is parsed once into its declarators, which every declaration rule shares.
 
             Args:
-                warning_message (str): The warning message to be appended.
-        """
-        message = f"WARN: [{self.current_line}] {warning_message}"
-        self.warnings.append(message)
-
-    def has_numbers(self, input_string: str) -> bool:
+                tokens (List[Token]): The tokens of the line to be checked for variable-related conventions.
         """
-        Checks if the given string contains any numeric digits.
-
-        Args:
-            input_string (str): A string to be checked for numeric characters.
+        self.run_rules("declaration", parse_declaration(tokens))
 
-        Returns:
-            bool: True if the string contains any digits; False otherwise.
+    def run_rules(self, kind: str, *arguments) -> None:
         """
-        return any(char.isdigit() for char in input_string)
-
-    def contains_reserved_words(self, line) -> bool:
-        """
-            Checks if the given line contains any reserved words.
+            Runs every rule of a construct kind and appends a warning for each rule that fails.
 
             Args:
-                line (str): The line of code to check for reserved words.
-
-            Returns:
-                bool: True if the line contains any reserved words, False otherwise.
+                kind (str): The construct kind, as registered in the rule registry.
+                *arguments: The construct, as consumed by the rules of that kind.
         """
-        pattern = rf'\b(?:{"|".join(map(re.escape, RESERVED_WORDS))})\b'
-        return bool(re.search(pattern, line))
-    
-    def is_variable_declaration(self, line: str, struct_types: List[str]) -> bool:
-        """
-        Determines if the given line is a valid variable declaration.
+        for rule in self.rules[kind]:
+            if rule.check(*arguments) is False:
+                self.append_warning(rule.id)
 
-        Args:
-            line (str): A string representing a line of code to be checked.
-            struct_types (List[str]): A list of types representing structs in the code.
-
-        Returns:
-            bool: True if the line is a valid variable declaration (with valid type and variable name);
-                False otherwise.
+    def add_struct_type(self, name: str) -> None:
         """
-        can_be_variable_declaration = False
-        if "{" in line:
-            return False
-        
-        if self.contains_reserved_words(line):
-            return False
-        
-        contents = line.split(" ")
-        if len(contents) <= 1:
-            return False
-
-        variable_type = line.strip().split(" ")[0]
-        if variable_type in struct_types or variable_type in VARIABLE_DECLARATION_TYPES:
-            can_be_variable_declaration = True
-
-        if (
-            can_be_variable_declaration
-            and "return" not in contents[0]
-            and not self.has_numbers(contents[0])
-            and contents[1] is not None
-                and contents[1] != ""
-        ):
-            return True
-
+            Records a struct type, so the variables declared with it are checked.
 
-    def is_function_declaration(self, line: str) -> bool:
-        """
-        Determines if the given line is a valid function declaration.
-
-        Args:
-            line (str): A string representing a line of code to be checked.
-
-        Returns:
-            bool: True if the line matches a valid function declaration pattern (including return type, function name, and parentheses);
-                False otherwise.]
-    """
-        lines = line.split(" ")
-        can_be_function = False
-        return_function_type_index = 0
-        for pre_declaration_type in PRE_DECLARATION_TYPES:
-            if lines[0].strip() == pre_declaration_type:
-                return_function_type_index += 1
-                break
-        return_name = lines[return_function_type_index].replace(" ", "")
-        if len(return_name) == 0:
-            return False
-        pointers_count = return_name.count("*")
-        pointer_in_front = return_name[0] == "*"
-
-        for function_type in FUNCTION_DECLARATION_TYPES:
-            function_type_with_pointer = (
-                function_type
-                if pointers_count == 0
-                else (
-                    "*" * pointers_count + function_type
-                    if pointer_in_front
-                    else function_type + "*" * pointers_count
-                )
-            )
-            if return_name == function_type_with_pointer:
-                can_be_function = True
-                break
-        if not can_be_function:
-            return False
-        return True if can_be_function and ("(" in line and ")" in line) else False
-
-
-    def is_struct_declaration(self, line: str) -> bool:
+            Args:
+                name (str): The name of the struct type.
         """
-        Checks if the given line represents a struct declaration.
+        self.struct_types.append(name)
+        self.struct_type_set.add(name)
 
-        Args:
-            line (str): A string representing a line of code to be checked.
-
-        Returns:
-            bool: True if the line contains a struct declaration (indicated by the keyword "struct" and no semicolon);
-                False otherwise.
-         """
-        return True if "struct" in line and ";" not in line else False
-
-
-    def is_comment(self,declaration):
+    def append_warning(self, rule) -> None:
         """
-        Checks if the given declaration is a comment, supporting both single-line and multi-line comments.
+            Records a warning for the current line and column, unless it is suppressed. The
+            message is only formatted when the warning is displayed.
 
-        Args:
-            declaration (str): A string representing the line of code or declaration to be checked.
-
-        Returns:
-            bool: True if the declaration is a comment (single-line or multi-line); False otherwise.
+            Args:
+                rule (str): The identifier of the broken rule.
         """
-        line = declaration.strip()
-        if len(line) < 2:
-            return False
-        return (
-            True
-            if (line[0] == line[1] == "/")
-            or (line[0] == "/" and line[1] == "*")
-            or (line[0] == "*")
-            or (line[0] == "*" and line[1] == "/")
-            else False
-        )
\ No newline at end of file
+        if self.suppressions.is_suppressed(rule, self.current_text):
+            return
+        self.line_warnings.append(
+            NamingWarning(rule, self.current_line, self.current_column, self.file)
+        )
@@ -0,0 +1,131 @@
+import re
+from collections import namedtuple
+from typing import List, Tuple
+
+from naming_check.lazy import LazyPattern
+
+IDENTIFIER = "identifier"
+NUMBER = "number"
+STRING = "string"
+CHARACTER = "character"
+PUNCTUATION = "punctuation"
+DIRECTIVE = "directive"
+
+Token = namedtuple("Token", ["kind", "text", "column"])
+Token.__doc__ = """
+A lexical token of C code.
+
+Attributes:
+    kind (str): The kind of the token (`IDENTIFIER`, `NUMBER`, `STRING`, `CHARACTER`,
+                `PUNCTUATION` or `DIRECTIVE`).
+    text (str): The text of the token. For a `DIRECTIVE` it is the name of the directive,
+                such as `define`.
+    column (int): The column where the token starts, starting at 1.
+"""
+
+TOKEN_PATTERN = LazyPattern(
+    r"""
+    \s*(?:
+        (?P<line_comment>//.*)
+      | (?P<block_comment>/\*.*?(?:\*/|$))
+      | (?P<string>(?:L|u8|u|U)?"(?:[^"\\]|\\.)*"?)
+      | (?P<character>(?:L|u|U)?'(?:[^'\\]|\\.)*'?)
+      | (?P<identifier>[A-Za-z_]\w*)
+      | (?P<number>\.?\d(?:[eEpP][+-]|[\w.])*)
+      | (?P<punctuation>\.\.\.|<<=|>>=|->|\+\+|--|<<|>>|<=|>=|==|!=|&&|\|\||[-+*/%&|^]=|\#\#|\S)
+    )
+    """,
+    re.VERBOSE,
+)
+
+KINDS = {
+    "string": STRING,
+    "character": CHARACTER,
+    "identifier": IDENTIFIER,
+    "number": NUMBER,
+    "punctuation": PUNCTUATION,
+}
+
+
+class CLexer:
+    """
+    A streaming lexer that turns lines of C code into tokens.
+
+    Lines are fed one at a time and each character is scanned once. Comments, including
+    `/* */` spans over several lines, are dropped; string and character literals are kept as
+    single tokens so their content is never mistaken for code; preprocessor lines start with
+    a `DIRECTIVE` token and may continue over several lines with a trailing backslash.
+
+    """
+    def __init__(self):
+        self.in_comment = False
+        self.continues_directive = False
+        self.is_continuation = False
+
+    def tokenize(self, line: str) -> List[Token]:
+        """
+        Splits one line of C code into tokens, carrying the comment and directive state over
+        to the next line.
+
+        Args:
+            line (str): The line of code to be tokenized.
+
+        Returns:
+            List[Token]: The tokens of the line, without whitespace and comments.
+
+        Side Effects:
+            Updates `in_comment` when a block comment is left open, `is_continuation` when
+            the line continues the directive of the previous line and `continues_directive`
+            when the line is part of a directive ending with a backslash.
+        """
+        position = 0
+        if self.in_comment:
+            end = line.find("*/")
+            if end == -1:
+                self.is_continuation = False
+                return []
+            self.in_comment = False
+            position = end + 2
+
+        self.is_continuation = self.continues_directive
+        tokens = []
+        for match in TOKEN_PATTERN.finditer(line, position):
+            group = match.lastgroup
+            if group is None:
+                continue
+            text = match.group(group)
+            if group == "block_comment":
+                if len(text) < 4 or not text.endswith("*/"):
+                    self.in_comment = True
+                continue
+            if group == "line_comment":
+                continue
+            tokens.append(Token(KINDS[group], text, match.start(group) + 1))
+
+        is_directive = self.is_continuation
+        if not self.is_continuation and tokens and tokens[0].text == "#":
+            if len(tokens) > 1 and tokens[1].kind == IDENTIFIER:
+                tokens[0:2] = [Token(DIRECTIVE, tokens[1].text, tokens[0].column)]
+            else:
+                tokens[0] = Token(DIRECTIVE, "", tokens[0].column)
+            is_directive = True
+        self.continues_directive = is_directive and line.rstrip().endswith("\\")
+        return tokens
+
+    def get_state(self) -> Tuple[bool, bool]:
+        """
+        Returns the state carried over from one line to the next.
+
+        Returns:
+            Tuple[bool, bool]: Whether a block comment and a directive are left open.
+        """
+        return self.in_comment, self.continues_directive
+
+    def set_state(self, state: Tuple[bool, bool]) -> None:
+        """
+        Restores a state returned by `get_state`, to resume tokenizing at a line boundary.
+
+        Args:
+            state (Tuple[bool, bool]): The state to restore.
+        """
+        self.in_comment, self.continues_directive = state
@@ -1,20 +1,43 @@
 import re
+from typing import Dict, Optional, Tuple
 
-from naming_check.rules.py_rules import rule_names_should_be_snake_case, rule_variable_names_should_have_length_greater_than_one 
+from naming_check.baseline import INLINE_SUPPRESSIONS, Suppressions
+from naming_check.rules.registry import PYTHON, Rule, default_registry
+from naming_check.warning import NamingWarning
 class PythonAnalyzer:
     """
     A class responsible for analyzing Python code to detect style violations and coding standard issues.
 
     This class provides methods to check for warnings related to variable and function naming conventions.
+
+    The code can be any iterable of lines, such as a list, an open file or a generator. It is
+    consumed once, as a stream, so memory use does not grow with the size of the input.
+
+    The rules are taken from the rule registry, grouped by the construct kind they consume.
+
+    Warnings suppressed by a `# naming-check: ignore` comment on their line, or by the
+    baseline of `suppressions`, are dropped as they are raised.
     
     """
-    def __init__(self, code):
+    def __init__(
+        self,
+        code,
+        file=None,
+        rules: Optional[Dict[str, Tuple[Rule, ...]]] = None,
+        suppressions: Optional[Suppressions] = None,
+    ):
         self.warnings = []
+        self.line_warnings = []
         self.code = code
+        self.file = file
+        self.rules = rules if rules is not None else default_registry().dispatch(PYTHON)
+        self.suppressions = suppressions if suppressions is not None else INLINE_SUPPRESSIONS
+        self.current_text = ""
         self.multiline_string = False
         self.current_variable = None
         self.current_function = None
         self.current_line = 1
+        self.current_column = 1
     
     def analyze(self):
         """
@@ -23,13 +46,19 @@ class PythonAnalyzer:
         This method triggers the process of checking for warnings and returns a list of detected warnings.
 
         Returns:
-            list: A list of warning messages related to code style violations.
+            List[NamingWarning]: A list of warnings related to code style violations.
         """
         self.check_warnings()
         return self.warnings
                 
                 
     def check_warnings(self):
+        """
+        Analyzes the code for style violations and adds every warning found to the `warnings` list.
+        """
+        self.warnings.extend(self.iter_warnings())
+
+    def iter_warnings(self):
         """
         Analyzes the code for style violations, specifically focusing on variable and function name patterns.
 
@@ -37,21 +66,61 @@ class PythonAnalyzer:
         - Ensuring variable names follow the snake_case pattern.
         - Ensuring function names follow the snake_case pattern.
 
-        Any violations are added as warning messages to the `warnings` list.
+        Warnings are yielded as soon as the line that raised them has been checked, so a
+        consumer can filter them or stop early without the rest of the code being analyzed.
+
+        When no rule of the constructs this engine recognizes is enabled, the code is not
+        read at all.
 
+        Yields:
+            NamingWarning: Each violation found, in line order.
         """
+        if not self.rules["variable"]:
+            return
         for code in self.code:
-            if self.is_comment(code):
-                self.current_line+=1
-                continue
-            line = code.strip()
-            if self.is_variable_declaration(line):
-                self.variable_handler(line)
-            # if self.is_function_declaration(line):
-            #     self.function_handler()
+            self.check_line(code)
             self.current_line+=1
+            if self.line_warnings:
+                yield from self.line_warnings
+                self.line_warnings = []
+
+    def check_line(self, code: str) -> None:
+        """
+        Checks one line of code, skipping comments and multiline strings.
+
+        Args:
+            code (str): The line of code to be checked.
+        """
+        if self.is_comment(code):
+            return
+        line = code.strip()
+        if self.is_variable_declaration(line):
+            self.current_text = code
+            self.current_column = len(code) - len(code.lstrip()) + 1
+            self.variable_handler(line)
+        # if self.is_function_declaration(line):
+        #     self.function_handler()
             
             
+    def get_state(self) -> tuple:
+        """
+        Returns the state carried over from one line to the next, so the analysis can be
+        resumed at a line boundary, as in incremental re-analysis.
+
+        Returns:
+            tuple: Whether a multiline string is left open.
+        """
+        return (self.multiline_string,)
+
+    def set_state(self, state: tuple) -> None:
+        """
+        Restores a state returned by `get_state`.
+
+        Args:
+            state (tuple): The state to restore.
+        """
+        (self.multiline_string,) = state
+
     def variable_handler(self, line) -> None:
         """
             Checks the current variable name for snake_case naming convention and appends a warning if necessary.
@@ -59,19 +128,27 @@ class PythonAnalyzer:
         # warning = not rule_names_should_be_snake_case(self.current_variable)
         # if(warning):
         #     self.append_warning("Variables names should be declared in snake case.")
-        warning = rule_variable_names_should_have_length_greater_than_one(self.current_variable, line)
-        if warning:
-            self.append_warning("Variables names should have length greater than one.")
+        self.run_rules("variable", self.current_variable, line)
         self.current_variable = None
         
     def function_handler(self) -> None:
         """
             Checks the current function name for snake_case naming convention and appends a warning if necessary.
         """
-        warning = not rule_names_should_be_snake_case(self.current_function)
-        if(warning):
-            self.append_warning("Functions names should be declared in snake case.")
+        self.run_rules("function", self.current_function)
         self.current_function = None
+
+    def run_rules(self, kind: str, *arguments) -> None:
+        """
+            Runs every rule of a construct kind and appends a warning for each rule that fails.
+
+            Args:
+                kind (str): The construct kind, as registered in the rule registry.
+                *arguments: The construct, as consumed by the rules of that kind.
+        """
+        for rule in self.rules[kind]:
+            if rule.check(*arguments) is False:
+                self.append_warning(rule.id)
         
     def is_comment(self, line: str) -> bool:
         """
@@ -134,12 +211,16 @@ class PythonAnalyzer:
             self.current_function = match.group(1)
         return match
     
-    def append_warning(self, warning_message) -> None:
+    def append_warning(self, rule) -> None:
         """
-            Appends a warning message to the list of warnings with the current line number.
+            Records a warning for the current line and column, unless it is suppressed. The
+            message is only formatted when the warning is displayed.
 
             Args:
-                warning_message (str): The warning message to be appended.
+                rule (str): The identifier of the broken rule.
         """
-        message = f"WARN: [{self.current_line}] {warning_message}"
-        self.warnings.append(message)
\ No newline at end of file
+        if self.suppressions.is_suppressed(rule, self.current_text):
+            return
+        self.line_warnings.append(
+            NamingWarning(rule, self.current_line, self.current_column, self.file)
+        )
\ No newline at end of file
@@ -0,0 +1,292 @@
+import ast
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+
+from naming_check.analyzers.python_analyzer import PythonAnalyzer
+from naming_check.baseline import INLINE_SUPPRESSIONS, Suppressions
+from naming_check.rules.registry import PYTHON, Rule, default_registry
+from naming_check.warning import NamingWarning
+
+SITE_ORDER = itemgetter(0, 1)
+
+
+class BindingCollector(ast.NodeVisitor):
+    """
+    Collects every binding site of a syntax tree: assignment, `for`, `with` and comprehension
+    targets (including tuple unpacking and annotated assignments), walrus targets, `except`
+    names, import aliases, match captures, function and lambda arguments, and function and
+    class names. Augmented assignments rebind an existing name, so their targets are not sites.
+
+    Attributes:
+        sites (List[tuple]): The sites found, as `(line, byte column, kind, name, clause)`
+                             tuples, where `clause` tells whether the name is the target of a
+                             comprehension `for` clause.
+    """
+    def __init__(self, lines: List[str]):
+        self.lines = lines
+        self.sites = []
+        self.clause = False
+
+    def add(self, kind: str, name: str, line: int, column: int) -> None:
+        """
+        Records a binding site.
+
+        Args:
+            kind (str): The construct kind, as registered in the rule registry.
+            name (str): The bound name.
+            line (int): The line of the name, starting at 1.
+            column (int): The UTF-8 byte offset of the name in its line.
+        """
+        self.sites.append((line, column, kind, name, self.clause))
+
+    def add_end(self, name: str, line: int, end: int) -> None:
+        """
+        Records a variable whose node ends with its name, such as `pattern as name`.
+
+        Args:
+            name (str): The bound name.
+            line (int): The line where the node ends.
+            end (int): The UTF-8 byte offset where the node ends.
+        """
+        self.add("variable", name, line, end - len(name.encode()))
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Store):
+            self.add("variable", node.id, node.lineno, node.col_offset)
+
+    def visit_AugAssign(self, node):
+        if not isinstance(node.target, ast.Name):
+            self.visit(node.target)
+        self.visit(node.value)
+
+    def visit_arg(self, node):
+        self.add("variable", node.arg, node.lineno, node.col_offset)
+        self.generic_visit(node)
+
+    def visit_FunctionDef(self, node):
+        self.add("function", node.name, node.lineno, node.col_offset)
+        self.generic_visit(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        self.add("class", node.name, node.lineno, node.col_offset)
+        self.generic_visit(node)
+
+    def visit_ExceptHandler(self, node):
+        if node.name:
+            self.add("variable", node.name, node.lineno, node.col_offset)
+        self.generic_visit(node)
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            # Aliases only have a position since Python 3.10.
+            position = alias if hasattr(alias, "end_col_offset") else node
+            if alias.asname:
+                self.add_end(alias.asname, position.end_lineno, position.end_col_offset)
+            elif alias.name != "*":
+                self.add("variable", alias.name.split(".")[0], position.lineno, position.col_offset)
+
+    visit_ImportFrom = visit_Import
+
+    def visit_comprehension(self, node):
+        self.clause = True
+        self.visit(node.target)
+        self.clause = False
+        self.visit(node.iter)
+        for condition in node.ifs:
+            self.visit(condition)
+
+    def visit_MatchAs(self, node):
+        if node.name:
+            self.add_end(node.name, node.end_lineno, node.end_col_offset)
+        self.generic_visit(node)
+
+    visit_MatchStar = visit_MatchAs
+
+    def visit_MatchMapping(self, node):
+        if node.rest:
+            text = self.lines[node.end_lineno - 1].encode()
+            column = text.rfind(node.rest.encode(), 0, node.end_col_offset)
+            self.add("variable", node.rest, node.end_lineno, column)
+        self.generic_visit(node)
+
+
+class PythonAstAnalyzer:
+    """
+    A class responsible for analyzing Python code through its abstract syntax tree.
+
+    Unlike `PythonAnalyzer`, which matches each line with a regular expression, this engine
+    parses the code once and checks every binding site collected by `BindingCollector` in a
+    single walk of the tree.
+
+    The code can be any iterable of lines. Since statements can span several lines, the lines
+    are collected before the analysis. Code that cannot be parsed is analyzed by
+    `PythonAnalyzer` instead.
+
+    Warnings are suppressed as in `PythonAnalyzer`.
+
+    """
+    def __init__(
+        self,
+        code,
+        file=None,
+        rules: Optional[Dict[str, Tuple[Rule, ...]]] = None,
+        suppressions: Optional[Suppressions] = None,
+    ):
+        self.warnings = []
+        self.line_warnings = []
+        self.code = code
+        self.file = file
+        self.rules = rules if rules is not None else default_registry().dispatch(PYTHON)
+        self.suppressions = suppressions if suppressions is not None else INLINE_SUPPRESSIONS
+        self.lines = []
+        self.fallback = None
+        self.current_line = 1
+        self.current_column = 1
+
+    def analyze(self):
+        """
+        Analyzes the code for style and coding standard violations.
+
+        This method triggers the process of checking for warnings and returns a list of detected warnings.
+
+        Returns:
+            List[NamingWarning]: A list of warnings related to code style violations.
+        """
+        self.check_warnings()
+        return self.warnings
+
+    def check_warnings(self):
+        """
+        Analyzes the code and adds every warning found to the `warnings` list.
+        """
+        self.warnings.extend(self.iter_warnings())
+
+    def iter_warnings(self):
+        """
+        Collects the binding sites of the code and checks them in source order.
+
+        The warnings of each line are yielded before the next line is checked, so a consumer
+        can filter them or stop early. When every rule is disabled, the code is neither read
+        nor parsed.
+
+        Yields:
+            NamingWarning: Each violation found, in line order.
+        """
+        if not any(self.rules.values()):
+            return
+        self.lines = [line.rstrip("\r\n") for line in self.code]
+        sites = self.collect_sites()
+        if sites is None:
+            self.fallback = PythonAnalyzer(self.lines, self.file, self.rules, self.suppressions)
+            yield from self.fallback.iter_warnings()
+            return
+        variable_handler = self.variable_handler
+        function_handler = self.function_handler
+        class_handler = self.class_handler
+        for line, line_sites in sites:
+            self.current_line = line
+            for column, kind, name, text in line_sites:
+                self.current_column = column
+                if kind == "variable":
+                    variable_handler(name, text)
+                elif kind == "function":
+                    function_handler(name)
+                else:
+                    class_handler(name)
+            if self.line_warnings:
+                yield from self.line_warnings
+                self.line_warnings = []
+
+    def collect_sites(self) -> Optional[List[tuple]]:
+        """
+        Parses the code and collects its binding sites.
+
+        Returns:
+            Optional[List[tuple]]: The lines with sites, in order, as `(line, sites)` tuples
+                                   where each site is a `(column, kind, name, text)` tuple and
+                                   `text` is the argument of the variable rules; None if the
+                                   code cannot be parsed.
+        """
+        lines = self.lines
+        try:
+            tree = ast.parse("\n".join(lines))
+        except (SyntaxError, ValueError):
+            return None
+        collector = BindingCollector(lines)
+        collector.visit(tree)
+        sites = []
+        for line, column, kind, name, clause in collector.sites:
+            text = lines[line - 1]
+            if not text.isascii():
+                # ast columns count UTF-8 bytes.
+                column = len(text.encode()[:column].decode(errors="ignore"))
+            argument = None
+            if kind == "variable":
+                start = text.rfind("for", 0, column) if clause else -1
+                argument = text[start:].strip() if start >= 0 else text.strip()
+            sites.append((line, column + 1, kind, name, argument))
+        sites.sort(key=SITE_ORDER)
+        return [(line, tuple(site[1:] for site in line_sites)) for line, line_sites in groupby(sites, itemgetter(0))]
+
+    def variable_handler(self, variable: str, text: str) -> None:
+        """
+            Checks a variable name for its length and appends a warning if necessary.
+
+            Args:
+                variable (str): The name of the variable.
+                text (str): The stripped source line of the name; for the target of a
+                            comprehension, the line from its `for` keyword.
+        """
+        # The rules are run here rather than through a shared helper: this is called for
+        # every site of the code.
+        for rule in self.rules["variable"]:
+            if rule.check(variable, text) is False:
+                self.append_warning(rule.id)
+
+    def function_handler(self, function) -> None:
+        """
+            Checks a function name for snake_case naming convention and appends a warning if necessary.
+
+            Args:
+                function (str): The name of the function.
+        """
+        for rule in self.rules["function"]:
+            if rule.check(function) is False:
+                self.append_warning(rule.id)
+
+    def class_handler(self, name) -> None:
+        """
+            Checks a class name against the class rules and appends a warning if necessary.
+
+            Args:
+                name (str): The name of the class.
+        """
+        for rule in self.rules["class"]:
+            if rule.check(name) is False:
+                self.append_warning(rule.id)
+
+    @property
+    def current_text(self) -> str:
+        """
+        The content of the current line.
+        """
+        if self.fallback is not None:
+            return self.fallback.current_text
+        return self.lines[self.current_line - 1] if 0 < self.current_line <= len(self.lines) else ""
+
+    def append_warning(self, rule) -> None:
+        """
+            Records a warning for the current line and column, unless it is suppressed. The
+            message is only formatted when the warning is displayed.
+
+            Args:
+                rule (str): The identifier of the broken rule.
+        """
+        if self.suppressions.is_suppressed(rule, self.current_text):
+            return
+        self.line_warnings.append(
+            NamingWarning(rule, self.current_line, self.current_column, self.file)
+        )
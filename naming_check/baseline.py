@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+
+from naming_check.lazy import LazyPattern
+from naming_check.reader import open_lines
+from naming_check.warning import NamingWarning
+
+BASELINE_FORMAT_VERSION = 1
+
+IGNORE_MARKER = "naming-check: ignore"
+
+# An inline ignore comment, optionally restricted to some rules:
+# "// naming-check: ignore" or "# naming-check: ignore[c-variable-length, c-variable-snake-case]".
+IGNORE_PATTERN = LazyPattern(r"naming-check: ignore(?:\[([^\]]*)\])?")
+
+
+def normalize_line(line: str) -> str:
+    """
+    Normalizes the content of a line, so indentation and spacing changes keep its fingerprints.
+    """
+    return " ".join(line.split())
+
+
+class Baseline:
+    """
+    A set of accepted warnings, identified by fingerprints that survive unrelated edits.
+
+    A fingerprint hashes the rule, the path of the file relative to the baseline, and the
+    normalized content of the line the warning is raised on, but not its line number: adding
+    or removing lines elsewhere in the file keeps the warnings suppressed, while editing the
+    line itself brings its warnings back. The fingerprints are held in a hash set, so a
+    warning is looked up in constant time.
+
+    Attributes:
+        root (str): The directory the paths of the fingerprints are relative to, the one of
+                    the baseline file.
+        fingerprints (FrozenSet[str]): The fingerprints of the accepted warnings.
+        digest (str): A hash of the fingerprints, identifying the baseline in cache keys.
+    """
+    def __init__(self, root: str, fingerprints: Iterable[str] = ()):
+        self.root = os.path.abspath(root)
+        self.fingerprints: FrozenSet[str] = frozenset(fingerprints)
+        self.digest = hashlib.sha256("\n".join(sorted(self.fingerprints)).encode()).hexdigest()
+
+    def __repr__(self):
+        # The fingerprints are left out, so the baseline is cheap to put in cache keys.
+        return f"Baseline({self.root!r}, {self.digest})"
+
+    def file_key(self, file: Optional[str]) -> str:
+        """
+        Returns the path a file is fingerprinted under.
+        """
+        if file is None:
+            return ""
+        return os.path.relpath(os.path.abspath(file), self.root).replace(os.sep, "/")
+
+    def fingerprint(self, rule: str, file_key: str, line: str) -> str:
+        """
+        Computes the fingerprint of a warning.
+
+        Args:
+            rule (str): The identifier of the rule.
+            file_key (str): The path of the file, as returned by `file_key`.
+            line (str): The content of the line the warning is raised on.
+
+        Returns:
+            str: The fingerprint, in hexadecimal.
+        """
+        return hashlib.blake2b(
+            f"{rule}\0{file_key}\0{normalize_line(line)}".encode(), digest_size=12
+        ).hexdigest()
+
+    @classmethod
+    def load(cls, path: str) -> "Baseline":
+        """
+        Reads a baseline file.
+
+        Args:
+            path (str): The path of the baseline.
+
+        Returns:
+            Baseline: The baseline.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the file is not a baseline.
+        """
+        try:
+            with open(path, "r") as file:
+                data = json.load(file)
+        except FileNotFoundError as exc:
+            raise FileNotFoundError(f"The baseline '{path}' does not exist.")
+        except ValueError as e:
+            raise ValueError(f"The baseline '{path}' is not valid JSON: {str(e)}")
+        if not isinstance(data, dict) or data.get("version") != BASELINE_FORMAT_VERSION:
+            raise ValueError(f"The baseline '{path}' has an unsupported format")
+        return cls(os.path.dirname(os.path.abspath(path)), data.get("fingerprints", []))
+
+    @classmethod
+    def write(cls, path: str, results: Iterable[Tuple[str, List[NamingWarning]]]) -> "Baseline":
+        """
+        Writes a baseline accepting the given warnings.
+
+        The files holding warnings are read again to fingerprint the content of their lines.
+
+        Args:
+            path (str): The path of the baseline.
+            results (Iterable[Tuple[str, List[NamingWarning]]]): Each file paired with its warnings.
+
+        Returns:
+            Baseline: The baseline written.
+        """
+        baseline = cls(os.path.dirname(os.path.abspath(path)))
+        fingerprints = set()
+        for input_file, warnings in results:
+            if not warnings:
+                continue
+            with open_lines(input_file, 0) as code:
+                lines = list(code or ())
+            file_key = baseline.file_key(input_file)
+            for warning in warnings:
+                line = lines[warning.line - 1] if 0 < warning.line <= len(lines) else ""
+                fingerprints.add(baseline.fingerprint(warning.rule, file_key, line))
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w") as file:
+            json.dump({"version": BASELINE_FORMAT_VERSION, "fingerprints": sorted(fingerprints)}, file, indent=0)
+        os.replace(temporary_path, path)
+        return cls(baseline.root, fingerprints)
+
+
+class Suppressions:
+    """
+    Decides, as each warning is raised, whether it is suppressed, before anything else is
+    done with it.
+
+    A warning is suppressed by an inline comment on its line, `// naming-check: ignore` in C
+    or `# naming-check: ignore` in Python, optionally followed by the rules to ignore in
+    brackets, or when its fingerprint is in the baseline.
+
+    Attributes:
+        baseline (Optional[Baseline]): The accepted warnings.
+        inline (bool): Whether inline comments are honored.
+    """
+    def __init__(self, file: Optional[str] = None, baseline: Optional[Baseline] = None, inline: bool = True):
+        self.baseline = baseline
+        self.inline = inline
+        self.file_key = baseline.file_key(file) if baseline is not None and baseline.fingerprints else None
+
+    def is_suppressed(self, rule: str, line: str) -> bool:
+        """
+        Tells whether a warning is suppressed.
+
+        Args:
+            rule (str): The identifier of the rule.
+            line (str): The content of the line the warning is raised on.
+
+        Returns:
+            bool: True if the warning must be dropped.
+        """
+        if self.inline and IGNORE_MARKER in line:
+            match = IGNORE_PATTERN.search(line)
+            if match.group(1) is None or rule in {name.strip() for name in match.group(1).split(",")}:
+                return True
+        if self.file_key is None:
+            return False
+        return self.baseline.fingerprint(rule, self.file_key, line) in self.baseline.fingerprints
+
+
+# Honors inline comments only, for analyzers created without suppressions.
+INLINE_SUPPRESSIONS = Suppressions()
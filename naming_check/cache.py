@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import BinaryIO, List, Optional
+
+import naming_check
+from naming_check.rules.registry import default_registry
+from naming_check.warning import NamingWarning
+
+CACHE_FILE_NAME = "results.json"
+
+CACHE_FORMAT_VERSION = 2
+
+DEFAULT_MAX_ENTRIES = 100000
+
+READ_BLOCK_SIZE = 1 << 20
+
+
+def rules_fingerprint() -> str:
+    """
+    Computes a fingerprint of the code that decides which warnings a file produces.
+
+    The fingerprint covers the rules, the constants, the analyzers and the installed rule
+    plugins, so any change to them invalidates the results stored by a previous version.
+
+    Returns:
+        str: A hexadecimal digest identifying the current rule set.
+    """
+    package_directory = os.path.dirname(naming_check.__file__)
+    digest = hashlib.sha256(str(CACHE_FORMAT_VERSION).encode())
+    sources = [os.path.join(package_directory, "constants.py")]
+    for subpackage in ("analyzers", "rules"):
+        directory = os.path.join(package_directory, subpackage)
+        sources.extend(
+            os.path.join(directory, filename)
+            for filename in os.listdir(directory)
+            if filename.endswith(".py")
+        )
+    for source in sorted(sources):
+        digest.update(os.path.relpath(source, package_directory).encode())
+        with open(source, "rb") as file:
+            digest.update(file.read())
+    for plugin in default_registry().plugins:
+        digest.update(plugin.encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    A persistent, size-bounded cache of the warnings produced for each file content.
+
+    Entries are keyed by the hash of the file content together with the fingerprint of
+    the rule set, so an unchanged file is served from the cache while any change to the
+    file or to the rules triggers a new analysis. When the cache is full, the least
+    recently used entries are evicted.
+
+    Without a directory, the cache only lives in memory, as in the daemon.
+
+    """
+    def __init__(self, directory: Optional[str], max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.fingerprint = rules_fingerprint()
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def key(self, file: BinaryIO, options: Optional[dict] = None) -> str:
+        """
+        Computes the cache key of a file content, reading the file in fixed-size blocks.
+
+        Args:
+            file (BinaryIO): The file, opened in binary mode.
+            options (Optional[dict]): The analysis options that change the warnings produced
+                                      for the content, such as the Python engine.
+
+        Returns:
+            str: The key under which the warnings of the content are stored.
+        """
+        digest = hashlib.sha256()
+        for block in iter(lambda: file.read(READ_BLOCK_SIZE), b""):
+            digest.update(block)
+        if options:
+            digest.update(repr(sorted(options.items())).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str, file: Optional[str] = None) -> Optional[List[NamingWarning]]:
+        """
+        Looks up the warnings stored for a key and marks the entry as recently used.
+
+        Args:
+            key (str): The key returned by `key`.
+            file (Optional[str]): The file the warnings are reported for. Entries are shared
+                                  by every file with the same content.
+
+        Returns:
+            Optional[List[NamingWarning]]: The stored warnings, or None if the key is not cached.
+        """
+        warnings = self.entries.get(key)
+        if warnings is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return [NamingWarning(rule, line, column, file) for rule, line, column in warnings]
+
+    def put(self, key: str, warnings: List[NamingWarning]) -> None:
+        """
+        Stores the warnings of a key, evicting the least recently used entries if needed.
+
+        Args:
+            key (str): The key returned by `key`.
+            warnings (List[NamingWarning]): The warnings produced for the content.
+        """
+        self.entries[key] = [(warning.rule, warning.line, warning.column) for warning in warnings]
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def load(self) -> None:
+        """
+        Loads the entries saved in the cache directory.
+
+        A missing, unreadable or outdated cache file is ignored, leaving the cache empty.
+        """
+        if self.directory is None:
+            return
+        try:
+            with open(os.path.join(self.directory, CACHE_FILE_NAME), "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if data.get("fingerprint") != self.fingerprint:
+            return
+        for key, warnings in data.get("entries", [])[-self.max_entries:]:
+            self.entries[key] = warnings
+
+    def save(self) -> None:
+        """
+        Writes the entries to the cache directory, from least to most recently used.
+
+        The file is written to a temporary name and then moved in place, so an interrupted
+        run never leaves a truncated cache behind.
+        """
+        if self.directory is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, CACHE_FILE_NAME)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(
+                {"fingerprint": self.fingerprint, "entries": list(self.entries.items())},
+                file,
+            )
+        os.replace(temporary_path, path)
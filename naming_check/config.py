@@ -0,0 +1,208 @@
+import os
+import re
+from collections import namedtuple
+from fnmatch import fnmatch, translate
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CONFIG_FILE_NAME = ".naming_check.toml"
+
+PYPROJECT_FILE_NAME = "pyproject.toml"
+
+SEVERITIES = ("error", "warning", "note")
+
+DEFAULT_SEVERITY = "warning"
+
+CONFIG_KEYS = frozenset(["select", "ignore", "severity", "exclude"])
+
+
+class Config(namedtuple("Config", ["select", "ignore", "severity", "exclude", "root"], defaults=[(), (), {}, (), "."])):
+    """
+    The project configuration of the analyzer.
+
+    Rules are selected and ignored by identifier, and both accept glob patterns such as
+    `c-*`. Exclude patterns are globs matched against the paths relative to `root`, the
+    directory of the configuration file, and against the bare file and directory names.
+
+    Attributes:
+        select (Tuple[str, ...]): The rules to run. Every rule is run when empty.
+        ignore (Tuple[str, ...]): The rules not to run, even when selected.
+        severity (Dict[str, str]): The severity of each rule: "error", "warning" or "note".
+                                   Rules missing from it are warnings.
+        exclude (Tuple[str, ...]): The files and directories not to analyze.
+        root (str): The directory the exclude patterns are relative to.
+    """
+    __slots__ = ()
+
+    def enabled_rules(self, rule_ids: Iterable[str]) -> Optional[Tuple[str, ...]]:
+        """
+        Resolves the selected and ignored rules against the known rules.
+
+        Args:
+            rule_ids (Iterable[str]): The identifiers of every registered rule.
+
+        Returns:
+            Optional[Tuple[str, ...]]: The sorted identifiers of the rules to run, or None if
+                                       every rule runs.
+
+        Raises:
+            ValueError: If a selected or ignored pattern matches no rule.
+        """
+        rule_ids = list(rule_ids)
+        for pattern in list(self.select) + list(self.ignore):
+            if not any(fnmatch(rule_id, pattern) for rule_id in rule_ids):
+                raise ValueError(f"Unknown rule '{pattern}'")
+        enabled = [
+            rule_id
+            for rule_id in rule_ids
+            if (not self.select or any(fnmatch(rule_id, pattern) for pattern in self.select))
+            and not any(fnmatch(rule_id, pattern) for pattern in self.ignore)
+        ]
+        if len(enabled) == len(rule_ids):
+            return None
+        return tuple(sorted(enabled))
+
+    def exclusion_filter(self):
+        """
+        Builds a predicate telling whether a path is excluded.
+
+        The patterns are compiled into a single regular expression, so each path is matched
+        once whatever the number of patterns. A directory is also excluded by the patterns
+        that exclude everything below it, such as `build/**`, so the walk can skip it.
+
+        Returns:
+            Optional[Callable[[str], bool]]: The predicate, or None if nothing is excluded.
+        """
+        if not self.exclude:
+            return None
+        patterns = [pattern.rstrip("/") for pattern in self.exclude]
+        matcher = re.compile("|".join(translate(pattern) for pattern in patterns))
+        root = os.path.abspath(self.root)
+
+        def is_excluded(path: str) -> bool:
+            path = os.path.abspath(path)
+            relative = os.path.relpath(path, root).replace(os.sep, "/")
+            return bool(
+                matcher.match(os.path.basename(path))
+                or matcher.match(relative)
+                or matcher.match(relative + "/")
+            )
+
+        return is_excluded
+
+
+def find_config(directory: str) -> Optional[str]:
+    """
+    Finds the configuration file of a project, looking up from a directory.
+
+    In each directory, `.naming_check.toml` comes first, then a `pyproject.toml` holding a
+    `[tool.naming_check]` table.
+
+    Args:
+        directory (str): The directory to start from.
+
+    Returns:
+        Optional[str]: The path of the configuration file, or None if there is none.
+    """
+    directory = os.path.abspath(directory)
+    while True:
+        config_file = os.path.join(directory, CONFIG_FILE_NAME)
+        if os.path.isfile(config_file):
+            return config_file
+        pyproject = os.path.join(directory, PYPROJECT_FILE_NAME)
+        if os.path.isfile(pyproject):
+            with open(pyproject, "r") as file:
+                if re.search(r"^\[tool\.naming_check\]", file.read(), re.MULTILINE):
+                    return pyproject
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def load_config(config_file: str) -> Config:
+    """
+    Reads a configuration file.
+
+    `.naming_check.toml` holds the settings at its top level, or in a `[tool.naming_check]`
+    table like `pyproject.toml`:
+
+        [tool.naming_check]
+        select = ["c-*", "py-variable-length"]
+        ignore = ["c-variable-length"]
+        exclude = ["build", "third_party/**", "*_generated.c"]
+
+        [tool.naming_check.severity]
+        c-mixed-pointer-declaration = "error"
+
+    Args:
+        config_file (str): The path of the configuration file.
+
+    Returns:
+        Config: The configuration.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ImportError: If no TOML parser is available (before Python 3.11, install `tomli`).
+        ValueError: If the file is not valid TOML or holds an invalid setting.
+    """
+    # Imported here, since most projects are configured without any TOML file.
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            tomllib = None
+    if tomllib is None:
+        raise ImportError("Reading the configuration requires Python 3.11 or the 'tomli' package.")
+    try:
+        with open(config_file, "rb") as file:
+            data = tomllib.load(file)
+    except FileNotFoundError as exc:
+        raise FileNotFoundError(f"The configuration file '{config_file}' does not exist.")
+    except tomllib.TOMLDecodeError as e:
+        raise ValueError(f"The configuration file '{config_file}' is not valid TOML: {str(e)}")
+
+    settings = data.get("tool", {}).get("naming_check")
+    if settings is None:
+        settings = {} if os.path.basename(config_file) == PYPROJECT_FILE_NAME else data
+    unknown = set(settings) - CONFIG_KEYS
+    if unknown:
+        raise ValueError(f"Unknown settings in '{config_file}': {', '.join(sorted(unknown))}")
+
+    severity = settings.get("severity", {})
+    if not isinstance(severity, dict) or any(level not in SEVERITIES for level in severity.values()):
+        raise ValueError(f"Severities must be one of {', '.join(SEVERITIES)}")
+    return Config(
+        select=_string_list(settings, "select"),
+        ignore=_string_list(settings, "ignore"),
+        severity=dict(severity),
+        exclude=_string_list(settings, "exclude"),
+        root=os.path.dirname(os.path.abspath(config_file)),
+    )
+
+
+def _string_list(settings: Dict[str, object], key: str) -> Tuple[str, ...]:
+    """
+    Reads a setting holding a list of strings.
+
+    Raises:
+        ValueError: If the setting is not a list of strings.
+    """
+    values = settings.get(key, [])
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise ValueError(f"The '{key}' setting must be a list of strings")
+    return tuple(values)
+
+
+def split_rules(value: str) -> List[str]:
+    """
+    Splits a comma-separated list of rules given on the command line.
+
+    Args:
+        value (str): The rules, e.g. "c-variable-length,py-*".
+
+    Returns:
+        List[str]: The rules.
+    """
+    return [rule.strip() for rule in value.split(",") if rule.strip()]
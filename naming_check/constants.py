@@ -37,3 +37,17 @@ FUNCTION_DECLARATION_TYPES = [
 VARIABLE_DECLARATION_TYPES = ["int", "char", "float", "double", "long", "struct"]
 
 PRE_DECLARATION_TYPES = ["extern", "short", "signed", "static", "unsigned", "volatile"]
+
+WARNING_MESSAGES = {
+    "c-struct-lowercase": "Structs should be declared in lowercase.",
+    "c-enum-pascal-case": "Enums declaration should be in pascalcase.",
+    "c-constant-uppercase": "All constants should be declared in uppercase.",
+    "c-function-snake-case": "Functions names should be declared in snakecase.",
+    "c-initialize-all-variables": "If you initialize one variable, you should initialize the others.",
+    "c-mixed-pointer-declaration": "Pointers variables should not be declared with no pointers variables.",
+    "c-variable-snake-case": "Variables names should be declared in snake case.",
+    "c-variable-length": "Variables names should have length greater than one.",
+    "py-variable-length": "Variables names should have length greater than one.",
+    "py-function-snake-case": "Functions names should be declared in snake case.",
+    "py-class-pascal-case": "Classes names should be declared in pascal case.",
+}
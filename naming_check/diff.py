@@ -0,0 +1,99 @@
+from typing import Dict, Iterable, List, Set
+
+from naming_check.lazy import LazyPattern
+from naming_check.warning import NamingWarning
+
+HUNK_HEADER_PATTERN = LazyPattern(r'^@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+
+def diff_path(header: str) -> str:
+    """
+    Extracts the path of a file from a `---` or `+++` header line of a unified diff.
+
+    Args:
+        header (str): The header line, such as "+++ b/src/main.c".
+
+    Returns:
+        str: The path of the file, without the header marker and any trailing timestamp.
+    """
+    return header[4:].rstrip("\n").split("\t")[0]
+
+
+def parse_unified_diff(lines: Iterable[str]) -> Dict[str, Set[int]]:
+    """
+    Finds the lines added or modified by a unified diff, such as the output of `git diff`.
+
+    The `a/` and `b/` prefixes added by git are removed from the paths. Deleted files and
+    hunks that only remove lines are left out, since they leave no line to check.
+
+    Args:
+        lines (Iterable[str]): The lines of the diff.
+
+    Returns:
+        Dict[str, Set[int]]: The numbers of the changed lines in the new version of each file.
+    """
+    changed_lines = {}
+    old_path = ""
+    current = None
+    new_line = 0
+    # The lines of the current hunk still to come, on each side: until they are all read, a
+    # line starting with "--- " or "+++ " is a removed or added line, not a file header.
+    old_count = new_count = 0
+    for line in lines:
+        if old_count > 0 or new_count > 0:
+            if line.startswith("+"):
+                if current is not None:
+                    current.add(new_line)
+                new_line += 1
+                new_count -= 1
+            elif line.startswith("-"):
+                old_count -= 1
+            elif line.startswith(" ") or line.rstrip("\r\n") == "":
+                new_line += 1
+                old_count -= 1
+                new_count -= 1
+        elif line.startswith("--- "):
+            old_path = diff_path(line)
+            current = None
+        elif line.startswith("+++ "):
+            path = diff_path(line)
+            if path == "/dev/null":
+                current = None
+                continue
+            if path.startswith("b/") and (old_path.startswith("a/") or old_path == "/dev/null"):
+                path = path[2:]
+            current = changed_lines.setdefault(path, set())
+        elif line.startswith("@@"):
+            match = HUNK_HEADER_PATTERN.match(line)
+            if match:
+                # A count left out of the header means a single line.
+                old_count = int(match.group(1) or 1)
+                new_line = int(match.group(2))
+                new_count = int(match.group(3) or 1)
+    return {path: lines for path, lines in changed_lines.items() if lines}
+
+
+def filter_changed_lines(
+    warnings: Iterable[NamingWarning], changed_lines: Set[int]
+) -> List[NamingWarning]:
+    """
+    Keeps the warnings raised on changed lines.
+
+    The warnings must come in line order, as yielded by `iter_warnings`: the iteration stops
+    after the last changed line, so the analyzer never reads the rest of the file.
+
+    Args:
+        warnings (Iterable[NamingWarning]): The warnings of a file, in line order.
+        changed_lines (Set[int]): The numbers of the changed lines of the file.
+
+    Returns:
+        List[NamingWarning]: The warnings raised on one of the changed lines.
+    """
+    last_line = max(changed_lines, default=0)
+    kept = []
+    for warning in warnings:
+        if warning.line > last_line:
+            break
+        if warning.line in changed_lines:
+            kept.append(warning)
+    return kept
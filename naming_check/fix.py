@@ -0,0 +1,821 @@
+import ast
+import keyword
+import os
+from collections import namedtuple
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from naming_check.analyzers.c_lexer import IDENTIFIER, CLexer
+from naming_check.baseline import Suppressions
+from naming_check.constants import RESERVED_WORDS
+from naming_check.lazy import LazyPattern
+from naming_check.main import DEFAULT_PYTHON_ENGINE, create_analyzer, map_tasks
+from naming_check.reader import DEFAULT_MAX_FILE_SIZE, open_lines
+from naming_check.rules.c_rules import struct_name, struct_typedef_name
+from naming_check.rules.shapes import LOWER_CASE, PASCAL_CASE, PASCAL_CASE_CORE, SNAKE_CASE, SNAKE_CASE_CORE, UPPER_CASE, identifier_shape
+from naming_check.type_index import C_EXTENSIONS, TypeIndex
+
+RESERVED_WORD_SET = frozenset(RESERVED_WORDS)
+
+WORD_BOUNDARY_PATTERN = LazyPattern(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])")
+
+NEWLINE_PATTERN = LazyPattern("\n")
+
+UTF8_BOM = b"\xef\xbb\xbf"
+
+
+def to_snake_case(name: str) -> str:
+    """
+    Converts a name to snake_case, keeping its leading and trailing underscores.
+
+    Args:
+        name (str): The name (e.g., "parseHTTPHeader").
+
+    Returns:
+        str: The converted name (e.g., "parse_http_header").
+    """
+    core = name.strip("_")
+    if not core:
+        return name
+    prefix = name[:len(name) - len(name.lstrip("_"))]
+    suffix = name[len(name.rstrip("_")):]
+    words = [word for word in WORD_BOUNDARY_PATTERN.sub("_", core).split("_") if word]
+    return prefix + "_".join(words).lower() + suffix
+
+
+def to_pascal_case(name: str) -> str:
+    """
+    Converts a name to PascalCase, keeping its leading underscores.
+
+    Words written in capitals are capitalized (e.g., "HTTP_STATUS" becomes "HttpStatus"),
+    and the case of the other words is kept past their first letter.
+
+    Args:
+        name (str): The name (e.g., "http_status" or "httpStatus").
+
+    Returns:
+        str: The converted name (e.g., "HttpStatus").
+    """
+    prefix = name[:len(name) - len(name.lstrip("_"))]
+    words = [word for word in name.split("_") if word]
+    return prefix + "".join(
+        word.capitalize() if word.isupper() else word[0].upper() + word[1:] for word in words
+    )
+
+
+def to_upper_case(name: str) -> str:
+    """
+    Converts a name to UPPER_SNAKE_CASE (e.g., "maxSize" becomes "MAX_SIZE").
+    """
+    return to_snake_case(name).upper()
+
+
+def _declared_names(declaration) -> List[str]:
+    return [
+        declarator.name.text
+        for declarator in declaration.declarators
+        if declarator.name is not None and not identifier_shape(declarator.name.text) & SNAKE_CASE
+    ]
+
+
+def _enum_names(tokens) -> List[str]:
+    for index, token in enumerate(tokens[:-1]):
+        if token.text == "enum" and tokens[index + 1].kind == IDENTIFIER:
+            return [tokens[index + 1].text]
+    return []
+
+
+def _constant_names(tokens) -> List[str]:
+    return [tokens[1].text] if len(tokens) > 1 and tokens[1].kind == IDENTIFIER else []
+
+
+def _function_names(tokens) -> List[str]:
+    for index, token in enumerate(tokens[1:], 1):
+        if token.text == "(":
+            return [tokens[index - 1].text] if tokens[index - 1].kind == IDENTIFIER else []
+    return []
+
+
+def _struct_names(tokens) -> List[str]:
+    if any(token.text == "struct" for token in tokens):
+        name = struct_name(tokens)
+    else:
+        name = struct_typedef_name(tokens)
+    return [] if name is None else [name.text]
+
+
+def _has_shape(shape: int) -> Callable[[str], bool]:
+    return lambda name: bool(identifier_shape(name) & shape)
+
+
+Fixer = namedtuple("Fixer", ["names", "convert", "conforms"])
+Fixer.__doc__ = """
+How to fix the names reported by a rule.
+
+Attributes:
+    names (Callable[..., List[str]]): Finds the offending names in the construct the rule
+                                      was called with.
+    convert (Callable[[str], str]): Computes the conforming name.
+    conforms (Callable[[str], bool]): Tells whether a converted name follows the convention,
+                                      since a name cannot always be converted.
+"""
+
+# The rules whose warnings can be fixed by renaming. The other rules, such as the length of
+# variable names, need a human to choose a name.
+FIXERS = {
+    "c-variable-snake-case": Fixer(_declared_names, to_snake_case, _has_shape(SNAKE_CASE)),
+    "c-enum-pascal-case": Fixer(_enum_names, to_pascal_case, _has_shape(PASCAL_CASE)),
+    "c-constant-uppercase": Fixer(_constant_names, to_upper_case, _has_shape(UPPER_CASE)),
+    "c-function-snake-case": Fixer(_function_names, to_snake_case, _has_shape(LOWER_CASE)),
+    "c-struct-lowercase": Fixer(_struct_names, to_snake_case, _has_shape(LOWER_CASE)),
+    "py-function-snake-case": Fixer(lambda name: [name], to_snake_case, _has_shape(SNAKE_CASE_CORE)),
+    "py-class-pascal-case": Fixer(lambda name: [name], to_pascal_case, _has_shape(PASCAL_CASE_CORE)),
+}
+
+FixReport = namedtuple("FixReport", ["renames", "files", "edits"])
+FixReport.__doc__ = """
+The outcome of `fix_files`.
+
+Attributes:
+    renames (Dict[str, Dict[str, str]]): The names renamed in each file, old to new.
+    files (int): The number of files rewritten.
+    edits (int): The number of occurrences replaced.
+"""
+
+
+def fix_files(
+    files: List[str],
+    jobs: int = 1,
+    type_index: Optional[TypeIndex] = None,
+    **options,
+) -> FixReport:
+    """
+    Renames the names that break a fixable rule, with every occurrence of them.
+
+    The fix runs in three passes, each spread over `jobs` processes:
+
+    1. The files are analyzed with the fixable rules only, and each failing rule proposes a
+       conforming name for the names of its construct (see `FIXERS`).
+    2. The files the renames apply to are scanned to find the occurrences of the old
+       names, and the new names that are already used. Names in comments and strings are
+       left alone. Python names are renamed within their file, along with the references
+       that resolve to them (see `PythonRenamer`). C names are renamed within the file
+       declaring them, unless it is a header of the type index: its names are renamed
+       across the project, in the C files analyzed and every file of the index.
+    3. Renames whose new name is already taken, or that two names would share, are dropped.
+       The occurrences of the remaining ones are spliced into each file in a single pass,
+       in offset order, and each file is written once.
+
+    Args:
+        files (List[str]): The files to fix.
+        jobs (int): The number of worker processes, `0` meaning one per CPU.
+        type_index (Optional[TypeIndex]): The index of the project, whose files are
+                                          rewritten along with the C files when one of its
+                                          headers declares a renamed name, and whose types
+                                          are known when analyzing them.
+        **options: Keyword arguments forwarded to `analyze_file`, such as `python_engine`.
+
+    Returns:
+        FixReport: The renames made, and the number of files and occurrences rewritten.
+    """
+    tasks = [
+        (input_file, type_index.types_for(input_file) if type_index is not None and is_c_file(input_file) else None)
+        for input_file in files
+    ]
+    c_renames: Dict[str, Dict[str, str]] = {}
+    python_renames: Dict[str, Dict[str, str]] = {}
+    for (input_file, _), renames in zip(tasks, map_tasks(_propose_renames, tasks, jobs, None, options)):
+        target = (c_renames if is_c_file(input_file) else python_renames).setdefault(input_file, {})
+        clashing = {old for old, new in renames if target.setdefault(old, new) != new}
+        for old in clashing:
+            del target[old]
+
+    # The names declared in the headers of the index are used across the project; the other
+    # C names are only renamed in the file declaring them.
+    indexed = set(type_index.entries) if type_index is not None else set()
+    project_renames: Dict[str, str] = {}
+    clashing = set()
+    for input_file in [input_file for input_file in c_renames if is_indexed_header(input_file, indexed)]:
+        for old, new in c_renames.pop(input_file).items():
+            if project_renames.setdefault(old, new) != new:
+                clashing.add(old)
+    for old in clashing:
+        del project_renames[old]
+    _drop_shared_names(project_renames)
+    project_targets = set(project_renames.values())
+    for renames in c_renames.values():
+        for old in [old for old, new in renames.items() if old in project_renames or new in project_targets]:
+            del renames[old]
+    for renames in [*c_renames.values(), *python_renames.values()]:
+        _drop_shared_names(renames)
+
+    scanned = [(input_file, renames) for input_file, renames in python_renames.items() if renames]
+    if project_renames:
+        c_files = [input_file for input_file in files if is_c_file(input_file)]
+        c_files.extend(sorted(indexed - {os.path.abspath(input_file) for input_file in c_files}))
+    else:
+        c_files = [input_file for input_file, renames in c_renames.items() if renames]
+    scanned.extend((input_file, c_renames.get(input_file, {})) for input_file in c_files)
+    scan_options = dict(options, project_renames=project_renames)
+    results = list(zip(scanned, map_tasks(_find_occurrences, scanned, jobs, None, scan_options)))
+
+    taken_project_names = set()
+    for (input_file, _), (_, taken) in results:
+        if is_c_file(input_file):
+            taken_project_names.update(taken)
+    for old in [old for old, new in project_renames.items() if new in taken_project_names]:
+        del project_renames[old]
+
+    report = FixReport({}, 0, 0)
+    for (input_file, renames), (occurrences, taken) in results:
+        renames = {old: new for old, new in renames.items() if new not in taken}
+        if is_c_file(input_file):
+            renames.update(project_renames)
+        edits = [(offset, old, renames[old]) for offset, old in occurrences if old in renames]
+        if not edits:
+            continue
+        rewrite_file(input_file, edits)
+        used = {old for _, old, _ in edits}
+        report.renames[input_file] = {old: new for old, new in renames.items() if old in used}
+        report = report._replace(files=report.files + 1, edits=report.edits + len(edits))
+    return report
+
+
+def is_c_file(path: str) -> bool:
+    """
+    Tells whether a file is a C source or header.
+    """
+    return os.path.splitext(path)[1] in C_EXTENSIONS
+
+
+def is_indexed_header(path: str, indexed: Set[str]) -> bool:
+    """
+    Tells whether a file is a header tracked by the type index, given its absolute paths.
+    """
+    return os.path.splitext(path)[1] == ".h" and os.path.abspath(path) in indexed
+
+
+def _drop_shared_names(renames: Dict[str, str]) -> None:
+    """
+    Drops the renames that would give the same new name to different names.
+    """
+    owners: Dict[str, List[str]] = {}
+    for old, new in renames.items():
+        owners.setdefault(new, []).append(old)
+    for olds in owners.values():
+        if len(olds) > 1:
+            for old in olds:
+                del renames[old]
+
+
+def _propose_renames(task: Tuple[str, Optional[FrozenSet[str]]], options: dict) -> List[Tuple[str, str]]:
+    """
+    Analyzes a file with the fixable rules and proposes a conforming name for each name they report.
+
+    The rules of the analyzer are wrapped so that each failing rule hands its construct to
+    its fixer; the analyzers are unchanged.
+
+    Args:
+        task (Tuple[str, Optional[FrozenSet[str]]]): The file and the types its headers declare.
+        options (dict): Keyword arguments of `analyze_file`.
+
+    Returns:
+        List[Tuple[str, str]]: The old and new names, in the order they were reported.
+    """
+    input_file, known_types = task
+    enabled_rules = options.get("enabled_rules")
+    fixable = tuple(sorted(rule for rule in FIXERS if enabled_rules is None or rule in enabled_rules))
+    renames = []
+    reserved = RESERVED_WORD_SET if is_c_file(input_file) else frozenset(keyword.kwlist)
+
+    def propose(rule_id: str, construct: tuple) -> None:
+        if analyzer.suppressions.is_suppressed(rule_id, analyzer.current_text):
+            return
+        fixer = FIXERS[rule_id]
+        for name in fixer.names(*construct):
+            new = fixer.convert(name)
+            if new != name and new.isidentifier() and new not in reserved and fixer.conforms(new):
+                renames.append((name, new))
+
+    with open_lines(input_file, options.get("max_file_size", DEFAULT_MAX_FILE_SIZE)) as code:
+        if code is None:
+            return []
+        analyzer = create_analyzer(
+            code,
+            input_file,
+            options.get("python_engine", DEFAULT_PYTHON_ENGINE),
+            fixable,
+            known_types,
+            Suppressions(input_file, options.get("baseline")),
+        )
+        if analyzer is None:
+            return []
+        analyzer.rules = {
+            kind: tuple(rule._replace(check=_recording_check(rule, propose)) for rule in rules)
+            for kind, rules in analyzer.rules.items()
+        }
+        for _ in analyzer.iter_warnings():
+            pass
+    return renames
+
+
+def _recording_check(rule, record: Callable[[str, tuple], None]) -> Callable:
+    """
+    Wraps the check of a rule so that the constructs it fails on are recorded.
+    """
+    check = rule.check
+
+    def recording_check(*construct):
+        result = check(*construct)
+        if result is False:
+            record(rule.id, construct)
+        return result
+
+    return recording_check
+
+
+def _find_occurrences(
+    task: Tuple[str, Dict[str, str]], options: dict
+) -> Tuple[List[Tuple[int, str]], Set[str]]:
+    """
+    Finds the occurrences of the names to rename in a file, and the new names it already uses.
+
+    C files are tokenized, and every identifier with an old name is renamed. Python files are
+    parsed, and only the references resolving to a renamed definition are renamed (see
+    `PythonRenamer`).
+
+    Args:
+        task (Tuple[str, Dict[str, str]]): The file and the renames of the names it declares.
+        options (dict): Keyword arguments of `analyze_file`, along with `project_renames`,
+                        the renames of the names declared in the headers of the index,
+                        which apply to every C file.
+
+    Returns:
+        Tuple[List[Tuple[int, str]], Set[str]]: The offset of each occurrence in the decoded
+                                                text and the old name found there, and the
+                                                new names the file already uses.
+    """
+    input_file, renames = task
+    try:
+        text, _ = read_source(input_file)
+    except OSError:
+        return [], set()
+    if not is_c_file(input_file):
+        return find_python_occurrences(text, renames)
+    renames = dict(options["project_renames"], **renames)
+    targets = set(renames.values())
+    occurrences = []
+    taken = set()
+    for offset, name in iter_identifiers(text):
+        if name in renames:
+            occurrences.append((offset, name))
+        elif name in targets:
+            taken.add(name)
+    return occurrences, taken
+
+
+# Hooks that frameworks look up by name, which keep their name whatever the convention.
+FRAMEWORK_HOOKS = frozenset([
+    "setUp", "tearDown", "setUpClass", "tearDownClass", "setUpModule", "tearDownModule",
+    "asyncSetUp", "asyncTearDown", "setUpTestData",
+])
+
+DEFINITION_PATTERN = LazyPattern(r"(?:async\s+)?(?:def|class)\s+")
+
+COMPREHENSION_NODES = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+DEFINITION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+class Scope:
+    """
+    A Python scope: the module, a class body, a function, a lambda or a comprehension.
+
+    Attributes:
+        node (Optional[ast.AST]): The node opening the scope, None for the module.
+        parent (Optional[Scope]): The enclosing scope.
+        bindings (Dict[str, List[ast.AST]]): The nodes binding each name in the scope.
+        globals (Set[str]): The names declared `global` in the scope.
+        nonlocals (Set[str]): The names declared `nonlocal` in the scope.
+    """
+    def __init__(self, node: Optional[ast.AST] = None, parent: Optional["Scope"] = None):
+        self.node = node
+        self.parent = parent
+        self.bindings: Dict[str, List[ast.AST]] = {}
+        self.globals: Set[str] = set()
+        self.nonlocals: Set[str] = set()
+
+    def bind(self, name: str, node: ast.AST) -> None:
+        self.bindings.setdefault(name, []).append(node)
+
+
+class ScopeBuilder(ast.NodeVisitor):
+    """
+    Finds the bindings of every scope of a module and the scope every name is used in.
+
+    The rules of Python are followed: the names of a class body are not seen from the
+    functions it holds, a comprehension has its own scope except for its first iterable, the
+    target of `:=` is bound outside of comprehensions, and the names declared `global` or
+    `nonlocal` are bound in the scope they refer to.
+
+    Attributes:
+        module (Scope): The scope of the module.
+        names (List[Tuple[ast.Name, Scope]]): Every name, with the scope it is used in.
+        attributes (List[Tuple[ast.Attribute, Scope]]): Every attribute, with its scope.
+        definitions (List[Tuple[ast.AST, Scope]]): Every function and class, with the scope
+                                                   binding its name.
+        declared (Set[str]): The names declared `global` or `nonlocal` anywhere.
+    """
+    def __init__(self):
+        self.module = Scope()
+        self.scope = self.module
+        self.names: List[Tuple[ast.Name, Scope]] = []
+        self.attributes: List[Tuple[ast.Attribute, Scope]] = []
+        self.definitions: List[Tuple[ast.AST, Scope]] = []
+        self.declared: Set[str] = set()
+
+    def binding_scope(self, name: str, scope: Scope) -> Scope:
+        """
+        Returns the scope that a name assigned in a scope is bound in.
+        """
+        if name in scope.globals:
+            return self.module
+        if name in scope.nonlocals:
+            return self.resolve(name, scope.parent, local=False) or self.module
+        return scope
+
+    def resolve(self, name: str, scope: Scope, local: bool = True) -> Optional[Scope]:
+        """
+        Returns the scope binding a name used in a scope, or None for a builtin.
+
+        Args:
+            name (str): The name.
+            scope (Scope): The scope the name is used in.
+            local (bool): Whether the bindings of the scope itself are seen, as opposed to
+                          only the ones of the functions enclosing it.
+        """
+        if local:
+            if name in scope.globals or name in scope.nonlocals or name in scope.bindings:
+                return self.binding_scope(name, scope)
+            scope = scope.parent
+        while scope is not None:
+            if not isinstance(scope.node, ast.ClassDef) and name in scope.bindings:
+                return self.binding_scope(name, scope)
+            scope = scope.parent
+        return None
+
+    def _visit_all(self, nodes) -> None:
+        for node in nodes:
+            if node is not None:
+                self.visit(node)
+
+    def _enter(self, node: ast.AST, visit_body: Callable[[], None]) -> None:
+        scope = self.scope
+        self.scope = Scope(node, scope)
+        visit_body()
+        self.scope = scope
+
+    def _bind(self, name: Optional[str], node: ast.AST, scope: Optional[Scope] = None) -> None:
+        if name:
+            self.binding_scope(name, scope or self.scope).bind(name, node)
+
+    def _bind_arguments(self, arguments: ast.arguments) -> None:
+        for argument in arguments.posonlyargs + arguments.args + [arguments.vararg] + arguments.kwonlyargs + [arguments.kwarg]:
+            if argument is not None:
+                self._bind(argument.arg, argument)
+
+    def visit_FunctionDef(self, node):
+        self._bind(node.name, node)
+        self.definitions.append((node, self.binding_scope(node.name, self.scope)))
+        arguments = node.args
+        self._visit_all(node.decorator_list + arguments.defaults + arguments.kw_defaults + [node.returns])
+        self._visit_all(
+            argument.annotation
+            for argument in arguments.posonlyargs + arguments.args + [arguments.vararg] + arguments.kwonlyargs + [arguments.kwarg]
+            if argument is not None
+        )
+
+        def visit_body():
+            self._bind_arguments(arguments)
+            self._visit_all(node.body)
+
+        self._enter(node, visit_body)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node):
+        self._visit_all(node.args.defaults + node.args.kw_defaults)
+
+        def visit_body():
+            self._bind_arguments(node.args)
+            self.visit(node.body)
+
+        self._enter(node, visit_body)
+
+    def visit_ClassDef(self, node):
+        self._bind(node.name, node)
+        self.definitions.append((node, self.binding_scope(node.name, self.scope)))
+        self._visit_all(node.decorator_list + node.bases + [item.value for item in node.keywords])
+        self._enter(node, lambda: self._visit_all(node.body))
+
+    def _visit_comprehension(self, node, elements: list) -> None:
+        generators = node.generators
+        self.visit(generators[0].iter)
+
+        def visit_body():
+            for index, generator in enumerate(generators):
+                if index:
+                    self.visit(generator.iter)
+                self.visit(generator.target)
+                self._visit_all(generator.ifs)
+            self._visit_all(elements)
+
+        self._enter(node, visit_body)
+
+    def visit_ListComp(self, node):
+        self._visit_comprehension(node, [node.elt])
+
+    visit_SetComp = visit_GeneratorExp = visit_ListComp
+
+    def visit_DictComp(self, node):
+        self._visit_comprehension(node, [node.key, node.value])
+
+    def visit_NamedExpr(self, node):
+        self.visit(node.value)
+        scope = self.scope
+        while isinstance(scope.node, COMPREHENSION_NODES):
+            scope = scope.parent
+        self._bind(node.target.id, node.target, scope)
+        self.names.append((node.target, scope))
+
+    def visit_Name(self, node):
+        if not isinstance(node.ctx, ast.Load):
+            self._bind(node.id, node)
+        self.names.append((node, self.scope))
+
+    def visit_Attribute(self, node):
+        self.attributes.append((node, self.scope))
+        self.visit(node.value)
+
+    def visit_Global(self, node):
+        self.scope.globals.update(node.names)
+        self.declared.update(node.names)
+
+    def visit_Nonlocal(self, node):
+        self.scope.nonlocals.update(node.names)
+        self.declared.update(node.names)
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self._bind(alias.asname or alias.name.split(".")[0], alias)
+
+    visit_ImportFrom = visit_Import
+
+    def visit_ExceptHandler(self, node):
+        self._bind(node.name, node)
+        self.generic_visit(node)
+
+    def visit_MatchAs(self, node):
+        self._bind(node.name, node)
+        self.generic_visit(node)
+
+    visit_MatchStar = visit_MatchAs
+
+    def visit_MatchMapping(self, node):
+        self._bind(node.rest, node)
+        self.generic_visit(node)
+
+
+def python_identifiers(tree: ast.AST) -> Set[str]:
+    """
+    Collects every identifier of a module: names, attributes, arguments, imports and keywords.
+    """
+    identifiers = set()
+    for node in ast.walk(tree):
+        for field in ("id", "name", "arg", "attr", "asname", "rest"):
+            value = getattr(node, field, None)
+            if isinstance(value, str):
+                identifiers.update(value.split("."))
+        if isinstance(node, (ast.Global, ast.Nonlocal)):
+            identifiers.update(node.names)
+    return identifiers
+
+
+class PythonRenamer:
+    """
+    Finds the occurrences of the functions and classes of a module to rename, resolving each
+    name to the definition it refers to.
+
+    A definition is renamed along with the names that refer to it from the scopes that see
+    it, including the expressions of f-strings, and, for a method or a nested class, the
+    attributes of its class or of the first argument of one of its methods. Keyword
+    arguments and the attributes of other objects are left alone. A definition keeps its
+    name when it cannot be renamed safely:
+
+    - its class has bases, a metaclass, or is the base of another class, since frameworks
+      and subclasses look its methods up by name (e.g., `setUp` or `visit_Name`);
+    - it is a framework hook (see `FRAMEWORK_HOOKS`) or a special method;
+    - its name is also bound by an import, an argument, an `except` or a `match` clause, is
+      declared `global` or `nonlocal`, or is a string of the module, as in `__all__`;
+    - it is a method or a nested class used as the attribute of another object.
+
+    Attributes:
+        text (str): The source of the module.
+        tree (ast.Module): Its syntax tree.
+        scopes (ScopeBuilder): Its scopes.
+    """
+    def __init__(self, text: str):
+        self.text = text
+        self.tree = ast.parse(text)
+        self.scopes = ScopeBuilder()
+        self.scopes.visit(self.tree)
+        self.line_starts = [0] + [match.end() for match in NEWLINE_PATTERN.finditer(text)]
+        self.strings = {
+            node.value for node in ast.walk(self.tree) if isinstance(node, ast.Constant) and isinstance(node.value, str)
+        }
+        self.bases = {
+            base.id if isinstance(base, ast.Name) else base.attr
+            for node in ast.walk(self.tree)
+            if isinstance(node, ast.ClassDef)
+            for base in node.bases
+            if isinstance(base, (ast.Name, ast.Attribute))
+        }
+
+    def offset(self, line: int, column: int) -> int:
+        """
+        Converts a position of the syntax tree, whose column counts UTF-8 bytes, to an offset in the text.
+        """
+        start = self.line_starts[line - 1]
+        end = self.line_starts[line] if line < len(self.line_starts) else len(self.text)
+        return start + len(self.text[start:end].encode("utf-8")[:column].decode("utf-8", "replace"))
+
+    def occurrences(self, name: str) -> List[int]:
+        """
+        Finds the offsets of every definition of a name that can be renamed, and of its references.
+        """
+        if name in FRAMEWORK_HOOKS or name in self.strings or name in self.scopes.declared:
+            return []
+        if name.startswith("__") and name.endswith("__"):
+            return []
+        owners = []
+        for node, scope in self.scopes.definitions:
+            if node.name == name and scope not in owners:
+                owners.append(scope)
+        offsets = []
+        for owner in owners:
+            found = self._binding_occurrences(owner, name)
+            if found is not None and all(self.text.startswith(name, offset) for offset in found):
+                offsets.extend(found)
+        return sorted(set(offsets))
+
+    def _binding_occurrences(self, owner: Scope, name: str) -> Optional[List[int]]:
+        """
+        Finds the offsets of a name bound in a scope and of the references to that binding,
+        or returns None if the binding cannot be renamed.
+        """
+        offsets = []
+        for node in owner.bindings[name]:
+            if isinstance(node, ast.Name):
+                offsets.append(self.offset(node.lineno, node.col_offset))
+            elif isinstance(node, DEFINITION_NODES):
+                match = DEFINITION_PATTERN.match(self.text, self.offset(node.lineno, node.col_offset))
+                if match is None:
+                    return None
+                offsets.append(match.end())
+            else:
+                return None
+        for node, scope in self.scopes.names:
+            if node.id == name and self.scopes.resolve(name, scope) is owner:
+                offsets.append(self.offset(node.lineno, node.col_offset))
+        if isinstance(owner.node, ast.ClassDef):
+            attributes = self._attribute_occurrences(owner, name)
+            if attributes is None:
+                return None
+            offsets.extend(attributes)
+        return offsets
+
+    def _attribute_occurrences(self, owner: Scope, name: str) -> Optional[List[int]]:
+        """
+        Finds the offsets of the attributes referring to a member of a class, or returns None
+        if the class is extended or the name is also used as the attribute of other objects.
+        """
+        class_node = owner.node
+        if class_node.bases or class_node.keywords or class_node.name in self.bases:
+            return None
+        class_scope = next(scope for node, scope in self.scopes.definitions if node is class_node)
+        receivers = {}
+        for node in class_node.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.args.posonlyargs + node.args.args:
+                receivers[node] = (node.args.posonlyargs + node.args.args)[0].arg
+        offsets = []
+        for node, scope in self.scopes.attributes:
+            if node.attr != name:
+                continue
+            value = node.value
+            if not isinstance(value, ast.Name):
+                return None
+            binding = self.scopes.resolve(value.id, scope)
+            if binding is None:
+                return None
+            if not (
+                (value.id == class_node.name and binding is class_scope)
+                or receivers.get(binding.node) == value.id
+            ):
+                return None
+            offsets.append(self.offset(node.end_lineno, node.end_col_offset) - len(name))
+        return offsets
+
+
+def find_python_occurrences(text: str, renames: Dict[str, str]) -> Tuple[List[Tuple[int, str]], Set[str]]:
+    """
+    Finds the occurrences of the Python functions and classes to rename (see `PythonRenamer`).
+
+    Args:
+        text (str): The source of the module.
+        renames (Dict[str, str]): The new name of each name to rename.
+
+    Returns:
+        Tuple[List[Tuple[int, str]], Set[str]]: The offset of each occurrence in the text and
+                                                the old name found there, and the identifiers
+                                                the module already uses. Nothing is renamed in
+                                                a module that cannot be parsed.
+    """
+    try:
+        renamer = PythonRenamer(text)
+    except (SyntaxError, ValueError):
+        return [], set()
+    occurrences = [(offset, name) for name in renames for offset in renamer.occurrences(name)]
+    return sorted(occurrences), python_identifiers(renamer.tree)
+
+
+def iter_identifiers(text: str) -> Iterable[Tuple[int, str]]:
+    """
+    Finds the identifiers of a C source, outside of comments and strings.
+
+    Args:
+        text (str): The source, tokenized with `CLexer`.
+
+    Yields:
+        Tuple[int, str]: The offset of each identifier in the text, and the identifier.
+    """
+    line_starts = [0] + [match.end() for match in NEWLINE_PATTERN.finditer(text)]
+    lexer = CLexer()
+    for line_start, line in zip(line_starts, text.split("\n")):
+        for token in lexer.tokenize(line.rstrip("\r")):
+            if token.kind == IDENTIFIER:
+                yield line_start + token.column - 1, token.text
+
+
+def read_source(path: str) -> Tuple[str, str]:
+    """
+    Reads a source file as text, keeping its line breaks.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        Tuple[str, str]: The text, and the encoding to write it back with: "utf-8-sig" if
+                         the file starts with a byte order mark, "utf-8" if it is valid
+                         UTF-8, and "latin-1" otherwise.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    encoding = "utf-8-sig" if data.startswith(UTF8_BOM) else "utf-8"
+    try:
+        return data.decode(encoding), encoding
+    except UnicodeDecodeError:
+        return data.decode("latin-1"), "latin-1"
+
+
+def apply_edits(text: str, edits: List[Tuple[int, str, str]]) -> str:
+    """
+    Replaces names in a text, building the result in a single pass.
+
+    Args:
+        text (str): The text.
+        edits (List[Tuple[int, str, str]]): The offset, old name and new name of each
+                                            replacement. They must not overlap.
+
+    Returns:
+        str: The edited text.
+    """
+    pieces = []
+    position = 0
+    for offset, old, new in sorted(edits):
+        pieces.append(text[position:offset])
+        pieces.append(new)
+        position = offset + len(old)
+    pieces.append(text[position:])
+    return "".join(pieces)
+
+
+def rewrite_file(path: str, edits: List[Tuple[int, str, str]]) -> None:
+    """
+    Applies edits to a file and writes it once, in its own encoding and line breaks.
+
+    Args:
+        path (str): The path of the file.
+        edits (List[Tuple[int, str, str]]): The edits, as taken by `apply_edits`.
+    """
+    text, encoding = read_source(path)
+    with open(path, "w", encoding=encoding, newline="") as file:
+        file.write(apply_edits(text, edits))
@@ -0,0 +1,183 @@
+from bisect import bisect_right
+from typing import FrozenSet, List, Optional, Tuple
+
+from naming_check.main import DEFAULT_PYTHON_ENGINE, create_analyzer
+from naming_check.warning import NamingWarning
+
+DEFAULT_CHECKPOINT_INTERVAL = 64
+
+
+class IncrementalDocument:
+    """
+    A document kept analyzed while it is edited, as in an editor.
+
+    The line-based analyzers (`CAnalyzer` and the "regex" Python engine) only carry a small
+    state from one line to the next: the lexer state, the struct being watched and the struct
+    types seen so far for C, and the open multiline string for Python. The document saves
+    that state every `checkpoint_interval` lines. After an edit, the analysis resumes from
+    the last checkpoint before the edit, and stops as soon as it reaches a checkpoint past
+    the edit whose state is unchanged: from there on, the previous warnings are kept, only
+    shifted by the number of lines the edit added or removed.
+
+    Engines that need the whole file, such as the "ast" Python engine, re-analyze the whole
+    document after each edit.
+
+    Attributes:
+        path (str): The path of the document, whose extension selects the analyzer.
+        known_types (FrozenSet[str]): The struct types declared by the headers a C document
+                                      includes.
+        lines (List[str]): The lines of the document.
+        warnings (List[NamingWarning]): The warnings of the document, in line order.
+        lines_analyzed (int): The number of lines analyzed by the last update.
+    """
+    def __init__(
+        self,
+        path: str,
+        text: str = "",
+        python_engine: str = DEFAULT_PYTHON_ENGINE,
+        enabled_rules: Optional[Tuple[str, ...]] = None,
+        checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+        known_types: FrozenSet[str] = frozenset(),
+    ):
+        self.path = path
+        self.known_types = known_types
+        self.python_engine = python_engine
+        self.enabled_rules = enabled_rules
+        self.checkpoint_interval = checkpoint_interval
+        self.lines: List[str] = []
+        self.warnings: List[NamingWarning] = []
+        self.checkpoints: List[Tuple[int, tuple]] = []
+        self.lines_analyzed = 0
+        self.set_text(text)
+
+    def create_analyzer(self):
+        """
+        Creates a fresh analyzer for the document.
+        """
+        return create_analyzer([], self.path, self.python_engine, self.enabled_rules, self.known_types)
+
+    def set_text(self, text: str) -> List[NamingWarning]:
+        """
+        Replaces the whole content of the document and analyzes it from the start.
+
+        Args:
+            text (str): The new content.
+
+        Returns:
+            List[NamingWarning]: The warnings of the document.
+        """
+        self.lines = split_lines(text)
+        self.warnings = []
+        self.checkpoints = []
+        self.reanalyze(0, None, 0)
+        return self.warnings
+
+    def apply_edit(
+        self, start_line: int, start_character: int, end_line: int, end_character: int, text: str
+    ) -> List[NamingWarning]:
+        """
+        Replaces a range of the document and re-analyzes the lines it affects.
+
+        Positions are 0-based, as in the Language Server Protocol, and the end is exclusive.
+
+        Args:
+            start_line (int): The line the range starts on.
+            start_character (int): The character the range starts at.
+            end_line (int): The line the range ends on.
+            end_character (int): The character the range ends before.
+            text (str): The replacement text, which may span several lines.
+
+        Returns:
+            List[NamingWarning]: The warnings of the document.
+        """
+        if not self.lines:
+            self.lines = [""]
+        start_line = min(max(start_line, 0), len(self.lines) - 1)
+        end_line = min(max(end_line, start_line), len(self.lines) - 1)
+        prefix = self.lines[start_line][:start_character]
+        suffix = self.lines[end_line][end_character:]
+        replacement = split_lines(prefix + text + suffix) or [""]
+        self.lines[start_line:end_line + 1] = replacement
+        delta = len(replacement) - (end_line + 1 - start_line)
+        self.reanalyze(start_line, end_line + 1, delta)
+        return self.warnings
+
+    def reanalyze(self, start: int, old_end: Optional[int], delta: int) -> None:
+        """
+        Re-analyzes the document from the last checkpoint before `start`.
+
+        Args:
+            start (int): The index of the first edited line.
+            old_end (Optional[int]): The index, before the edit, of the line following the
+                                     edited ones, or None when everything changed.
+            delta (int): The number of lines added by the edit, negative if removed.
+        """
+        analyzer = self.create_analyzer()
+        if analyzer is None:
+            self.warnings = []
+            self.lines_analyzed = 0
+            return
+        if not hasattr(analyzer, "get_state"):
+            analyzer.code = self.lines
+            self.warnings = analyzer.analyze()
+            self.lines_analyzed = len(self.lines)
+            return
+
+        position = bisect_right([index for index, _ in self.checkpoints], start)
+        resume = 0
+        if position:
+            resume, state = self.checkpoints[position - 1]
+            analyzer.set_state(state)
+        old_checkpoints = self.checkpoints[position:]
+        old_warnings = self.warnings
+        self.checkpoints = self.checkpoints[:position]
+        warnings = [warning for warning in old_warnings if warning.line <= resume]
+
+        # The checkpoints past the edit, moved to their new line: reaching one of them in the
+        # same state means the rest of the document is analyzed as before.
+        pending = {} if old_end is None else {
+            index + delta: state for index, state in old_checkpoints if index >= old_end
+        }
+        converged_at = None
+        interval = self.checkpoint_interval
+        for index in range(resume, len(self.lines)):
+            if index in pending and analyzer.get_state() == pending[index]:
+                converged_at = index
+                break
+            if index > resume and (index - resume) % interval == 0:
+                self.checkpoints.append((index, analyzer.get_state()))
+            analyzer.current_line = index + 1
+            analyzer.check_line(self.lines[index])
+            if analyzer.line_warnings:
+                warnings.extend(analyzer.line_warnings)
+                analyzer.line_warnings = []
+
+        if converged_at is None:
+            self.lines_analyzed = len(self.lines) - resume
+        else:
+            self.lines_analyzed = converged_at - resume
+            old_line = converged_at - delta
+            tail = [warning for warning in old_warnings if warning.line > old_line]
+            if delta:
+                tail = [warning._replace(line=warning.line + delta) for warning in tail]
+            warnings.extend(tail)
+            self.checkpoints.extend(sorted(
+                (index, state) for index, state in pending.items() if index >= converged_at
+            ))
+        self.warnings = warnings
+
+
+def split_lines(text: str) -> List[str]:
+    """
+    Splits a text into lines, treating "\\r\\n", "\\r" and "\\n" alike.
+
+    Unlike `str.splitlines`, a text ending with a line break ends with an empty line, so
+    the positions of an editor map directly to the list.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        List[str]: The lines, without their line breaks.
+    """
+    return text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
@@ -0,0 +1,53 @@
+import re
+from importlib import import_module
+from typing import Dict, Iterator, Mapping
+
+
+class LazyPattern:
+    """
+    A regular expression compiled the first time it is used.
+
+    Modules declare their patterns at import time, but a run rarely uses all of them: a
+    Python-only run never lexes C, and most runs never read a diff. Each method of the
+    compiled pattern, such as `match` or `finditer`, is looked up once and stored on the
+    instance, so later calls cost the same as on a compiled pattern.
+
+    Attributes:
+        pattern (str): The source of the regular expression.
+        flags (int): The flags it is compiled with.
+    """
+    def __init__(self, pattern: str, flags: int = 0):
+        self.pattern = pattern
+        self.flags = flags
+
+    def __getattr__(self, name: str):
+        # Only called for the attributes not found on the instance, i.e. once per method.
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = getattr(re.compile(self.pattern, self.flags), name)
+        setattr(self, name, value)
+        return value
+
+    def __repr__(self):
+        return f"LazyPattern({self.pattern!r}, {self.flags})"
+
+
+class LazyClasses(Mapping):
+    """
+    A mapping of names to classes that imports the module of a class when it is looked up.
+
+    Attributes:
+        paths (Dict[str, str]): The `module:Class` path of each name.
+    """
+    def __init__(self, paths: Dict[str, str]):
+        self.paths = paths
+
+    def __getitem__(self, name: str) -> type:
+        module, _, attribute = self.paths[name].partition(":")
+        return getattr(import_module(module), attribute)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
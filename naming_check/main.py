@@ -1,77 +1,1042 @@
+import os
 import sys
+from collections import Counter
+from functools import partial
+from types import SimpleNamespace
+from typing import Callable, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
 
-from naming_check.analyzers.c_analyzer import CAnalyzer
-from naming_check.analyzers.python_analyzer import PythonAnalyzer
+from naming_check.cache import DEFAULT_MAX_ENTRIES, ResultCache
+from naming_check.config import CONFIG_FILE_NAME, Config, find_config, load_config, split_rules
+from naming_check.diff import filter_changed_lines, parse_unified_diff
+from naming_check.lazy import LazyClasses
+from naming_check.output import WRITERS
+from naming_check.profiling import Profiler
+from naming_check.reader import DEFAULT_MAX_FILE_SIZE, open_lines
+from naming_check.rules.registry import C, PYTHON, default_registry
+from naming_check.baseline import Baseline, Suppressions
+from naming_check.summary import Site, SummaryCache, content_digest, evaluate, summarize
+from naming_check.type_index import C_EXTENSIONS, TypeIndex
+from naming_check.warning import NamingWarning
 
 
-def c_analyzer(code):
+def c_analyzer(code, file=None):
     """
     Analyzes C code and returns a list of warnings related to coding style and conventions.
 
     Args:
-        code (List[str]): A list of strings representing the lines of C code to analyze.
+        code (Iterable[str]): The lines of C code to analyze, such as a list, an open file or a
+                              generator. The lines are processed as a stream.
+        file (Optional[str]): The path of the code, recorded in the warnings.
 
     Returns:
-        List[str]: A list of warning messages found during the analysis.
+        List[NamingWarning]: A list of warnings found during the analysis.
     """
-    analyzer = CAnalyzer(code)
+    from naming_check.analyzers.c_analyzer import CAnalyzer
+
+    analyzer = CAnalyzer(code, file)
     return analyzer.analyze()
     
 
 
-def py_analyzer(code):
+# The engines are imported when first used, so a run only loads the ones it needs.
+PYTHON_ENGINES = LazyClasses({
+    "regex": "naming_check.analyzers.python_analyzer:PythonAnalyzer",
+    "ast": "naming_check.analyzers.python_ast_analyzer:PythonAstAnalyzer",
+})
+
+DEFAULT_PYTHON_ENGINE = "regex"
+
+
+def py_analyzer(code, engine=DEFAULT_PYTHON_ENGINE, file=None):
     """
     Analyzes Python code and returns a list of warnings related to coding style and conventions.
 
     Args:
-        code (List[str]): A list of strings representing the lines of Python code to analyze.
+        code (Iterable[str]): The lines of Python code to analyze, such as a list, an open file
+                              or a generator. The "regex" engine processes them as a stream
+                              while the "ast" engine needs the whole source to parse it.
+        engine (str): The analysis engine, either "regex" (line by line) or "ast" (through
+                      the abstract syntax tree).
+        file (Optional[str]): The path of the code, recorded in the warnings.
 
     Returns:
-        List[str]: A list of warning messages found during the analysis.
+        List[NamingWarning]: A list of warnings found during the analysis.
     """
-    analyzer = PythonAnalyzer(code)
+    analyzer = PYTHON_ENGINES[engine](code, file)
     return analyzer.analyze()
 
 
-def analyze():
+ANALYZED_EXTENSIONS = frozenset([".c", ".h", ".py"])
+
+
+def discover_files(paths: List[str], is_excluded: Optional[Callable[[str], bool]] = None) -> List[str]:
     """
-    Starts the analysis process by reading the input file and running the appropriate analyzer based on the file type.
+    Expands the given paths into the sorted list of files that can be analyzed.
 
-    The function performs the following steps:
-    1. Checks if an input file was provided as a command-line argument.
-    2. Reads the content of the input file into a list of code lines.
-    3. Determines the file type (C or Python) based on the file extension.
-    4. Runs the corresponding analyzer (CAnalyzer for `.c` files, PythonAnalyzer for `.py` files).
-    5. Prints any warnings generated during the analysis.
+    Files given explicitly are always kept. Directories are walked recursively, skipping
+    hidden directories (such as `.git`), and only files with a supported extension are kept.
 
-    Raises:
-        Exception: If no input file is provided via command-line arguments.
+    Args:
+        paths (List[str]): Files and directories provided by the user.
+        is_excluded (Optional[Callable[[str], bool]]): Tells whether a path is excluded.
+                                                       Excluded directories are pruned
+                                                       from the walk, so nothing below them
+                                                       is listed or read.
+
+    Returns:
+        List[str]: The files to analyze, in a deterministic order.
     """
-    args = sys.argv
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        for root, directories, filenames in os.walk(path):
+            directories[:] = sorted(
+                directory
+                for directory in directories
+                if not directory.startswith(".")
+                and (is_excluded is None or not is_excluded(os.path.join(root, directory)))
+            )
+            for filename in sorted(filenames):
+                if os.path.splitext(filename)[1] in ANALYZED_EXTENSIONS:
+                    input_file = os.path.join(root, filename)
+                    if is_excluded is None or not is_excluded(input_file):
+                        files.append(input_file)
+    return files
 
-    if len(args) == 1:
-        raise ValueError("No input file was provided")
 
-    input_file = args[1]
+def create_analyzer(
+    code,
+    input_file: str,
+    python_engine: str = DEFAULT_PYTHON_ENGINE,
+    enabled_rules: Optional[Tuple[str, ...]] = None,
+    known_types: Optional[FrozenSet[str]] = None,
+    suppressions: Optional[Suppressions] = None,
+):
+    """
+    Creates the analyzer that matches the extension of a file.
+
+    Only the analyzer of the language of the file is imported.
+
+    Args:
+        code (Iterable[str]): The lines of code to analyze.
+        input_file (str): The path of the code.
+        python_engine (str): The engine used for Python files (see `py_analyzer`).
+        enabled_rules (Optional[Tuple[str, ...]]): The rules to run. The others are left
+                                                   out of the dispatch table of the analyzer.
+                                                   Defaults to every rule.
+        known_types (Optional[FrozenSet[str]]): The struct types declared by the headers a
+                                                C file includes (see `TypeIndex.types_for`).
+        suppressions (Optional[Suppressions]): The warnings to drop. Defaults to the ones
+                                               ignored by inline comments.
+
+    Returns:
+        The analyzer of the code, or None if the extension is not supported.
+    """
+    extension = os.path.splitext(input_file)[1]
+    if extension in C_EXTENSIONS:
+        from naming_check.analyzers.c_analyzer import CAnalyzer
+
+        return CAnalyzer(
+            code, input_file, default_registry().dispatch(C, enabled_rules), known_types or frozenset(), suppressions
+        )
+    if extension == ".py":
+        return PYTHON_ENGINES[python_engine](
+            code, input_file, default_registry().dispatch(PYTHON, enabled_rules), suppressions
+        )
+    return None
+
 
-    warnings = []
+def analyze_file(
+    input_file: str,
+    python_engine: str = DEFAULT_PYTHON_ENGINE,
+    changed_lines: Optional[Set[int]] = None,
+    profiler: Optional[Profiler] = None,
+    enabled_rules: Optional[Tuple[str, ...]] = None,
+    known_types: Optional[FrozenSet[str]] = None,
+    max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+    baseline: Optional[Baseline] = None,
+) -> List[NamingWarning]:
+    """
+    Reads a single file and runs the analyzer that matches its extension.
+
+    The file is memory-mapped and streamed to the analyzer line by line, each line decoded
+    on its own, so files in legacy encodings such as Latin-1 are analyzed too (see
+    `naming_check.reader.open_lines`). Binary files and files larger than `max_file_size`
+    are skipped.
 
+    Args:
+        input_file (str): The path of the file to analyze.
+        python_engine (str): The engine used for Python files (see `py_analyzer`).
+        changed_lines (Optional[Set[int]]): When given, only the warnings raised on these
+                                            lines are kept, and the file is not read past
+                                            the last of them. The lines before are still
+                                            analyzed, since declarations carry over lines.
+        profiler (Optional[Profiler]): When given, the handlers and rules run on the file
+                                       are counted and timed by it.
+        enabled_rules (Optional[Tuple[str, ...]]): The rules to run. Defaults to every rule.
+        known_types (Optional[FrozenSet[str]]): The struct types declared by the headers a
+                                                C file includes.
+        max_file_size (int): The size, in bytes, above which the file is skipped. `0` means
+                             no limit.
+        baseline (Optional[Baseline]): The accepted warnings, which are not reported.
+                                       Warnings ignored by inline comments are never
+                                       reported.
+
+    Returns:
+        List[NamingWarning]: The warnings found in the file. Files with an unsupported
+                             extension and skipped files produce no warnings.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        IOError: If the file cannot be read.
+    """
     try:
-        with open(input_file, "r") as file:
-            code = file.read().splitlines()
+        with open_lines(input_file, max_file_size) as code:
+            if code is None:
+                return []
+            suppressions = None if baseline is None else Suppressions(input_file, baseline)
+            analyzer = create_analyzer(code, input_file, python_engine, enabled_rules, known_types, suppressions)
+            if analyzer is None:
+                return []
+            if profiler is not None:
+                with profiler.profile(analyzer):
+                    return run_analyzer(analyzer, changed_lines)
+            return run_analyzer(analyzer, changed_lines)
     except FileNotFoundError as exc:
          raise FileNotFoundError(f"The file '{input_file}' does not exist.")
     except IOError as e:
         raise IOError(f"An error occurred while trying to read the file '{input_file}': {str(e)}")
 
 
-    if input_file.endswith(".c"):
-        warnings = c_analyzer(code)
-    elif input_file.endswith(".py"):
-        warnings = py_analyzer(code)
+def run_analyzer(analyzer, changed_lines: Optional[Set[int]] = None) -> List[NamingWarning]:
+    """
+    Runs an analyzer over its whole code, or up to the last changed line.
+
+    Args:
+        analyzer: The analyzer of a file.
+        changed_lines (Optional[Set[int]]): When given, only the warnings raised on these
+                                            lines are kept.
+
+    Returns:
+        List[NamingWarning]: The warnings found.
+    """
+    if changed_lines is None:
+        return analyzer.analyze()
+    return filter_changed_lines(analyzer.iter_warnings(), changed_lines)
+
+
+def analyze_files(
+    files: List[str],
+    jobs: int = 1,
+    chunk_size: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+    changed_lines: Optional[Dict[str, Set[int]]] = None,
+    profiler: Optional[Profiler] = None,
+    type_index: Optional[TypeIndex] = None,
+    summaries: Optional[SummaryCache] = None,
+    **options,
+) -> Iterator[Tuple[str, List[NamingWarning]]]:
+    """
+    Analyzes several files, optionally fanning the work out over a pool of processes.
+
+    Files are sent to the workers in chunks so that the inter-process overhead is paid
+    once per chunk rather than once per file. Results are always yielded in the order of
+    `files`, regardless of which worker finishes first.
+
+    Args:
+        files (List[str]): The files to analyze.
+        jobs (int): The number of worker processes. `1` analyzes in the current process
+                    and `0` uses one worker per CPU.
+        chunk_size (Optional[int]): The number of files handed to a worker at a time.
+                                    Defaults to a size that gives each worker a few chunks.
+        cache (Optional[ResultCache]): A cache to serve unchanged files from. Only the
+                                       files missing from it are analyzed, and their
+                                       results are stored back into it. With a baseline,
+                                       the path of the file is part of its key.
+        changed_lines (Optional[Dict[str, Set[int]]]): The changed lines of each file. When
+                                                       given, only the warnings raised on the
+                                                       changed lines of a file are kept.
+        profiler (Optional[Profiler]): When given, every file is analyzed, even when it is
+                                       cached, and the counters of each worker are merged
+                                       into the profiler as the results come in.
+        type_index (Optional[TypeIndex]): An index of the struct types declared across the
+                                          project. Each C file is analyzed knowing the types
+                                          of the headers it includes, which are also part of
+                                          its cache key. The index must be up to date.
+        summaries (Optional[SummaryCache]): A cache of the binding sites of Python files.
+                                            Python files missing from the result cache are
+                                            summarized once, in the workers, and their
+                                            rules are then run over the summaries, so a
+                                            summarized file is never parsed again. Not used
+                                            while profiling.
+        **options: Keyword arguments forwarded to `analyze_file`.
+
+    Yields:
+        Tuple[str, List[NamingWarning]]: Each file paired with its warnings.
+    """
+    tasks = [
+        (
+            input_file,
+            None if changed_lines is None else changed_lines.get(input_file, set()),
+            None if type_index is None or os.path.splitext(input_file)[1] not in C_EXTENSIONS
+            else type_index.types_for(input_file) or None,
+        )
+        for input_file in files
+    ]
+    keys = [None] * len(files)
+    cached = [None] * len(files)
+    baseline = options.get("baseline")
+    if cache is not None:
+        for index, (input_file, file_changed_lines, known_types) in enumerate(tasks):
+            file_options = options
+            if baseline is not None and baseline.fingerprints:
+                # The baseline suppresses warnings by path, so files with the same content
+                # may keep different warnings.
+                file_options = dict(file_options, baseline_file=baseline.file_key(input_file))
+            if file_changed_lines is not None:
+                file_options = dict(file_options, changed_lines=sorted(file_changed_lines))
+            if known_types is not None:
+                file_options = dict(file_options, known_types=sorted(known_types))
+            try:
+                with open(input_file, "rb") as file:
+                    keys[index] = cache.key(file, file_options)
+            except OSError:
+                continue
+            if profiler is None:
+                cached[index] = cache.get(keys[index], input_file)
+
+    summarized = [None] * len(files)
+    if summaries is not None and profiler is None:
+        engine = options.get("python_engine", DEFAULT_PYTHON_ENGINE)
+        missing = []
+        for index, input_file in enumerate(files):
+            if cached[index] is None and os.path.splitext(input_file)[1] == ".py":
+                summarized[index] = summaries.get(input_file, engine)
+                if summarized[index] is None:
+                    missing.append(index)
+        new_summaries = map_tasks(_summary_task, [files[index] for index in missing], jobs, chunk_size, options)
+        for index, (sites, stat, digest) in zip(missing, new_summaries):
+            if sites is None:
+                # Whether a file is skipped depends on the maximum size of the run, which
+                # the summaries are not keyed by, so skipped files are not cached.
+                summarized[index] = []
+                continue
+            summaries.put(files[index], engine, sites, stat, digest)
+            summarized[index] = sites
+
+    pending = [task for task, hit, sites in zip(tasks, cached, summarized) if hit is None and sites is None]
+    results = _run_analysis(pending, jobs, chunk_size, options, profiler is not None)
+
+    for index, input_file in enumerate(files):
+        warnings = cached[index]
+        if warnings is None and summarized[index] is not None:
+            warnings = evaluate(
+                summarized[index],
+                default_registry().dispatch(PYTHON, options.get("enabled_rules")),
+                input_file,
+                Suppressions(input_file, options.get("baseline")),
+            )
+            if tasks[index][1] is not None:
+                warnings = filter_changed_lines(warnings, tasks[index][1])
+            if keys[index] is not None:
+                cache.put(keys[index], warnings)
+        elif warnings is None:
+            warnings = next(results)
+            if profiler is not None:
+                warnings, snapshot = warnings
+                profiler.merge(snapshot)
+            if keys[index] is not None:
+                cache.put(keys[index], warnings)
+        yield input_file, warnings
+
+
+def _analyze_task(task: Tuple[str, Optional[Set[int]], Optional[FrozenSet[str]]], options: dict) -> List[NamingWarning]:
+    """
+    Runs `analyze_file` for a file, its changed lines and the types known from its headers.
+
+    Args:
+        task (Tuple[str, Optional[Set[int]], Optional[FrozenSet[str]]]): The file, its changed
+                                                                        lines and its known
+                                                                        types, if any.
+        options (dict): Keyword arguments forwarded to `analyze_file`.
+
+    Returns:
+        List[NamingWarning]: The warnings of the file.
+    """
+    input_file, changed_lines, known_types = task
+    return analyze_file(input_file, changed_lines=changed_lines, known_types=known_types, **options)
+
+
+def _profile_task(
+    task: Tuple[str, Optional[Set[int]], Optional[FrozenSet[str]]], options: dict
+) -> Tuple[List[NamingWarning], dict]:
+    """
+    Runs `analyze_file` for a file, its changed lines and its known types under a fresh `Profiler`.
+
+    Args:
+        task (Tuple[str, Optional[Set[int]], Optional[FrozenSet[str]]]): The file, its changed
+                                                                        lines and its known
+                                                                        types, if any.
+        options (dict): Keyword arguments forwarded to `analyze_file`.
+
+    Returns:
+        Tuple[List[NamingWarning], dict]: The warnings of the file and the snapshot of the
+                                          profiler, to be merged by the caller.
+    """
+    input_file, changed_lines, known_types = task
+    profiler = Profiler()
+    warnings = analyze_file(
+        input_file, changed_lines=changed_lines, profiler=profiler, known_types=known_types, **options
+    )
+    return warnings, profiler.snapshot()
+
+
+def _summary_task(input_file: str, options: dict) -> Tuple[Optional[List[Site]], os.stat_result, Optional[str]]:
+    """
+    Summarizes the binding sites of a Python file (see `naming_check.summary`).
+
+    Args:
+        input_file (str): The path of the file.
+        options (dict): Keyword arguments of `analyze_file`, of which the Python engine and
+                        the maximum file size are used.
+
+    Returns:
+        Tuple[Optional[List[Site]], os.stat_result, Optional[str]]: The sites, and the status
+            and content hash of the file they were found in. The sites and the hash are None
+            when the file is skipped, as binary or too large.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    try:
+        stat = os.stat(input_file)
+        with open_lines(input_file, options.get("max_file_size", DEFAULT_MAX_FILE_SIZE)) as code:
+            if code is None:
+                return None, stat, None
+            digest = content_digest(input_file)
+            analyzer_class = PYTHON_ENGINES[options.get("python_engine", DEFAULT_PYTHON_ENGINE)]
+            sites = summarize(analyzer_class, code, input_file)
+    except FileNotFoundError as exc:
+         raise FileNotFoundError(f"The file '{input_file}' does not exist.")
+    return sites, stat, digest
+
+
+def _run_analysis(
+    tasks: List[Tuple[str, Optional[Set[int]], Optional[FrozenSet[str]]]],
+    jobs: int,
+    chunk_size: Optional[int],
+    options: dict,
+    profile: bool = False,
+) -> Iterator[List[NamingWarning]]:
+    """
+    Runs `analyze_file` over the files, in a process pool when more than one job is used.
+
+    Args:
+        tasks (List[Tuple[str, Optional[Set[int]], Optional[FrozenSet[str]]]]): The files to
+                                                                               analyze, each with
+                                                                               its changed lines
+                                                                               and known types,
+                                                                               if any.
+        jobs (int): The number of worker processes, `0` meaning one per CPU.
+        chunk_size (Optional[int]): The number of files handed to a worker at a time.
+        options (dict): Keyword arguments forwarded to `analyze_file`.
+        profile (bool): Whether each file is profiled. Each result is then paired with
+                        the snapshot of its profiler.
+
+    Returns:
+        Iterator[List[NamingWarning]]: The warnings of each file, in the order of `tasks`.
+    """
+    return map_tasks(_profile_task if profile else _analyze_task, tasks, jobs, chunk_size, options)
+
+
+def map_tasks(function: Callable, tasks: list, jobs: int, chunk_size: Optional[int], options: dict) -> Iterator:
+    """
+    Runs a task function over tasks, in a process pool when more than one job is used.
+
+    Args:
+        function (Callable): A module-level function taking a task and the `options`.
+        tasks (list): The tasks.
+        jobs (int): The number of worker processes, `0` meaning one per CPU.
+        chunk_size (Optional[int]): The number of tasks handed to a worker at a time.
+        options (dict): Keyword arguments forwarded to `analyze_file`.
+
+    Yields:
+        The result of each task, in the order of `tasks`.
+    """
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+
+    run_one = partial(function, options=options)
+    if jobs == 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield run_one(task)
+        return
+
+    if chunk_size is None:
+        chunk_size = max(1, len(tasks) // (jobs * 4))
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(run_one, tasks, chunksize=chunk_size)
+
+
+def read_diff(diff: str) -> Dict[str, Set[int]]:
+    """
+    Reads a unified diff and finds the lines it changes.
+
+    Args:
+        diff (str): The path of the diff, or "-" to read it from the standard input.
+
+    Returns:
+        Dict[str, Set[int]]: The numbers of the changed lines of each file.
+
+    Raises:
+        FileNotFoundError: If the diff file does not exist.
+    """
+    if diff == "-":
+        return parse_unified_diff(sys.stdin)
+    try:
+        with open(diff, "r") as file:
+            return parse_unified_diff(file)
+    except FileNotFoundError as exc:
+         raise FileNotFoundError(f"The diff '{diff}' does not exist.")
+
+
+def select_changed_files(
+    changed_lines: Dict[str, Set[int]],
+    paths: List[str],
+    is_excluded: Optional[Callable[[str], bool]] = None,
+) -> List[str]:
+    """
+    Selects the changed files that can be analyzed.
+
+    Args:
+        changed_lines (Dict[str, Set[int]]): The changed lines of each file.
+        paths (List[str]): Files and directories to restrict the selection to. All the
+                           changed files are selected when empty.
+        is_excluded (Optional[Callable[[str], bool]]): Tells whether a file is excluded.
+
+    Returns:
+        List[str]: The existing changed files with a supported extension, in sorted order.
+    """
+    roots = [os.path.normpath(path) for path in paths]
+    files = []
+    for input_file in sorted(changed_lines):
+        if os.path.splitext(input_file)[1] not in ANALYZED_EXTENSIONS:
+            continue
+        if not os.path.isfile(input_file):
+            continue
+        if is_excluded is not None and is_excluded(input_file):
+            continue
+        normalized = os.path.normpath(input_file)
+        if roots and not any(
+            normalized == root or normalized.startswith(root + os.sep) or root == "."
+            for root in roots
+        ):
+            continue
+        files.append(input_file)
+    return files
+
+
+def load_project_config(config_file: Optional[str] = None) -> Config:
+    """
+    Loads the given configuration file, or the one of the project in the current directory.
+
+    Args:
+        config_file (Optional[str]): The path of the configuration file, if given explicitly.
+
+    Returns:
+        Config: The configuration, or the default one if the project has none.
+    """
+    if config_file is None:
+        config_file = find_config(os.getcwd())
+        if config_file is None:
+            return Config()
+    return load_config(config_file)
+
+
+# The seconds without any change after which `--watch` considers a burst of saves over.
+DEFAULT_DEBOUNCE = 0.2
+
+
+# The value of every option when only paths are given. The parser takes its defaults from
+# here too, so both ways of reading the command line agree.
+DEFAULT_ARGUMENTS = {
+    "jobs": 1,
+    "python_engine": DEFAULT_PYTHON_ENGINE,
+    "cache_dir": None,
+    "cache_size": DEFAULT_MAX_ENTRIES,
+    "diff": None,
+    "format": "text",
+    "output": None,
+    "config": None,
+    "select": None,
+    "ignore": [],
+    "serve": False,
+    "stdio": False,
+    "daemon": False,
+    "socket": None,
+    "fix": False,
+    "baseline": None,
+    "update_baseline": False,
+    "max_file_size": DEFAULT_MAX_FILE_SIZE,
+    "no_type_index": False,
+    "profile": False,
+    "shard": None,
+    "shard_output": None,
+    "watch": None,
+    "debounce": DEFAULT_DEBOUNCE,
+}
+
+
+def parse_paths_only(argv: List[str]) -> Optional[SimpleNamespace]:
+    """
+    Reads a command line made of paths only, such as the files handed by a pre-commit hook,
+    without importing and building the argument parser.
+
+    Args:
+        argv (List[str]): The command-line arguments.
+
+    Returns:
+        Optional[SimpleNamespace]: The arguments, as `build_parser` would parse them, or None
+                                   if there is no path or an option is given.
+    """
+    if not argv or any(argument.startswith("-") for argument in argv):
+        return None
+    return SimpleNamespace(paths=list(argv), **DEFAULT_ARGUMENTS)
+
+
+def build_parser() -> "ArgumentParser":
+    """
+    Builds the command-line parser of the analyzer.
+
+    Returns:
+        ArgumentParser: The parser for the `naming_check` command.
+    """
+    from argparse import ArgumentParser
+
+    from naming_check.shard import parse_shard
+
+    parser = ArgumentParser(
+        prog="naming_check",
+        description="A Static analysis tool for check naming conventions",
+    )
+    parser.add_argument(
+        "paths", nargs="*", help="Files or directories to analyze."
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes (0 uses one per CPU). Defaults to 1.",
+    )
+    parser.add_argument(
+        "--python-engine",
+        choices=sorted(PYTHON_ENGINES),
+        default=DEFAULT_PYTHON_ENGINE,
+        help="Engine used for Python files: line-based regular expressions or the syntax tree.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory of the result cache. Unchanged files are served from it.",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help=f"Maximum number of files kept in the cache. Defaults to {DEFAULT_MAX_ENTRIES}.",
+    )
+    parser.add_argument(
+        "--diff",
+        metavar="DIFF",
+        help=(
+            "Unified diff (a file, or - for the standard input) whose changed files are "
+            "analyzed, reporting only the warnings on changed lines."
+        ),
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(WRITERS),
+        default="text",
+        help="Output format: plain text, JSON Lines or SARIF. Defaults to text.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="File to write the warnings to. Defaults to the standard output.",
+    )
+    parser.add_argument(
+        "--config",
+        help=(
+            f"Configuration file. Defaults to the first {CONFIG_FILE_NAME} or pyproject.toml "
+            "with a [tool.naming_check] table found from the current directory upwards."
+        ),
+    )
+    parser.add_argument(
+        "--select",
+        type=split_rules,
+        help="Comma-separated rules to run, replacing the configured selection. Accepts globs such as c-*.",
+    )
+    parser.add_argument(
+        "--ignore",
+        type=split_rules,
+        default=[],
+        help="Comma-separated rules not to run, in addition to the configured ones.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a daemon keeping the analyzers and the result cache warm, on --socket.",
+    )
+    parser.add_argument(
+        "--stdio",
+        action="store_true",
+        help="With --serve, talk JSON-RPC/LSP over the standard input and output instead of a socket.",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Send the files to the running daemon. Falls back to analyzing in process if none is running.",
+    )
+    parser.add_argument(
+        "--socket",
+        help="Unix socket of the daemon. Defaults to a per-user socket in the temporary directory.",
+    )
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help=(
+            "Rename the names breaking a fixable rule, with all their occurrences (across the "
+            "project for C), before reporting the remaining warnings."
+        ),
+    )
+    parser.add_argument(
+        "--baseline",
+        metavar="FILE",
+        help="Baseline of accepted warnings, which are not reported.",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write every warning found to the --baseline file, accepting them, instead of reporting them.",
+    )
+    parser.add_argument(
+        "--max-file-size",
+        type=int,
+        default=DEFAULT_MAX_FILE_SIZE,
+        help=f"Size in bytes above which files are skipped (0 for no limit). Defaults to {DEFAULT_MAX_FILE_SIZE}.",
+    )
+    parser.add_argument(
+        "--no-type-index",
+        action="store_true",
+        help="Do not index the struct types declared in headers; only the types of each file are known.",
+    )
+    parser.add_argument(
+        "--shard",
+        metavar="INDEX/COUNT",
+        type=parse_shard,
+        help=(
+            "Analyze only the INDEX-th of COUNT size-balanced shards of the files, e.g. 2/4, "
+            "and write its results for `naming_check merge`."
+        ),
+    )
+    parser.add_argument(
+        "--shard-output",
+        metavar="FILE",
+        help="Result file of the shard. Defaults to naming_check-shard-INDEX-of-COUNT.json.",
+    )
+    parser.add_argument(
+        "--watch",
+        metavar="DIR",
+        help=(
+            "Analyze DIR, then keep running and, each time files are saved, analyze the files "
+            "affected again and print the new (+) and resolved (-) warnings."
+        ),
+    )
+    parser.add_argument(
+        "--debounce",
+        metavar="SECONDS",
+        type=float,
+        help=f"With --watch, seconds without change that end a burst of saves. Defaults to {DEFAULT_DEBOUNCE}.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Count the calls, hits and time of every handler and rule, and print the hottest "
+            "ones to the standard error. Cached results are not used."
+        ),
+    )
+    parser.set_defaults(**DEFAULT_ARGUMENTS)
+    return parser
+
+
+def analyze(argv: Optional[List[str]] = None):
+    """
+    Starts the analysis process by reading the input files and running the appropriate analyzer based on the file type.
+
+    Startup is kept short for hooks that check a few files: when only paths are given, the
+    command line is read without `argparse`, and only the analyzers of the languages found
+    are imported.
+
+    The function performs the following steps:
+    1. Checks if an input file or directory was provided as a command-line argument.
+    2. Expands directories into the C and Python files they contain.
+    3. Runs the corresponding analyzer (CAnalyzer for `.c` files, PythonAnalyzer for `.py` files)
+       for each file, in parallel when `--jobs` is greater than one.
+    4. Writes any warnings generated during the analysis, in file order, in the format chosen
+       with `--format`. In text, when more than one file is analyzed, each warning is
+       prefixed with the path of its file. The output is flushed after every file, so
+       consumers can read the results while the analysis goes on.
+
+    Files are decoded line by line, falling back from UTF-8 to Latin-1, and binary files or
+    files larger than `--max-file-size` are skipped.
+
+    With `--cache-dir`, files whose content and rule set are unchanged since a previous run
+    are served from the result cache instead of being analyzed again. The binding sites of
+    Python files are cached there too (see `naming_check.summary`), so changing the rules
+    re-runs them over the cached sites without parsing the files again.
+
+    Before the C files are analyzed, the struct types declared by each of them and by the
+    headers they include are indexed in a first pass (see `naming_check.type_index`), so
+    declarations using types from headers are checked. The index is kept in the cache
+    directory and only changed files are scanned again. `--no-type-index` skips this pass.
+
+    With `--diff`, only the files changed by the diff are analyzed, restricted to the given
+    paths if any, and only the warnings raised on changed lines are reported.
+
+    The rules to run, their severities and the paths to exclude are read from the project
+    configuration (see `naming_check.config`); `--select` and `--ignore` override the rules.
+    Disabled rules are removed from the dispatch tables of the analyzers, and excluded
+    directories are pruned from the walk.
+
+    With `--serve`, the analyzer runs as a daemon instead (see `naming_check.server`), and
+    with `--daemon`, the files are sent to that daemon when it is running.
+
+    Warnings on a line holding a `naming-check: ignore` comment are not reported. With
+    `--baseline`, the warnings accepted in the baseline file are not reported either (see
+    `naming_check.baseline`), and `--update-baseline` rewrites that file with every warning
+    found instead of reporting them.
+
+    With `--fix`, the names breaking a rule that can be fixed by renaming, such as the case
+    of variables, functions, enums and constants, are renamed first, with all their
+    occurrences (see `naming_check.fix`), and the warnings left are reported.
+
+    With `--profile`, a table of the handlers and rules sorted by cumulative time, followed
+    by the slowest files, is written to the standard error once the analysis ends.
+
+    With `--shard INDEX/COUNT`, the files are split in COUNT shards of similar total size
+    (see `naming_check.shard`) and only the INDEX-th is analyzed. Its results are also
+    written to `--shard-output`, and `naming_check merge` combines the files of every shard
+    into the report of the whole tree (see `merge`).
+
+    With `--watch DIR`, the directory is analyzed, then watched: each burst of saves has the
+    files it affects analyzed again, and only the warnings that appeared or were resolved
+    are printed (see `naming_check.watch`).
+
+    Args:
+        argv (Optional[List[str]]): The command-line arguments. Defaults to `sys.argv[1:]`.
+
+    Raises:
+        Exception: If no input file is provided via command-line arguments.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["merge"]:
+        merge(argv[1:])
+        return
+    args = parse_paths_only(argv) or build_parser().parse_args(argv)
+
+    config = load_project_config(args.config)
+    if args.select is not None:
+        config = config._replace(select=tuple(args.select))
+    config = config._replace(ignore=config.ignore + tuple(args.ignore))
+
+    if args.serve:
+        from naming_check.server import serve
+
+        serve(args.socket, config, args.cache_dir, args.cache_size, args.python_engine, args.stdio)
+        return
+
+    if not args.paths and args.diff is None and args.watch is None:
+        raise ValueError("No input file was provided")
+
+    enabled_rules = config.enabled_rules(default_registry().rule_ids())
+    is_excluded = config.exclusion_filter()
+    options = {"python_engine": args.python_engine}
+    if enabled_rules is not None:
+        options["enabled_rules"] = enabled_rules
+    if args.max_file_size != DEFAULT_MAX_FILE_SIZE:
+        options["max_file_size"] = args.max_file_size
+    if args.update_baseline and args.baseline is None:
+        raise ValueError("--update-baseline requires --baseline")
+    if args.baseline is not None and not args.update_baseline:
+        options["baseline"] = Baseline.load(args.baseline)
+
+    if args.watch is not None:
+        if args.paths or args.diff is not None or args.fix or args.update_baseline or args.shard is not None:
+            raise ValueError("--watch cannot be combined with paths, --diff, --fix, --update-baseline or --shard")
+        if args.format != "text":
+            raise ValueError("--watch only writes the text format")
+        from naming_check.watch import watch
+
+        output = open(args.output, "w") if args.output else sys.stdout
+        try:
+            type_index = None if args.no_type_index else TypeIndex(args.cache_dir)
+            watch(args.watch, output, config.severity, is_excluded, args.jobs, type_index, args.debounce, **options)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        return
+
+    changed_lines = None
+    if args.diff is not None:
+        changed_lines = read_diff(args.diff)
+        files = select_changed_files(changed_lines, args.paths, is_excluded)
+        show_file = True
+    else:
+        files = discover_files(args.paths, is_excluded)
+        show_file = len(args.paths) > 1 or os.path.isdir(args.paths[0])
+    positions = None
+    if args.shard is not None:
+        if args.fix or args.update_baseline:
+            raise ValueError("--shard cannot be combined with --fix or --update-baseline")
+        from naming_check.shard import assign_shards
+
+        index, count = args.shard
+        positions = [position for position, shard in enumerate(assign_shards(files, count)) if shard == index - 1]
+        files = [files[position] for position in positions]
+    cache = ResultCache(args.cache_dir, args.cache_size) if args.cache_dir else None
+    output = open(args.output, "w") if args.output else sys.stdout
+    writer = WRITERS[args.format](output, show_file, config.severity)
+    profiler = Profiler() if args.profile else None
+    type_index = None
+    if not args.no_type_index and any(os.path.splitext(input_file)[1] in C_EXTENSIONS for input_file in files):
+        type_index = TypeIndex(args.cache_dir)
+        type_index.update(files, args.jobs)
+    if args.fix:
+        if changed_lines is not None:
+            raise ValueError("--fix cannot be combined with --diff")
+        from naming_check.fix import fix_files
+
+        report = fix_files(files, args.jobs, type_index, **options)
+        renamed = len({rename for renames in report.renames.values() for rename in renames.items()})
+        print(f"Fixed {report.edits} occurrences of {renamed} names in {report.files} files.", file=sys.stderr)
+        if type_index is not None:
+            type_index.update(files, args.jobs)
+    summaries = None
+    if args.cache_dir and any(os.path.splitext(input_file)[1] == ".py" for input_file in files):
+        summaries = SummaryCache(args.cache_dir)
+
+    try:
+        writer.begin()
+        results = None
+        if args.daemon and changed_lines is None and profiler is None and args.baseline is None:
+            from naming_check.server import DEFAULT_SOCKET_PATH, analyze_with_daemon
+
+            results = analyze_with_daemon(files, args.socket or DEFAULT_SOCKET_PATH, **options)
+        if results is None:
+            results = analyze_files(
+                files,
+                args.jobs,
+                cache=cache,
+                changed_lines=changed_lines,
+                profiler=profiler,
+                type_index=type_index,
+                summaries=summaries,
+                **options,
+            )
+        if args.update_baseline:
+            baseline = Baseline.write(args.baseline, results)
+            print(f"Accepted {len(baseline.fingerprints)} warnings in {args.baseline}.", file=sys.stderr)
+            results = ()
+        shard_results = None if positions is None else []
+        for position, (input_file, warnings) in enumerate(results):
+            for warning in warnings:
+                writer.write(warning)
+            writer.flush()
+            if shard_results is not None:
+                shard_results.append((positions[position], input_file, warnings))
+        writer.end()
+        if shard_results is not None:
+            from naming_check.shard import write_shard
+
+            index, count = args.shard
+            shard_output = args.shard_output or f"naming_check-shard-{index}-of-{count}.json"
+            write_shard(shard_output, args.shard, show_file, shard_results)
+            print(f"Wrote the results of {len(shard_results)} files to {shard_output}.", file=sys.stderr)
+        if profiler is not None:
+            profiler.report(sys.stderr)
+    finally:
+        if cache is not None:
+            cache.save()
+        if type_index is not None:
+            type_index.save()
+        if summaries is not None:
+            summaries.save()
+        if output is not sys.stdout:
+            output.close()
+
+
+def merge(argv: List[str]) -> None:
+    """
+    Combines the result files of the shards of a run into one report: `naming_check merge`.
+
+    The warnings are written in the order the whole tree would have been reported in by a
+    single run, in the format chosen with `--format`, and the totals of the run, per rule,
+    are written to the standard error.
+
+    Args:
+        argv (List[str]): The arguments following `merge` on the command line.
+
+    Raises:
+        ValueError: If the result files do not hold each shard of a run exactly once.
+    """
+    from argparse import ArgumentParser
+
+    from naming_check.shard import merge_shards
+
+    parser = ArgumentParser(
+        prog="naming_check merge",
+        description="Combines the result files written by the shards of a --shard run into one report.",
+    )
+    parser.add_argument("shard_files", nargs="+", help="The result file of every shard.")
+    parser.add_argument(
+        "--format",
+        choices=sorted(WRITERS),
+        default="text",
+        help="Output format: plain text, JSON Lines or SARIF. Defaults to text.",
+    )
+    parser.add_argument("-o", "--output", help="File to write the warnings to. Defaults to the standard output.")
+    parser.add_argument("--config", help="Configuration file, for the severity of the rules.")
+    args = parser.parse_args(argv)
+
+    config = load_project_config(args.config)
+    show_file, results = merge_shards(args.shard_files)
+    totals = Counter()
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        writer = WRITERS[args.format](output, show_file, config.severity)
+        writer.begin()
+        for input_file, warnings in results:
+            for warning in warnings:
+                writer.write(warning)
+                totals[warning.rule] += 1
+        writer.end()
+    finally:
+        if output is not sys.stdout:
+            output.close()
 
-    for warning in warnings:
-        print(warning)
+    reported = sum(1 for _, warnings in results if warnings)
+    print(
+        f"Merged {len(args.shard_files)} shards: {sum(totals.values())} warnings in {reported} of {len(results)} files.",
+        file=sys.stderr,
+    )
+    for rule, count in sorted(totals.items(), key=lambda total: (-total[1], total[0])):
+        print(f"  {count:>8} {rule}", file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,155 @@
+import json
+import os
+from typing import Dict, Optional, TextIO
+
+from naming_check.config import DEFAULT_SEVERITY
+from naming_check.constants import WARNING_MESSAGES
+from naming_check.warning import NamingWarning
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+SEVERITY_LABELS = {"error": "ERROR", "warning": "WARN", "note": "NOTE"}
+
+
+class TextWriter:
+    """
+    Writes warnings in the human-readable format of the analyzer, one per line.
+
+    Every writer receives the warnings one at a time, as the files are analyzed, and writes
+    them straight to its stream, so nothing is accumulated in memory and the consumer can
+    start reading before the analysis ends.
+
+    Each warning is reported with the severity configured for its rule, a warning by default.
+
+    """
+    def __init__(self, stream: TextIO, show_file: bool = False, severities: Optional[Dict[str, str]] = None):
+        self.stream = stream
+        self.show_file = show_file
+        self.severities = severities or {}
+
+    def severity(self, warning: NamingWarning) -> str:
+        """
+        Returns the severity of a warning: "error", "warning" or "note".
+
+        Args:
+            warning (NamingWarning): The warning.
+        """
+        return self.severities.get(warning.rule, DEFAULT_SEVERITY)
+
+    def begin(self) -> None:
+        """
+        Writes whatever must come before the first warning.
+        """
+
+    def write(self, warning: NamingWarning) -> None:
+        """
+        Writes one warning.
+
+        Args:
+            warning (NamingWarning): The warning to be written.
+        """
+        text = warning.format(SEVERITY_LABELS[self.severity(warning)])
+        if self.show_file:
+            self.stream.write(f"{warning.file}: {text}\n")
+        else:
+            self.stream.write(f"{text}\n")
+
+    def flush(self) -> None:
+        """
+        Hands the warnings written so far to the consumer of the stream.
+        """
+        self.stream.flush()
+
+    def end(self) -> None:
+        """
+        Writes whatever must come after the last warning and flushes the stream.
+        """
+        self.flush()
+
+
+class JsonLinesWriter(TextWriter):
+    """
+    Writes warnings as JSON Lines: one JSON object per warning, per line.
+
+    """
+    def write(self, warning: NamingWarning) -> None:
+        """
+        Writes one warning as a JSON object.
+
+        Args:
+            warning (NamingWarning): The warning to be written.
+        """
+        self.stream.write(json.dumps({
+            "file": warning.file,
+            "line": warning.line,
+            "column": warning.column,
+            "rule": warning.rule,
+            "severity": self.severity(warning),
+            "message": warning.message,
+        }))
+        self.stream.write("\n")
+
+
+class SarifWriter(TextWriter):
+    """
+    Writes warnings as a SARIF 2.1.0 log with a single run.
+
+    The log is streamed: the header is written by `begin`, each result as it arrives, and
+    the closing brackets by `end`.
+
+    """
+    def __init__(self, stream: TextIO, show_file: bool = False, severities: Optional[Dict[str, str]] = None):
+        super().__init__(stream, show_file, severities)
+        self.results_written = 0
+
+    def begin(self) -> None:
+        """
+        Writes the header of the log, describing the tool and its rules.
+        """
+        driver = {
+            "name": "naming_check",
+            "rules": [
+                {"id": rule, "shortDescription": {"text": message}}
+                for rule, message in WARNING_MESSAGES.items()
+            ],
+        }
+        header = json.dumps({"$schema": SARIF_SCHEMA, "version": "2.1.0"})
+        self.stream.write(f'{header[:-1]}, "runs": [{{"tool": {{"driver": {json.dumps(driver)}}}, "results": [')
+
+    def write(self, warning: NamingWarning) -> None:
+        """
+        Writes one warning as a SARIF result.
+
+        Args:
+            warning (NamingWarning): The warning to be written.
+        """
+        result = {
+            "ruleId": warning.rule,
+            "level": self.severity(warning),
+            "message": {"text": warning.message},
+            "locations": [{
+                "physicalLocation": {
+                    "artifactLocation": {"uri": (warning.file or "").replace(os.sep, "/")},
+                    "region": {"startLine": warning.line, "startColumn": warning.column},
+                },
+            }],
+        }
+        if self.results_written:
+            self.stream.write(",")
+        self.stream.write("\n")
+        self.stream.write(json.dumps(result))
+        self.results_written += 1
+
+    def end(self) -> None:
+        """
+        Closes the results, the run and the log, then flushes the stream.
+        """
+        self.stream.write("\n]}]}\n")
+        self.flush()
+
+
+WRITERS = {
+    "text": TextWriter,
+    "jsonl": JsonLinesWriter,
+    "sarif": SarifWriter,
+}
@@ -0,0 +1,234 @@
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from naming_check.rules.shapes import shape_cache_info
+
+HANDLER_SUFFIX = "_handler"
+
+DEFAULT_REPORT_FILES = 10
+
+
+class ProfileStats:
+    """
+    The counters of a single handler or rule.
+
+    Attributes:
+        calls (int): The number of times it was called.
+        hits (int): The number of warnings it raised.
+        seconds (float): The cumulative time spent in it, including the rules a handler calls.
+    """
+    __slots__ = ("calls", "hits", "seconds")
+
+    def __init__(self, calls: int = 0, hits: int = 0, seconds: float = 0.0):
+        self.calls = calls
+        self.hits = hits
+        self.seconds = seconds
+
+    def __repr__(self):
+        return f"ProfileStats(calls={self.calls}, hits={self.hits}, seconds={self.seconds:.6f})"
+
+
+class Profiler:
+    """
+    Counts the calls, hits and cumulative time of every handler and rule, and the time spent
+    in every file.
+
+    Nothing is instrumented until `profile` is used, so the analyzers run untouched, at no
+    cost, when profiling is disabled. While a file is profiled, the handlers of its analyzer
+    (its `*_handler` methods) and the rules of its dispatch table are wrapped on the instance.
+    A warning is credited as a hit to the last rule called before it was appended, and to
+    every handler running at that time.
+
+    Stats are keyed by `Class.handler` for handlers and by rule identifier for rules, e.g.
+    `CAnalyzer.variable_handler` and `c-variable-snake-case`.
+
+    The hits and misses of the identifier shape cache shared by the rules (see
+    `naming_check.rules.shapes`) are counted while each file is profiled.
+
+    Attributes:
+        stats (Dict[str, ProfileStats]): The counters of each handler and rule.
+        files (Dict[str, float]): The seconds spent analyzing each file.
+        shape_hits (int): The names whose shape was served from the cache.
+        shape_misses (int): The names whose shape was computed.
+    """
+    def __init__(self):
+        self.stats: Dict[str, ProfileStats] = {}
+        self.files: Dict[str, float] = {}
+        self.shape_hits = 0
+        self.shape_misses = 0
+        self.last_rule: Optional[ProfileStats] = None
+
+    @contextmanager
+    def profile(self, analyzer):
+        """
+        Profiles an analyzer while the block runs. The block must consume its warnings.
+
+        Args:
+            analyzer: The analyzer of a file.
+        """
+        self.instrument(analyzer)
+        shapes = shape_cache_info()
+        start = time.perf_counter()
+        try:
+            yield analyzer
+        finally:
+            elapsed = time.perf_counter() - start
+            self.last_rule = None
+            shapes_after = shape_cache_info()
+            self.shape_hits += shapes_after.hits - shapes.hits
+            self.shape_misses += shapes_after.misses - shapes.misses
+            file = str(analyzer.file)
+            self.files[file] = self.files.get(file, 0.0) + elapsed
+
+    def instrument(self, analyzer) -> None:
+        """
+        Wraps the handlers, the rules and `append_warning` of an analyzer instance.
+
+        Args:
+            analyzer: The analyzer to instrument.
+        """
+        class_name = type(analyzer).__name__
+        for name in dir(type(analyzer)):
+            if name.endswith(HANDLER_SUFFIX):
+                setattr(analyzer, name, self.wrap_handler(analyzer, f"{class_name}.{name}", getattr(analyzer, name)))
+        analyzer.rules = {
+            kind: tuple(rule._replace(check=self.wrap_rule(rule.id, rule.check)) for rule in rules)
+            for kind, rules in analyzer.rules.items()
+        }
+        append_warning = analyzer.append_warning
+
+        def counted_append_warning(rule):
+            if self.last_rule is not None:
+                self.last_rule.hits += 1
+                self.last_rule = None
+            append_warning(rule)
+
+        analyzer.append_warning = counted_append_warning
+
+    def wrap_handler(self, analyzer, name: str, handler):
+        """
+        Wraps a handler so its calls, time and the warnings it appends are counted.
+
+        Args:
+            analyzer: The analyzer the handler belongs to.
+            name (str): The name the handler is reported under.
+            handler (Callable): The bound handler.
+
+        Returns:
+            Callable: The wrapped handler.
+        """
+        stats = self.stats.setdefault(name, ProfileStats())
+
+        def profiled_handler(*args, **kwargs):
+            warnings = len(analyzer.line_warnings)
+            start = time.perf_counter()
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                stats.seconds += time.perf_counter() - start
+                stats.calls += 1
+                stats.hits += len(analyzer.line_warnings) - warnings
+
+        return profiled_handler
+
+    def wrap_rule(self, name: str, rule):
+        """
+        Wraps a rule so its calls and time are counted.
+
+        Args:
+            name (str): The name the rule is reported under.
+            rule (Callable): The rule function.
+
+        Returns:
+            Callable: The wrapped rule.
+        """
+        stats = self.stats.setdefault(name, ProfileStats())
+
+        def profiled_rule(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return rule(*args, **kwargs)
+            finally:
+                stats.seconds += time.perf_counter() - start
+                stats.calls += 1
+                self.last_rule = stats
+
+        profiled_rule.__wrapped__ = rule
+        return profiled_rule
+
+    def snapshot(self) -> dict:
+        """
+        Exports the counters, e.g. to send them from a worker process to the parent.
+
+        Returns:
+            dict: The counters as plain, picklable values.
+        """
+        return {
+            "stats": {name: (stats.calls, stats.hits, stats.seconds) for name, stats in self.stats.items()},
+            "files": dict(self.files),
+            "shapes": (self.shape_hits, self.shape_misses),
+        }
+
+    def merge(self, snapshot: dict) -> None:
+        """
+        Adds the counters of a snapshot to this profiler.
+
+        Args:
+            snapshot (dict): The counters, as returned by `snapshot`.
+        """
+        for name, (calls, hits, seconds) in snapshot["stats"].items():
+            stats = self.stats.setdefault(name, ProfileStats())
+            stats.calls += calls
+            stats.hits += hits
+            stats.seconds += seconds
+        for file, seconds in snapshot["files"].items():
+            self.files[file] = self.files.get(file, 0.0) + seconds
+        hits, misses = snapshot.get("shapes", (0, 0))
+        self.shape_hits += hits
+        self.shape_misses += misses
+
+    def hot_rules(self) -> List[Tuple[str, ProfileStats]]:
+        """
+        Returns the handlers and rules that were called, slowest first.
+
+        Returns:
+            List[Tuple[str, ProfileStats]]: Each name with its counters.
+        """
+        return sorted(
+            ((name, stats) for name, stats in self.stats.items() if stats.calls),
+            key=lambda item: item[1].seconds,
+            reverse=True,
+        )
+
+    def report(self, stream: TextIO = sys.stderr, files: int = DEFAULT_REPORT_FILES) -> None:
+        """
+        Writes the hot-rule table followed by the slowest files.
+
+        The share of each row is relative to the total time spent analyzing files. Handlers
+        include the time of the rules they call, so the shares do not add up to 100%.
+
+        Args:
+            stream (TextIO): The stream the report is written to.
+            files (int): The number of slowest files listed.
+        """
+        total = sum(self.files.values()) or 1.0
+        stream.write(f"{'Handler / rule':<64} {'Calls':>10} {'Hits':>8} {'Total ms':>10} {'us/call':>9} {'Share':>7}\n")
+        for name, stats in self.hot_rules():
+            stream.write(
+                f"{name:<64} {stats.calls:>10,} {stats.hits:>8,} {stats.seconds * 1000:>10.1f} "
+                f"{stats.seconds / stats.calls * 1e6:>9.2f} {stats.seconds / total:>7.1%}\n"
+            )
+        slowest = sorted(self.files.items(), key=lambda item: item[1], reverse=True)[:files]
+        if slowest:
+            stream.write(f"\n{'Slowest files':<64} {'Total ms':>10} {'Share':>7}\n")
+            for file, seconds in slowest:
+                stream.write(f"{file:<64} {seconds * 1000:>10.1f} {seconds / total:>7.1%}\n")
+        lookups = self.shape_hits + self.shape_misses
+        if lookups:
+            stream.write(
+                f"\nIdentifier shape cache: {lookups:,} lookups, {self.shape_hits:,} hits "
+                f"({self.shape_hits / lookups:.1%}), {self.shape_misses:,} names classified\n"
+            )
+        stream.write(f"\n{len(self.files):,} files analyzed in {sum(self.files.values()) * 1000:.1f} ms\n")
@@ -0,0 +1,109 @@
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# The size of the block sniffed at the start of a file to tell whether it is binary.
+SNIFF_SIZE = 8192
+
+# The size of the blocks the lines are split from. Blocks end on a line break.
+BLOCK_SIZE = 64 * 1024
+
+# Files larger than this are skipped: they are generated or data files, not code.
+DEFAULT_MAX_FILE_SIZE = 16 * 1024 * 1024
+
+UTF8_BOM = b"\xef\xbb\xbf"
+
+
+@contextmanager
+def open_lines(path: str, max_size: int = DEFAULT_MAX_FILE_SIZE) -> Iterator[Optional[Iterator[str]]]:
+    """
+    Opens a source file and provides its lines, decoded one at a time.
+
+    The file is memory-mapped rather than read, so no copy of the whole content is made:
+    lines are sliced out of the mapping a block at a time (see `iter_lines`) and decoded
+    lazily. Blocks that are plain ASCII, as most code is, are decoded at once; in the others,
+    each line is decoded as UTF-8 and, when it is not valid UTF-8, as Latin-1, which accepts
+    any byte. Legacy files therefore never fail to decode, and a single stray byte only
+    affects its own line.
+
+    The first block of the file is sniffed beforehand: files holding a null byte are
+    binary and are skipped, as are files larger than `max_size`.
+
+    Args:
+        path (str): The path of the file.
+        max_size (int): The size, in bytes, above which the file is skipped. `0` means no limit.
+
+    Yields:
+        Optional[Iterator[str]]: The lines of the file, without their line breaks, or None
+                                 if the file is skipped. The lines can only be read while
+                                 the context is open.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        OSError: If the file cannot be read.
+    """
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if max_size and size > max_size:
+            yield None
+            return
+        if size == 0:
+            yield iter(())
+            return
+        if b"\0" in file.read(SNIFF_SIZE):
+            yield None
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield iter_lines(data)
+
+
+def iter_lines(data) -> Iterator[str]:
+    """
+    Splits a buffer into decoded lines, on "\\n" and "\\r\\n" line breaks.
+
+    The buffer is consumed in blocks of about `BLOCK_SIZE` bytes, cut after a line break,
+    so at most one block is held in memory besides the buffer itself.
+
+    Args:
+        data (Union[bytes, mmap.mmap]): The content of a file.
+
+    Yields:
+        str: Each line, without its line break.
+    """
+    start = 3 if data[:3] == UTF8_BOM else 0
+    end_of_data = len(data)
+    while start < end_of_data:
+        stop = start + BLOCK_SIZE
+        if stop >= end_of_data:
+            stop = end_of_data
+        else:
+            newline = data.rfind(b"\n", start, stop)
+            stop = newline + 1 if newline != -1 else data.find(b"\n", stop) + 1 or end_of_data
+        block = data[start:stop]
+        start = stop
+        if block.isascii():
+            lines = block.decode("ascii").replace("\r\n", "\n").split("\n")
+        else:
+            lines = [decode_line(line) for line in block.replace(b"\r\n", b"\n").split(b"\n")]
+        if block.endswith(b"\n"):
+            lines.pop()
+        yield from lines
+
+
+def decode_line(line: bytes) -> str:
+    """
+    Decodes a line, trying ASCII, then UTF-8, then Latin-1.
+
+    Args:
+        line (bytes): The line.
+
+    Returns:
+        str: The decoded line.
+    """
+    if line.isascii():
+        return line.decode("ascii")
+    try:
+        return line.decode("utf-8")
+    except UnicodeDecodeError:
+        return line.decode("latin-1")
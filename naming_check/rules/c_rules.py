@@ -1,194 +1,323 @@
-import re 
-from typing import List
-from naming_check.constants import PRE_DECLARATION_TYPES
+from collections import namedtuple
+from typing import List, Optional
+from naming_check.analyzers.c_lexer import IDENTIFIER, PUNCTUATION, Token
+from naming_check.constants import PRE_DECLARATION_TYPES, VARIABLE_DECLARATION_TYPES
+from naming_check.rules.shapes import LOWER_CASE, PASCAL_CASE, SINGLE_CHARACTER, SNAKE_CASE, UPPER_CASE, identifier_shape
 
+DECLARATION_SPECIFIERS = frozenset(VARIABLE_DECLARATION_TYPES + PRE_DECLARATION_TYPES + ["const"])
 
-def rule_initialized_all_variables(declaration: str) -> bool:  
+OPENING_BRACKETS = frozenset(["(", "[", "{"])
+CLOSING_BRACKETS = frozenset([")", "]", "}"])
+
+Declarator = namedtuple("Declarator", ["name", "is_pointer", "is_initialized"])
+Declarator.__doc__ = """
+A single declarator of a variable declaration, e.g. "*p = NULL" in "int x, *p = NULL;".
+
+Attributes:
+    name (Optional[Token]): The identifier being declared, or None if there is none.
+    is_pointer (bool): Whether an asterisk comes before the name.
+    is_initialized (bool): Whether the declarator has an initializer.
+"""
+
+Declaration = namedtuple("Declaration", ["tokens", "declarators"])
+Declaration.__doc__ = """
+A variable declaration parsed once and shared by every rule that checks declarations.
+
+Attributes:
+    tokens (List[Token]): The tokens of the whole declaration.
+    declarators (List[Declarator]): Its declarators, in order.
+"""
+
+
+def split_declarators(declaration: List[Token]) -> List[List[Token]]:
+    """
+    Splits the tokens of a variable declaration into its declarators, leaving the type out.
+
+    Args:
+        declaration (List[Token]): The tokens of a declaration (e.g., "int *p, x = 1;").
+
+    Returns:
+        List[List[Token]]: The tokens of each declarator (e.g., "*p" and "x = 1"). Commas
+                           nested in brackets, such as in initializers, do not split.
+    """
+    index = 0
+    while index < len(declaration) and declaration[index].text in DECLARATION_SPECIFIERS:
+        index += 2 if declaration[index].text == "struct" else 1
+    if index == 0:
+        index = 1
+
+    declarators = [[]]
+    depth = 0
+    for token in declaration[index:]:
+        if token.kind == PUNCTUATION:
+            if token.text in OPENING_BRACKETS:
+                depth += 1
+            elif token.text in CLOSING_BRACKETS:
+                depth -= 1
+            elif depth == 0 and token.text == ",":
+                declarators.append([])
+                continue
+            elif depth == 0 and token.text == ";":
+                break
+        declarators[-1].append(token)
+    return declarators
+
+
+def declarator_name(declarator: List[Token]) -> Optional[Token]:
+    """
+    Finds the name declared by a declarator.
+
+    Args:
+        declarator (List[Token]): The tokens of a declarator (e.g., "*p = NULL").
+
+    Returns:
+        Optional[Token]: The identifier being declared, or None if there is none.
+    """
+    for token in declarator:
+        if token.kind == IDENTIFIER:
+            return token
+        if token.text == "=":
+            break
+    return None
+
+
+def parse_declaration(tokens: List[Token]) -> Declaration:
+    """
+    Parses a variable declaration into its declarators.
+
+    The declaration is split once, and the name, pointer flag and initializer of each
+    declarator are found in a single scan, so the rules that check declarations do not
+    repeat the work.
+
+    Args:
+        tokens (List[Token]): The tokens of a declaration (e.g., "int *p, x = 1;").
+
+    Returns:
+        Declaration: The parsed declaration.
+    """
+    declarators = []
+    for declarator in split_declarators(tokens):
+        name = None
+        is_pointer = False
+        is_initialized = False
+        for token in declarator:
+            if token.text == "=":
+                is_initialized = True
+                break
+            if name is None:
+                if token.kind == IDENTIFIER:
+                    name = token
+                elif token.text == "*":
+                    is_pointer = True
+        declarators.append(Declarator(name, is_pointer, is_initialized))
+    return Declaration(tokens, declarators)
+
+
+def rule_initialized_all_variables(declaration: Declaration) -> bool:  
     """
     Determines if all variables in a given declaration are either initialized or uninitialized.
 
     Args:
-        declaration (str): A string representing variable declarations separated by commas,
-                           with optional initialization (e.g., "x=1, y, z=2").
+        declaration (Declaration): A parsed declaration of variables separated by commas,
+                                   with optional initialization (e.g., "int x=1, y, z=2;").
 
     Returns:
         bool: True if all variables are consistently either initialized or uninitialized;
               False otherwise.
     """
-    variables = declaration.replace(";", "").split(",")
-    declarations = set()
-
-    for variable in variables:
-        declarations.add(True if "=" in variable else False)
+    return len({declarator.is_initialized for declarator in declaration.declarators}) == 1
 
-    return len(declarations) == 1
 
-
-def pointers_should_not_be_declared_with_non_pointers(declaration: str) -> bool:  
+def pointers_should_not_be_declared_with_non_pointers(declaration: Declaration) -> bool:  
     """
     Checks if all variables in a given declaration are either pointers or non-pointers.
 
     Args:
-        declaration (str): A string representing variable declarations separated by commas,
-                           where pointers are denoted by an asterisk (*) 
-                           (e.g., "int *p, x, *q").
+        declaration (Declaration): A parsed declaration of variables separated by commas,
+                                   where pointers are denoted by an asterisk (*) 
+                                   (e.g., "int *p, x, *q;").
 
     Returns:
         bool: True if all variables are consistently either pointers or non-pointers;
               False otherwise.
     """
-    variables = declaration.replace(";", "").split(",")
-    declarations = set()
-
-    for variable in variables:
-        declarations.add(True if "*" in variable else False)
+    return len({declarator.is_pointer for declarator in declaration.declarators}) == 1
 
-    return len(declarations) == 1
 
-
-def all_constants_should_be_declared_in_uppercase(declaration: str) -> bool:  
+def all_constants_should_be_declared_in_uppercase(declaration: List[Token]) -> bool:  
     """
     Verifies if all constants in a given declaration are written in uppercase.
 
     Args:
-        declaration (str): A string representing a constant declaration, typically in the form
-                           of a `#define` directive (e.g., "#define MAX_VALUE 100").
+        declaration (List[Token]): The tokens of a constant declaration, typically a
+                                   `#define` directive (e.g., "#define MAX_VALUE 100").
 
     Returns:
         bool: True if the constant name is in uppercase; False otherwise.
     """
-    line = declaration.replace("#define", "").replace(";", "").split(" ")
-    for variable in line:
-        if variable != "" and variable != " " and variable != "\t":
-            return variable.isupper()
+    if len(declaration) < 2:
+        return True
+    return bool(identifier_shape(declaration[1].text) & UPPER_CASE)
 
 
-def enums_should_be_pascal_case(declaration: str) -> bool:  
+def enums_should_be_pascal_case(declaration: List[Token]) -> bool:  
     """
     Checks if the enum declaration follows the Pascal case naming convention.
 
     Args:
-        declaration (str): The declaration string containing the enum.
+        declaration (List[Token]): The tokens of the declaration containing the enum.
 
     Returns:
-        bool: True if the enum name is in Pascal case, False otherwise.
+        bool: True if the enum name is in Pascal case or the enum is anonymous, False otherwise.
         
     """
-    line = declaration.replace("enum", "").split(" ")
-    pascal_case_regex = r'^[A-Z][a-zA-Z0-9]*$'
-    for variable in line:
-        if variable != "" and variable != " " and variable != "\t":
-            return bool(re.match(pascal_case_regex, variable))
+    for index, token in enumerate(declaration[:-1]):
+        if token.text == "enum":
+            name = declaration[index + 1]
+            if name.kind == IDENTIFIER:
+                return bool(identifier_shape(name.text) & PASCAL_CASE)
+            return True
+    return True
 
 
-def functions_should_be_lower_cased(declaration: str) -> bool:  
+def functions_should_be_lower_cased(declaration: List[Token]) -> bool:  
     """
     Verifies if a function name in the given declaration is written in lowercase.
 
     Args:
-        declaration (str): A string representing a function declaration, which may include
-                           pre-declaration types (e.g., "static int my_function()").
+        declaration (List[Token]): The tokens of a function declaration, which may include
+                                   pre-declaration types (e.g., "static int my_function()").
 
     Returns:
         bool: True if the function name is entirely lowercase; False otherwise.
     """    
-    line = declaration.split(" ")
-    function_name_position = 1
-    for pre_declaration_type in PRE_DECLARATION_TYPES:
-        if line[0] == pre_declaration_type:
-            function_name_position += 1
-            break
-    if line[0] == "struct":
-        function_name_position += 1
-    function_name = line[function_name_position].split("(")[0].replace(" ", "")
-    return True if function_name.islower() else False
+    for index, token in enumerate(declaration[1:], 1):
+        if token.text == "(":
+            return bool(identifier_shape(declaration[index - 1].text) & LOWER_CASE)
+    return True
 
 
-def variables_should_be_snake_cased(declaration: str) -> bool:  
+def variables_should_be_snake_cased(declaration: Declaration) -> bool:  
     """
     Checks if all variables in a given declaration are written in snake_case.
 
     Args:
-        declaration (str): A string representing a variable declaration, which may include
-                           multiple variables separated by commas (e.g., "int test, variable, my_array[10];").
+        declaration (Declaration): A parsed variable declaration, which may include
+                                   multiple variables separated by commas
+                                   (e.g., "int test, variable, my_array[10];").
 
     Returns:
         bool: True if all variable names are entirely snake_case; False otherwise.
     """
-    variavel_regex = r'\b(?:int|float|double|char|long|short|unsigned|signed|void|const)\s+([a-zA-Z_][a-zA-Z0-9_]*)(?=\s*(?:,|=|\s*;))'
-    variaveis = re.findall(variavel_regex, declaration)
-    snake_case_regex = r'^[a-z]+(_[a-z0-9]+)*$'
-    for variavel in variaveis:
-        if not re.match(snake_case_regex, variavel):
+    for declarator in declaration.declarators:
+        name = declarator.name
+        if name is not None and not identifier_shape(name.text) & SNAKE_CASE:
             return False
     return True
 
 
-def variables_should_have_length_greater_than_one(declaration: str) -> bool:  
+def variables_should_have_length_greater_than_one(declaration: Declaration) -> bool:  
     """
     Checks if all variable names in a given declaration have a length greater than one.
 
     Args:
-        declaration (str): A string representing a variable declaration, which may include
-                           multiple variables separated by commas (e.g., "int x, yVar, z;").
+        declaration (Declaration): A parsed variable declaration, which may include
+                                   multiple variables separated by commas (e.g., "int x, yVar, z;").
 
     Returns:
         bool: True if all variable names have a length greater than one; False otherwise.
     """
-    variables = declaration.replace(";", "").split(",")
-    variables[0] = variables[0].split(" ")[1]
-    for variable in variables:
-        if len(variable.replace(" ", "")) == 1:
+    for declarator in declaration.declarators:
+        name = declarator.name
+        if name is not None and identifier_shape(name.text) & SINGLE_CHARACTER:
             return False
     return True
 
 
+def struct_name(declaration: List[Token]) -> Optional[Token]:
+    """
+    Finds the name given to a struct after the `struct` keyword.
+
+    Args:
+        declaration (List[Token]): The tokens of a struct declaration (e.g., "struct my_struct {").
+
+    Returns:
+        Optional[Token]: The name of the struct, or None if the struct is anonymous.
+    """
+    for index, token in enumerate(declaration):
+        if token.text == "struct":
+            break
+    if index + 1 < len(declaration) and declaration[index + 1].kind == IDENTIFIER:
+        return declaration[index + 1]
+    return None
+
+
+def struct_typedef_name(declaration: List[Token]) -> Optional[Token]:
+    """
+    Finds the name given by a `typedef` after the body of a struct.
+
+    Args:
+        declaration (List[Token]): The tokens of the line closing the struct (e.g., "} my_struct;").
+
+    Returns:
+        Optional[Token]: The typedef name, or None if there is none.
+    """
+    closed = False
+    for token in declaration:
+        if token.text == "}":
+            closed = True
+        elif closed and token.kind == IDENTIFIER:
+            return token
+    return None
+
+
 def struct_declaration_should_be_in_lower_case(
-    declaration: str, struct_types: List[str]
-) -> bool:
+    declaration: List[Token], struct_types: Optional[List[str]] = None
+) -> Optional[bool]:
     """
     Checks if a struct name in the given declaration is written in lowercase and 
     appends the struct name to a list of struct types.
 
     Args:
-        declaration (str): A string representing a struct declaration, either with or 
-                           without a `typedef` keyword (e.g., "typedef struct my_struct" 
-                           or "struct my_struct").
-        struct_types (List[str]): A list to which the struct name will be appended.
+        declaration (List[Token]): The tokens of a struct declaration, either with or 
+                                   without a `typedef` keyword (e.g., "typedef struct my_struct" 
+                                   or "struct my_struct").
+        struct_types (Optional[List[str]]): A list to which the struct name will be appended, if given.
 
     Returns:
-        bool: True if the struct name is entirely lowercase; False otherwise.
-        None: If the declaration is invalid or does not provide a struct name.
-    """
-    line = declaration.split(" ")
-    struct_name = ""
-    if line[0] == "typedef":
-        if 2 < len(line) and line[2] != "{":
-            struct_name = line[2]
-        else:
-            return None
-    elif line[0] == "struct":
-        struct_name = line[1]
-    struct_name = struct_name.replace(" ", "")
-    struct_types.append(struct_name)
-    return struct_name.islower()
+        bool: True if the struct name is entirely lowercase or an anonymous struct is not
+              being typedef'd; False otherwise.
+        None: If the declaration is an anonymous struct whose name is given by a `typedef`
+              after its body.
+    """
+    name = struct_name(declaration)
+    if name is not None:
+        if struct_types is not None:
+            struct_types.append(name.text)
+        return bool(identifier_shape(name.text) & LOWER_CASE)
+    if declaration[0].text == "typedef":
+        return None
+    return True
 
 
 def struct_typedef_name_should_be_in_lower_case(
-    declaration: str, struct_types: List[str]
+    declaration: List[Token], struct_types: Optional[List[str]] = None
 ) -> bool:  
     """
     Checks if a `typedef` name for a struct in the given declaration is written in lowercase 
     and appends the typedef name to a list of struct types.
 
     Args:
-        declaration (str): A string representing a `typedef` declaration for a struct
-                           (e.g., "typedef struct { ... } my_struct;").
-        struct_types (List[str]): A list to which the typedef name will be appended.
+        declaration (List[Token]): The tokens of the line closing a `typedef` declaration
+                                   for a struct (e.g., "} my_struct;").
+        struct_types (Optional[List[str]]): A list to which the typedef name will be appended, if given.
 
     Returns:
-        bool: True if the typedef name is entirely lowercase; False otherwise.
+        bool: True if the typedef name is entirely lowercase or missing; False otherwise.
     """
-    line = declaration.replace("}", "").replace(" ", "")
-    struct_types.append(line)
-    return True if line.islower() else False
\ No newline at end of file
+    name = struct_typedef_name(declaration)
+    if name is None:
+        return True
+    if struct_types is not None:
+        struct_types.append(name.text)
+    return bool(identifier_shape(name.text) & LOWER_CASE)
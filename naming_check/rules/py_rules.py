@@ -1,16 +1,32 @@
-import re 
+from naming_check.rules.shapes import PASCAL_CASE_CORE, SINGLE_CHARACTER, SNAKE_CASE_CORE, identifier_shape
+
 def rule_names_should_be_snake_case(variable: str) -> bool:
     """
     Checks if the given variable name follows the snake_case naming convention.
 
+    Leading and trailing underscores, as in private or dunder names, are ignored.
+
     Args:
         variable (str): A string representing the variable name to be checked.
 
     Returns:
         bool: True if the variable name is in snake_case; False otherwise.
     """
-    snake_case_pattern = r'^[a-z]+(_[a-z0-9]+)*$'
-    return bool(re.match(snake_case_pattern, variable))
+    return bool(identifier_shape(variable) & SNAKE_CASE_CORE)
+
+def rule_class_names_should_be_pascal_case(name: str) -> bool:
+    """
+    Checks if the given class name follows the PascalCase naming convention.
+
+    Leading underscores, as in private classes, are ignored.
+
+    Args:
+        name (str): A string representing the class name to be checked.
+
+    Returns:
+        bool: True if the class name is in PascalCase; False otherwise.
+    """
+    return bool(identifier_shape(name) & PASCAL_CASE_CORE)
 
 def rule_variable_names_should_have_length_greater_than_one(variable: str, line: str) -> bool:
     """
@@ -25,4 +41,20 @@ def rule_variable_names_should_have_length_greater_than_one(variable: str, line:
     bool: Returns True if the variable name has more than one character or if it is "for".
           Returns False if the variable name has exactly one character, except its within the for loop
     """
-    return len(variable) == 1 and not line.startswith("for")
\ No newline at end of file
+    return bool(identifier_shape(variable) & SINGLE_CHARACTER) and not line.startswith("for")
+
+def variable_names_should_have_length_greater_than_one(variable: str, line: str) -> bool:
+    """
+    Checks if the variable name has more than one character, except in a for loop.
+
+    This is the registered form of `rule_variable_names_should_have_length_greater_than_one`:
+    like every other rule, it returns True when the code follows the convention.
+
+    Args:
+        variable (str): The name of the variable to be checked.
+        line (str): The line of code where the variable is declared.
+
+    Returns:
+        bool: True if the name is longer than one character or bound by a for loop; False otherwise.
+    """
+    return not rule_variable_names_should_have_length_greater_than_one(variable, line)
@@ -0,0 +1,221 @@
+import os
+import sys
+from collections import namedtuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from naming_check.constants import WARNING_MESSAGES
+from naming_check.rules.c_rules import all_constants_should_be_declared_in_uppercase, enums_should_be_pascal_case, functions_should_be_lower_cased, pointers_should_not_be_declared_with_non_pointers, rule_initialized_all_variables, struct_declaration_should_be_in_lower_case, struct_typedef_name_should_be_in_lower_case, variables_should_be_snake_cased, variables_should_have_length_greater_than_one
+from naming_check.rules.py_rules import rule_class_names_should_be_pascal_case, rule_names_should_be_snake_case, variable_names_should_have_length_greater_than_one
+
+PLUGIN_GROUP = "naming_check.rules"
+
+METADATA_SUFFIXES = (".dist-info", ".egg-info")
+
+C = "c"
+PYTHON = "python"
+
+# The constructs each analyzer dispatches, with the arguments their rules are called with.
+CONSTRUCT_KINDS = {
+    C: {
+        "constant": "tokens of a #define line",
+        "enum": "tokens of a line declaring an enum",
+        "struct": "tokens of a line opening a struct",
+        "struct_typedef": "tokens of a line closing a typedef struct",
+        "function": "tokens of a function declaration",
+        "declaration": "a parsed Declaration of variables",
+    },
+    PYTHON: {
+        "variable": "the bound name and its stripped source line",
+        "function": "the function name",
+        "class": "the class name",
+    },
+}
+
+Rule = namedtuple("Rule", ["id", "language", "kinds", "check"])
+Rule.__doc__ = """
+A naming rule and the constructs it consumes.
+
+Attributes:
+    id (str): The identifier reported in warnings (e.g., "c-variable-snake-case").
+    language (str): The language of the rule, `C` or `PYTHON`.
+    kinds (Tuple[str, ...]): The construct kinds the rule is called for (see `CONSTRUCT_KINDS`).
+    check (Callable[..., Optional[bool]]): Returns True when the construct follows the
+                                            convention, False when it does not, and None when
+                                            it cannot tell from this construct alone.
+"""
+
+
+class RuleRegistry:
+    """
+    A registry of the rules each analyzer runs, indexed by language and construct kind.
+
+    The analyzers parse each construct once and run every rule registered for its kind
+    against the parsed result, so adding a rule does not add any parsing. Third-party rules
+    are registered by plugins exposed under the `naming_check.rules` entry point group; an
+    entry point may point to a `Rule`, an iterable of rules, or a callable that receives the
+    registry and registers its own rules.
+    """
+    def __init__(self):
+        self.rules: List[Rule] = []
+        self.plugins: List[str] = []
+        self._dispatch = {}
+
+    def register(self, rule: Rule, message: Optional[str] = None) -> Rule:
+        """
+        Registers a rule.
+
+        Args:
+            rule (Rule): The rule to register. `kinds` may also be a single kind.
+            message (Optional[str]): The message of its warnings. Required for rules whose
+                                     identifier has no message yet.
+
+        Returns:
+            Rule: The registered rule.
+
+        Raises:
+            ValueError: If the language or a kind is unknown, the rule has no message, or a
+                        rule with the same identifier is already registered for one of its kinds.
+        """
+        kinds = (rule.kinds,) if isinstance(rule.kinds, str) else tuple(rule.kinds)
+        rule = rule._replace(kinds=kinds)
+        if rule.language not in CONSTRUCT_KINDS:
+            raise ValueError(f"Unknown language '{rule.language}' for rule '{rule.id}'")
+        unknown = [kind for kind in kinds if kind not in CONSTRUCT_KINDS[rule.language]]
+        if unknown:
+            raise ValueError(f"Unknown construct kinds {unknown} for rule '{rule.id}'")
+        for registered in self.rules:
+            if registered.id == rule.id and set(registered.kinds) & set(kinds):
+                raise ValueError(f"The rule '{rule.id}' is already registered")
+        if message is not None:
+            WARNING_MESSAGES[rule.id] = message
+        elif rule.id not in WARNING_MESSAGES:
+            raise ValueError(f"The rule '{rule.id}' has no message")
+        self.rules.append(rule)
+        self._dispatch.clear()
+        return rule
+
+    def load_plugins(self) -> None:
+        """
+        Registers the rules of every installed plugin.
+
+        Raises:
+            ImportError: If a plugin cannot be loaded.
+        """
+        if not plugins_may_be_installed():
+            return
+        from importlib.metadata import entry_points
+
+        for entry_point in sorted(entry_points(group=PLUGIN_GROUP), key=lambda entry_point: entry_point.name):
+            try:
+                plugin = entry_point.load()
+            except Exception as e:
+                raise ImportError(f"An error occurred while loading the rule plugin '{entry_point.name}': {str(e)}")
+            if isinstance(plugin, Rule):
+                self.register(plugin)
+            elif callable(plugin):
+                plugin(self)
+            else:
+                for rule in plugin:
+                    self.register(rule)
+            version = entry_point.dist.version if entry_point.dist is not None else ""
+            self.plugins.append(f"{entry_point.name}={entry_point.value} {version}".strip())
+
+    def dispatch(self, language: str, enabled: Optional[Iterable[str]] = None) -> Dict[str, Tuple[Rule, ...]]:
+        """
+        Returns the rules of a language grouped by the construct kind they consume.
+
+        Args:
+            language (str): The language of the analyzer.
+            enabled (Optional[Iterable[str]]): The identifiers of the rules to keep. Defaults
+                                               to every rule.
+
+        Returns:
+            Dict[str, Tuple[Rule, ...]]: The rules of each construct kind, in registration
+                                         order. Kinds with no rule map to an empty tuple.
+        """
+        enabled = None if enabled is None else frozenset(enabled)
+        key = (language, enabled)
+        if key not in self._dispatch:
+            table = {kind: [] for kind in CONSTRUCT_KINDS[language]}
+            for rule in self.rules:
+                if rule.language == language and (enabled is None or rule.id in enabled):
+                    for kind in rule.kinds:
+                        table[kind].append(rule)
+            self._dispatch[key] = {kind: tuple(rules) for kind, rules in table.items()}
+        return self._dispatch[key]
+
+    def rule_ids(self) -> List[str]:
+        """
+        Returns the identifiers of the registered rules, without duplicates.
+
+        Returns:
+            List[str]: The identifiers, in registration order.
+        """
+        return list(dict.fromkeys(rule.id for rule in self.rules))
+
+
+BUILTIN_RULES = [
+    Rule("c-struct-lowercase", C, ("struct",), struct_declaration_should_be_in_lower_case),
+    Rule("c-struct-lowercase", C, ("struct_typedef",), struct_typedef_name_should_be_in_lower_case),
+    Rule("c-enum-pascal-case", C, ("enum",), enums_should_be_pascal_case),
+    Rule("c-constant-uppercase", C, ("constant",), all_constants_should_be_declared_in_uppercase),
+    Rule("c-function-snake-case", C, ("function",), functions_should_be_lower_cased),
+    Rule("c-initialize-all-variables", C, ("declaration",), rule_initialized_all_variables),
+    Rule("c-mixed-pointer-declaration", C, ("declaration",), pointers_should_not_be_declared_with_non_pointers),
+    Rule("c-variable-snake-case", C, ("declaration",), variables_should_be_snake_cased),
+    Rule("c-variable-length", C, ("declaration",), variables_should_have_length_greater_than_one),
+    Rule("py-variable-length", PYTHON, ("variable",), variable_names_should_have_length_greater_than_one),
+    Rule("py-function-snake-case", PYTHON, ("function",), rule_names_should_be_snake_case),
+    Rule("py-class-pascal-case", PYTHON, ("class",), rule_class_names_should_be_pascal_case),
+]
+
+
+def plugins_may_be_installed() -> bool:
+    """
+    Tells, without importing `importlib.metadata`, whether a rule plugin may be installed.
+
+    Importing `importlib.metadata` takes longer than the rest of a short run, and most
+    environments have no plugin. The `entry_points.txt` of the distributions found on
+    `sys.path` are searched for the plugin group instead. When distributions could be
+    found elsewhere, in a zip archive or by a custom finder, a plugin is assumed to exist.
+
+    Returns:
+        bool: False if no installed distribution declares a rule plugin.
+    """
+    for finder in sys.meta_path:
+        if hasattr(finder, "find_distributions") and getattr(finder, "__name__", "") != "PathFinder":
+            return True
+    marker = f"[{PLUGIN_GROUP}]"
+    for entry in sys.path:
+        directory = entry or "."
+        if os.path.isfile(directory):
+            return True
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        for name in names:
+            if name.endswith(METADATA_SUFFIXES):
+                try:
+                    with open(os.path.join(directory, name, "entry_points.txt"), encoding="utf-8") as file:
+                        if marker in file.read():
+                            return True
+                except (OSError, ValueError):
+                    continue
+    return False
+
+
+@lru_cache(maxsize=None)
+def default_registry() -> RuleRegistry:
+    """
+    Builds, once per process, the registry of the built-in rules and the installed plugins.
+
+    Returns:
+        RuleRegistry: The shared registry.
+    """
+    registry = RuleRegistry()
+    for rule in BUILTIN_RULES:
+        registry.register(rule)
+    registry.load_plugins()
+    return registry
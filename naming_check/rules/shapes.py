@@ -0,0 +1,67 @@
+from functools import lru_cache
+
+from naming_check.lazy import LazyPattern
+
+# The flags of an identifier shape. A name can have several, e.g. "x" is SNAKE_CASE,
+# LOWER_CASE and SINGLE_CHARACTER.
+SNAKE_CASE = 1
+PASCAL_CASE = 2
+UPPER_CASE = 4
+LOWER_CASE = 8
+SINGLE_CHARACTER = 16
+# The same shapes, ignoring the underscores of private and dunder names: leading and
+# trailing ones for snake case, leading ones for Pascal case.
+SNAKE_CASE_CORE = 32
+PASCAL_CASE_CORE = 64
+
+# The number of distinct names remembered. Past it, the least recently seen are forgotten.
+SHAPE_CACHE_SIZE = 1 << 16
+
+SNAKE_CASE_PATTERN = LazyPattern(r'^[a-z]+(_[a-z0-9]+)*$')
+PASCAL_CASE_PATTERN = LazyPattern(r'^[A-Z][a-zA-Z0-9]*$')
+
+
+@lru_cache(maxsize=SHAPE_CACHE_SIZE)
+def identifier_shape(name: str) -> int:
+    """
+    Classifies an identifier once into the bit mask of the conventions it follows.
+
+    The same names come back over and over across the rules and the files of a tree, so
+    every rule tests the shape of a name through this function: each distinct name is
+    matched against the patterns once per process, and later tests cost a cache lookup
+    and a bitwise and.
+
+    Args:
+        name (str): The identifier.
+
+    Returns:
+        int: The bit mask of `SNAKE_CASE`, `PASCAL_CASE`, `UPPER_CASE`, `LOWER_CASE`,
+             `SINGLE_CHARACTER`, `SNAKE_CASE_CORE` and `PASCAL_CASE_CORE`. The case flags
+             follow `str.isupper` and `str.islower`.
+    """
+    shape = 0
+    if SNAKE_CASE_PATTERN.match(name):
+        shape |= SNAKE_CASE
+    if PASCAL_CASE_PATTERN.match(name):
+        shape |= PASCAL_CASE
+    if name.isupper():
+        shape |= UPPER_CASE
+    if name.islower():
+        shape |= LOWER_CASE
+    if len(name) == 1:
+        shape |= SINGLE_CHARACTER
+    if SNAKE_CASE_PATTERN.match(name.strip("_")):
+        shape |= SNAKE_CASE_CORE
+    if PASCAL_CASE_PATTERN.match(name.lstrip("_")):
+        shape |= PASCAL_CASE_CORE
+    return shape
+
+
+def shape_cache_info():
+    """
+    Returns the statistics of the shape cache of the current process.
+
+    Returns:
+        functools._CacheInfo: The hits, misses, maximum size and current size of the cache.
+    """
+    return identifier_shape.cache_info()
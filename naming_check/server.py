@@ -0,0 +1,546 @@
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from naming_check.cache import DEFAULT_MAX_ENTRIES, ResultCache
+from naming_check.config import DEFAULT_SEVERITY, Config
+from naming_check.incremental import IncrementalDocument
+from naming_check.main import DEFAULT_PYTHON_ENGINE, analyze_files, create_analyzer
+from naming_check.reader import DEFAULT_MAX_FILE_SIZE, open_lines
+from naming_check.rules.registry import default_registry
+from naming_check.type_index import C_EXTENSIONS, TypeIndex
+from naming_check.warning import NamingWarning
+
+DEFAULT_SOCKET_PATH = os.path.join(
+    tempfile.gettempdir(), f"naming_check-{os.getuid() if hasattr(os, 'getuid') else 'user'}.sock"
+)
+
+# The seconds a client waits for the daemon to accept its connection. Once connected, it
+# waits for the results as long as the analysis takes.
+CLIENT_TIMEOUT = 5.0
+
+LANGUAGE_EXTENSIONS = {"c": ".c", "python": ".py"}
+
+LSP_SEVERITIES = {"error": 1, "warning": 2, "note": 3}
+
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+
+
+def read_message(stream: BinaryIO) -> Optional[dict]:
+    """
+    Reads one JSON-RPC message framed with a `Content-Length` header, as in LSP.
+
+    Args:
+        stream (BinaryIO): The stream to read from.
+
+    Returns:
+        Optional[dict]: The message, or None when the stream is closed.
+
+    Raises:
+        ValueError: If the message has no `Content-Length` header or is not valid JSON.
+    """
+    length = None
+    while True:
+        header = stream.readline()
+        if not header:
+            return None
+        header = header.strip()
+        if not header:
+            break
+        name, _, value = header.decode("ascii").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    if length is None:
+        raise ValueError("Missing Content-Length header")
+    return json.loads(stream.read(length).decode("utf-8"))
+
+
+def write_message(stream: BinaryIO, message: dict) -> None:
+    """
+    Writes one JSON-RPC message framed with a `Content-Length` header.
+
+    Args:
+        stream (BinaryIO): The stream to write to.
+        message (dict): The message.
+    """
+    body = json.dumps(message).encode("utf-8")
+    stream.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+    stream.flush()
+
+
+def path_from_uri(uri: str) -> str:
+    """
+    Converts a `file://` URI into a path.
+
+    Args:
+        uri (str): The URI of a document.
+
+    Returns:
+        str: The path of the document.
+    """
+    parsed = urlparse(uri)
+    return unquote(parsed.path) if parsed.scheme == "file" else uri
+
+
+class NamingCheckServer:
+    """
+    A long-running analyzer answering JSON-RPC requests, so the imports, the compiled
+    patterns, the rule registry and the result cache stay warm between analyses.
+
+    Besides its own methods, `analyze` (one file, from its path or from the given text) and
+    `analyzeFiles` (several paths), the server speaks enough of the Language Server Protocol
+    for editors: it answers `initialize` and `shutdown`, and publishes diagnostics whenever a
+    document is opened, changed or saved. Open documents are kept in memory and re-analyzed
+    incrementally, from the edits the editor sends.
+
+    The struct types declared across the C files and headers analyzed so far are kept in a
+    `TypeIndex`, refreshed before each analysis, so only the headers changed in between are
+    scanned again.
+
+    Requests are served one at a time, so connections sharing the server never analyze
+    concurrently.
+    """
+    def __init__(
+        self,
+        config: Optional[Config] = None,
+        cache: Optional[ResultCache] = None,
+        python_engine: str = DEFAULT_PYTHON_ENGINE,
+    ):
+        self.config = config or Config()
+        self.enabled_rules = self.config.enabled_rules(default_registry().rule_ids())
+        self.cache = cache if cache is not None else ResultCache(None)
+        self.python_engine = python_engine
+        self.type_index = TypeIndex(self.cache.directory)
+        self.lock = threading.Lock()
+        self.running = True
+        self.documents: Dict[str, IncrementalDocument] = {}
+        self.methods: Dict[str, Callable[[dict, Callable], object]] = {
+            "analyze": self.analyze,
+            "analyzeFiles": self.analyze_files,
+            "initialize": self.initialize,
+            "initialized": lambda params, notify: None,
+            "shutdown": self.shutdown,
+            "exit": self.shutdown,
+            "textDocument/didOpen": self.did_open,
+            "textDocument/didChange": self.did_change,
+            "textDocument/didSave": self.did_save,
+            "textDocument/didClose": self.did_close,
+        }
+
+    def serve(self, reader: BinaryIO, writer: BinaryIO) -> None:
+        """
+        Answers the messages of a connection until it is closed or the server shuts down.
+
+        Args:
+            reader (BinaryIO): The stream the messages are read from.
+            writer (BinaryIO): The stream the responses and notifications are written to.
+        """
+        def notify(method: str, params: dict) -> None:
+            write_message(writer, {"jsonrpc": "2.0", "method": method, "params": params})
+
+        while self.running:
+            try:
+                message = read_message(reader)
+            except ValueError as e:
+                write_message(writer, self.error(None, INVALID_PARAMS, str(e)))
+                continue
+            if message is None:
+                return
+            response = self.handle(message, notify)
+            if response is not None:
+                write_message(writer, response)
+
+    def handle(self, message: dict, notify: Callable[[str, dict], None]) -> Optional[dict]:
+        """
+        Runs the method of a message.
+
+        Args:
+            message (dict): A JSON-RPC request or notification.
+            notify (Callable[[str, dict], None]): Sends a notification to the client.
+
+        Returns:
+            Optional[dict]: The response, or None for a notification.
+        """
+        request_id = message.get("id")
+        method = self.methods.get(message.get("method"))
+        if method is None:
+            if request_id is None:
+                return None
+            return self.error(request_id, METHOD_NOT_FOUND, f"Unknown method '{message.get('method')}'")
+        try:
+            with self.lock:
+                result = method(message.get("params") or {}, notify)
+        except (KeyError, TypeError, ValueError, OSError) as e:
+            return None if request_id is None else self.error(request_id, INVALID_PARAMS, str(e))
+        if request_id is None:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def error(self, request_id, code: int, message: str) -> dict:
+        """
+        Builds a JSON-RPC error response.
+        """
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+    def options(self, params: dict) -> dict:
+        """
+        Builds the analysis options of a request, defaulting to the server's Python engine.
+
+        A request without `enabled_rules` runs every rule, as an in-process analysis without
+        a selection would: the rules selected by the configuration of the server only apply
+        to the documents an editor opens.
+        """
+        options = {"python_engine": params.get("python_engine", self.python_engine)}
+        enabled_rules = params.get("enabled_rules")
+        if enabled_rules is not None:
+            options["enabled_rules"] = tuple(sorted(enabled_rules))
+        if params.get("max_file_size", DEFAULT_MAX_FILE_SIZE) != DEFAULT_MAX_FILE_SIZE:
+            options["max_file_size"] = int(params["max_file_size"])
+        return options
+
+    def analyze_text(self, path: str, text: str, options: dict) -> List[NamingWarning]:
+        """
+        Analyzes the content of a file, serving it from the cache when it was seen before.
+        Contents larger than the maximum file size of the options are skipped.
+
+        Args:
+            path (str): The path of the file, whose extension selects the analyzer.
+            text (str): The content of the file.
+            options (dict): The analysis options.
+
+        Returns:
+            List[NamingWarning]: The warnings of the content.
+        """
+        data = text.encode("utf-8")
+        max_file_size = options.get("max_file_size", DEFAULT_MAX_FILE_SIZE)
+        if max_file_size and len(data) > max_file_size:
+            return []
+        known_types = self.known_types(path)
+        key_options = dict(options, known_types=sorted(known_types)) if known_types else options
+        key = self.cache.key(io.BytesIO(data), key_options)
+        warnings = self.cache.get(key, path)
+        if warnings is None:
+            analyzer = create_analyzer(
+                text.splitlines(), path, options["python_engine"], options.get("enabled_rules"), known_types
+            )
+            warnings = [] if analyzer is None else analyzer.analyze()
+            self.cache.put(key, warnings)
+        return warnings
+
+    def known_types(self, path: str) -> frozenset:
+        """
+        Returns the struct types declared by the headers a C file includes, as saved on disk.
+        """
+        if os.path.splitext(path)[1] not in C_EXTENSIONS:
+            return frozenset()
+        self.type_index.update([path])
+        return self.type_index.types_for(path)
+
+    def analyze(self, params: dict, notify: Callable) -> dict:
+        """
+        Analyzes one file, from the given `text` if any, or else from its `path`.
+        """
+        options = self.options(params)
+        if "text" in params:
+            warnings = self.analyze_text(params["path"], params["text"], options)
+        else:
+            self.type_index.update([params["path"]])
+            warnings = next(analyze_files([params["path"]], cache=self.cache, type_index=self.type_index, **options))[1]
+        return {"warnings": [self.to_json(warning) for warning in warnings]}
+
+    def analyze_files(self, params: dict, notify: Callable) -> dict:
+        """
+        Analyzes several files from their `paths`, in order.
+        """
+        self.type_index.update(params["paths"])
+        results = analyze_files(params["paths"], cache=self.cache, type_index=self.type_index, **self.options(params))
+        return {
+            "files": [
+                {"file": input_file, "warnings": [self.to_json(warning) for warning in warnings]}
+                for input_file, warnings in results
+            ]
+        }
+
+    def to_json(self, warning: NamingWarning) -> dict:
+        """
+        Converts a warning into the JSON object sent to clients.
+        """
+        return {
+            "rule": warning.rule,
+            "line": warning.line,
+            "column": warning.column,
+            "severity": self.config.severity.get(warning.rule, DEFAULT_SEVERITY),
+            "message": warning.message,
+        }
+
+    def initialize(self, params: dict, notify: Callable) -> dict:
+        """
+        Answers the LSP handshake: documents are synchronized incrementally.
+        """
+        return {
+            "capabilities": {"textDocumentSync": {"openClose": True, "change": 2, "save": {"includeText": True}}},
+            "serverInfo": {"name": "naming_check"},
+        }
+
+    def shutdown(self, params: dict, notify: Callable) -> None:
+        """
+        Stops the server once the current message is answered.
+        """
+        self.running = False
+
+    def did_open(self, params: dict, notify: Callable) -> None:
+        """
+        Starts tracking a document and publishes its diagnostics.
+        """
+        document = params["textDocument"]
+        path = path_from_uri(document["uri"])
+        if os.path.splitext(path)[1] not in LANGUAGE_EXTENSIONS.values():
+            path += LANGUAGE_EXTENSIONS.get(document.get("languageId"), "")
+        options = self.options({"enabled_rules": self.enabled_rules})
+        self.documents[document["uri"]] = IncrementalDocument(
+            path,
+            document["text"],
+            options["python_engine"],
+            options.get("enabled_rules"),
+            known_types=self.known_types(path),
+        )
+        self.publish_diagnostics(document["uri"], notify)
+
+    def did_change(self, params: dict, notify: Callable) -> None:
+        """
+        Applies the edits of a document and publishes its diagnostics.
+
+        Only the lines affected by each edit are re-analyzed (see `IncrementalDocument`).
+        """
+        uri = params["textDocument"]["uri"]
+        changes = params.get("contentChanges", [])
+        if uri not in self.documents:
+            if not changes or "range" in changes[-1]:
+                return
+            self.did_open({"textDocument": dict(params["textDocument"], text=changes[-1]["text"])}, notify)
+            return
+        document = self.documents[uri]
+        for change in changes:
+            if "range" in change:
+                start, end = change["range"]["start"], change["range"]["end"]
+                document.apply_edit(start["line"], start["character"], end["line"], end["character"], change["text"])
+            else:
+                document.set_text(change["text"])
+        self.publish_diagnostics(uri, notify)
+
+    def did_save(self, params: dict, notify: Callable) -> None:
+        """
+        Publishes the diagnostics of a saved document, resynchronizing it if its text is given.
+        """
+        uri = params["textDocument"]["uri"]
+        if uri not in self.documents:
+            text = params.get("text")
+            if text is None:
+                with open_lines(path_from_uri(uri), 0) as lines:
+                    text = "\n".join(lines or ())
+            self.did_open({"textDocument": dict(params["textDocument"], text=text)}, notify)
+            return
+        if "text" in params:
+            self.documents[uri].set_text(params["text"])
+        self.publish_diagnostics(uri, notify)
+
+    def did_close(self, params: dict, notify: Callable) -> None:
+        """
+        Stops tracking a document and clears its diagnostics.
+        """
+        uri = params["textDocument"]["uri"]
+        self.documents.pop(uri, None)
+        notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []})
+
+    def publish_diagnostics(self, uri: str, notify: Callable) -> None:
+        """
+        Sends the warnings of a tracked document as LSP diagnostics.
+        """
+        document = self.documents[uri]
+        lines = document.lines
+        diagnostics = []
+        for warning in document.warnings:
+            line = warning.line - 1
+            end = len(lines[line]) if line < len(lines) else warning.column - 1
+            diagnostics.append({
+                "range": {
+                    "start": {"line": line, "character": warning.column - 1},
+                    "end": {"line": line, "character": max(end, warning.column - 1)},
+                },
+                "severity": LSP_SEVERITIES[self.config.severity.get(warning.rule, DEFAULT_SEVERITY)],
+                "code": warning.rule,
+                "source": "naming_check",
+                "message": warning.message,
+            })
+        notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": diagnostics})
+
+
+def serve_socket(server: NamingCheckServer, socket_path: str = DEFAULT_SOCKET_PATH) -> None:
+    """
+    Serves clients over a Unix socket until one of them shuts the server down.
+
+    A socket left behind by a daemon that is no longer running is replaced.
+
+    Args:
+        server (NamingCheckServer): The server answering the messages.
+        socket_path (str): The path of the socket.
+
+    Raises:
+        OSError: If another daemon is already listening on the socket.
+    """
+    if os.path.exists(socket_path):
+        try:
+            DaemonClient(socket_path).close()
+        except OSError:
+            os.remove(socket_path)
+        else:
+            raise OSError(f"A daemon is already listening on '{socket_path}'.")
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            server.serve(self.rfile, self.wfile)
+            if not server.running:
+                threading.Thread(target=self.server.shutdown).start()
+
+    with socketserver.ThreadingUnixStreamServer(socket_path, Handler) as unix_server:
+        unix_server.daemon_threads = True
+        try:
+            unix_server.serve_forever()
+        finally:
+            os.remove(socket_path)
+
+
+class DaemonClient:
+    """
+    A connection to a running daemon.
+
+    The timeout only bounds the connection: a request waits for its results as long as
+    the daemon takes to analyze the files.
+
+    Raises:
+        OSError: If no daemon is listening on the socket.
+    """
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = CLIENT_TIMEOUT):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.settimeout(timeout)
+        try:
+            self.socket.connect(socket_path)
+        except OSError:
+            self.socket.close()
+            raise
+        self.socket.settimeout(None)
+        self.stream = self.socket.makefile("rwb")
+        self.next_id = 1
+
+    def request(self, method: str, params: dict) -> object:
+        """
+        Sends a request and waits for its result.
+
+        Args:
+            method (str): The method to call.
+            params (dict): Its parameters.
+
+        Returns:
+            object: The result of the method.
+
+        Raises:
+            OSError: If the daemon does not answer.
+            RuntimeError: If the daemon answers with an error.
+        """
+        request_id = self.next_id
+        self.next_id += 1
+        write_message(self.stream, {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+        while True:
+            response = read_message(self.stream)
+            if response is None:
+                raise ConnectionError("The daemon closed the connection.")
+            if response.get("id") == request_id:
+                break
+        if "error" in response:
+            raise RuntimeError(response["error"]["message"])
+        return response["result"]
+
+    def close(self) -> None:
+        """
+        Closes the connection.
+        """
+        self.stream.close()
+        self.socket.close()
+
+
+def analyze_with_daemon(
+    files: List[str], socket_path: str = DEFAULT_SOCKET_PATH, **options
+) -> Optional[List[Tuple[str, List[NamingWarning]]]]:
+    """
+    Analyzes files with the running daemon.
+
+    Args:
+        files (List[str]): The files to analyze.
+        socket_path (str): The socket of the daemon.
+        **options: The analysis options, as accepted by `analyze_files`.
+
+    Returns:
+        Optional[List[Tuple[str, List[NamingWarning]]]]: Each file paired with its warnings,
+            or None if no daemon is running or it answers with an error, so the caller can
+            analyze in process instead.
+    """
+    params = {"paths": [os.path.abspath(input_file) for input_file in files]}
+    params.update(options)
+    # The rules are always listed, so the daemon never applies its own selection.
+    enabled_rules = options.get("enabled_rules")
+    params["enabled_rules"] = list(default_registry().rule_ids() if enabled_rules is None else enabled_rules)
+    try:
+        client = DaemonClient(socket_path)
+    except OSError:
+        return None
+    try:
+        result = client.request("analyzeFiles", params)
+    except (OSError, RuntimeError):
+        return None
+    finally:
+        client.close()
+    return [
+        (input_file, [NamingWarning(warning["rule"], warning["line"], warning["column"], input_file) for warning in entry["warnings"]])
+        for input_file, entry in zip(files, result["files"])
+    ]
+
+
+def serve(
+    socket_path: Optional[str] = None,
+    config: Optional[Config] = None,
+    cache_dir: Optional[str] = None,
+    cache_size: int = DEFAULT_MAX_ENTRIES,
+    python_engine: str = DEFAULT_PYTHON_ENGINE,
+    stdio: bool = False,
+) -> None:
+    """
+    Runs the daemon, over the standard streams or a Unix socket, until it is shut down.
+
+    Args:
+        socket_path (Optional[str]): The socket to listen on. Defaults to `DEFAULT_SOCKET_PATH`.
+        config (Optional[Config]): The configuration of the analyses.
+        cache_dir (Optional[str]): A directory to persist the result cache in, saved when
+                                   the daemon stops. The cache is kept in memory otherwise.
+        cache_size (int): The maximum number of files kept in the cache.
+        python_engine (str): The default engine used for Python files.
+        stdio (bool): Whether to serve a single client over the standard input and output,
+                      as editors start language servers.
+    """
+    cache = ResultCache(cache_dir, cache_size)
+    server = NamingCheckServer(config, cache, python_engine)
+    try:
+        if stdio:
+            server.serve(sys.stdin.buffer, sys.stdout.buffer)
+        else:
+            serve_socket(server, socket_path or DEFAULT_SOCKET_PATH)
+    finally:
+        cache.save()
+        server.type_index.save()
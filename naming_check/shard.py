@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+from typing import Iterable, List, Tuple
+
+from naming_check.warning import NamingWarning
+
+SHARD_FORMAT_VERSION = 1
+
+# How much larger than an even share a shard may grow before the files hashed to it are
+# moved to another one.
+SHARD_LOAD_FACTOR = 1.1
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Parses a shard given on the command line as `INDEX/COUNT`, e.g. "2/4".
+
+    Args:
+        value (str): The shard, its index counted from 1.
+
+    Returns:
+        Tuple[int, int]: The index, from 1 to the count, and the count of shards.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a valid shard.
+    """
+    from argparse import ArgumentTypeError
+
+    index, separator, count = value.partition("/")
+    if not separator or not index.isdigit() or not count.isdigit() or not 1 <= int(index) <= int(count):
+        raise ArgumentTypeError(f"Expected INDEX/COUNT with 1 <= INDEX <= COUNT, got {value!r}")
+    return int(index), int(count)
+
+
+def _shard_key(path: str) -> str:
+    """
+    Returns the path a file is hashed under: relative to the current directory, so machines
+    checking the tree out in different directories agree.
+    """
+    try:
+        path = os.path.relpath(path)
+    except ValueError:
+        pass
+    return path.replace(os.sep, "/")
+
+
+def _shard_ranking(key: str, count: int) -> List[int]:
+    """
+    Ranks the shards for a file by rendezvous hashing of its key, the first one preferred.
+
+    The key is hashed with a fixed function, so every machine and every run agrees, and a
+    file keeps its preferred shard when files are added to or removed from the tree.
+    """
+    key = key.encode()
+    return sorted(
+        range(count),
+        key=lambda shard: hashlib.blake2b(key + b"\0" + str(shard).encode(), digest_size=8).digest(),
+    )
+
+
+def assign_shards(files: List[str], count: int) -> List[int]:
+    """
+    Assigns every file to one of `count` shards, balancing their total size.
+
+    Files are placed from the largest to the smallest, each in the first shard of its hash
+    ranking whose total size stays within `SHARD_LOAD_FACTOR` of an even share, or the least
+    loaded shard if none does. The assignment only depends on the paths, relative to the
+    current directory, and the sizes of the files, so the machines of a CI run, each
+    discovering the same tree, agree on it without communicating, and most files keep
+    their shard from one run to the next.
+
+    Args:
+        files (List[str]): The files, as discovered on every machine.
+        count (int): The number of shards.
+
+    Returns:
+        List[int]: The shard of each file, from 0 to `count - 1`, in the order of `files`.
+    """
+    sizes = []
+    for input_file in files:
+        try:
+            sizes.append(os.path.getsize(input_file))
+        except OSError:
+            sizes.append(0)
+    keys = [_shard_key(input_file) for input_file in files]
+    capacity = sum(sizes) / count * SHARD_LOAD_FACTOR
+    loads = [0] * count
+    shards = [0] * len(files)
+    for position in sorted(range(len(files)), key=lambda position: (-sizes[position], keys[position])):
+        ranking = _shard_ranking(keys[position], count)
+        shard = next(
+            (shard for shard in ranking if loads[shard] + sizes[position] <= capacity),
+            min(ranking, key=lambda shard: loads[shard]),
+        )
+        shards[position] = shard
+        loads[shard] += sizes[position]
+    return shards
+
+
+def write_shard(
+    path: str,
+    shard: Tuple[int, int],
+    show_file: bool,
+    results: Iterable[Tuple[int, str, List[NamingWarning]]],
+) -> int:
+    """
+    Writes the results of a shard, to be combined with the others by `merge_shards`.
+
+    Args:
+        path (str): The path of the result file.
+        shard (Tuple[int, int]): The index, counted from 1, and the count of shards.
+        show_file (bool): Whether the report shows the file of each warning.
+        results (Iterable[Tuple[int, str, List[NamingWarning]]]): The position of each file
+                                                                  in the whole list of
+                                                                  files, the file and its
+                                                                  warnings.
+
+    Returns:
+        int: The number of files written.
+    """
+    files = [
+        [position, input_file, [[warning.rule, warning.line, warning.column] for warning in warnings]]
+        for position, input_file, warnings in results
+    ]
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(
+            {"version": SHARD_FORMAT_VERSION, "shard": list(shard), "show_file": show_file, "files": files}, file
+        )
+    os.replace(temporary_path, path)
+    return len(files)
+
+
+def read_shard(path: str) -> dict:
+    """
+    Reads a result file written by `write_shard`.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is not a shard result file.
+    """
+    try:
+        with open(path, "r") as file:
+            data = json.load(file)
+    except FileNotFoundError as exc:
+        raise FileNotFoundError(f"The shard result file '{path}' does not exist.")
+    except ValueError as e:
+        raise ValueError(f"The shard result file '{path}' is not valid JSON: {str(e)}")
+    if not isinstance(data, dict) or data.get("version") != SHARD_FORMAT_VERSION:
+        raise ValueError(f"The file '{path}' is not a shard result file")
+    return data
+
+
+def merge_shards(paths: List[str]) -> Tuple[bool, List[Tuple[str, List[NamingWarning]]]]:
+    """
+    Combines the result files of every shard of a run into the results of the whole run.
+
+    The files are put back in the order the unsharded run would have analyzed them, so the
+    merged report is the same whichever machine analyzed each file.
+
+    Args:
+        paths (List[str]): The result files, one per shard, in any order.
+
+    Returns:
+        Tuple[bool, List[Tuple[str, List[NamingWarning]]]]: Whether the report shows the
+                                                            file of each warning, and each
+                                                            file with its warnings.
+
+    Raises:
+        ValueError: If the files do not hold each shard of a single run exactly once.
+    """
+    shards = [read_shard(path) for path in paths]
+    counts = {data["shard"][1] for data in shards}
+    if len(counts) != 1:
+        raise ValueError(f"The shard result files come from runs split in {sorted(counts)} shards")
+    count = counts.pop()
+    indexes = sorted(data["shard"][0] for data in shards)
+    if indexes != list(range(1, count + 1)):
+        missing = sorted(set(range(1, count + 1)) - set(indexes))
+        duplicated = sorted({index for index in indexes if indexes.count(index) > 1})
+        raise ValueError(f"Expected each of the {count} shards once; missing {missing}, duplicated {duplicated}")
+    files = sorted(entry for data in shards for entry in data["files"])
+    results = [
+        (input_file, [NamingWarning(rule, line, column, input_file) for rule, line, column in warnings])
+        for _, input_file, warnings in files
+    ]
+    return all(data["show_file"] for data in shards), results
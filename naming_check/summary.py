@@ -0,0 +1,203 @@
+import hashlib
+import os
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+from naming_check.baseline import INLINE_SUPPRESSIONS, Suppressions
+from naming_check.cache import READ_BLOCK_SIZE, rules_fingerprint
+from naming_check.rules.registry import CONSTRUCT_KINDS, PYTHON, Rule
+from naming_check.warning import NamingWarning
+
+SUMMARY_FILE_NAME = "summaries.pickle"
+
+SUMMARY_FORMAT_VERSION = 2
+
+Site = namedtuple("Site", ["kind", "line", "column", "arguments", "text"])
+Site.__doc__ = """
+A binding site found in a Python file: a construct the rules of its kind are run on.
+
+Attributes:
+    kind (str): The construct kind (see `CONSTRUCT_KINDS`).
+    line (int): The line of the construct.
+    column (int): The column of the construct.
+    arguments (tuple): The construct, as consumed by the rules of its kind.
+    text (str): The content of the line, which decides whether its warnings are suppressed.
+"""
+
+
+def summarize(analyzer_class, code, file: Optional[str] = None) -> List[Site]:
+    """
+    Runs a Python analyzer once and records every binding site it visits, whatever the rules.
+
+    The analyzer is given a dispatch table holding, for each construct kind, a single rule
+    that records its arguments and always fails. Each recorded construct is thus paired with
+    the warning the analyzer raises for it, which carries its position, and no analyzer needs
+    to know about summaries. Nothing is suppressed, so the sites hold the content of their
+    line for `evaluate` to suppress warnings.
+
+    Args:
+        analyzer_class: The class of the Python engine, such as `PythonAnalyzer`.
+        code (Iterable[str]): The lines of the file.
+        file (Optional[str]): The path of the file.
+
+    Returns:
+        List[Site]: The binding sites, in the order the analyzer visits them.
+    """
+    constructs = []
+
+    def record(*construct) -> bool:
+        constructs.append((construct, analyzer.current_text))
+        return False
+
+    rules = {kind: (Rule(kind, PYTHON, (kind,), record),) for kind in CONSTRUCT_KINDS[PYTHON]}
+    analyzer = analyzer_class(code, file, rules, Suppressions(inline=False))
+    sites = list(analyzer.iter_warnings())
+    return [
+        Site(site.rule, site.line, site.column, construct, text)
+        for site, (construct, text) in zip(sites, constructs)
+    ]
+
+
+def evaluate(
+    sites: List[Site],
+    rules: Dict[str, Tuple[Rule, ...]],
+    file: Optional[str] = None,
+    suppressions: Optional[Suppressions] = None,
+) -> List[NamingWarning]:
+    """
+    Runs rules over the binding sites of a file, without reading or parsing it.
+
+    Args:
+        sites (List[Site]): The binding sites returned by `summarize`.
+        rules (Dict[str, Tuple[Rule, ...]]): The rules of each construct kind.
+        file (Optional[str]): The path recorded in the warnings.
+        suppressions (Optional[Suppressions]): The warnings to drop. Defaults to the ones
+                                               ignored by inline comments.
+
+    Returns:
+        List[NamingWarning]: The warnings the analyzer would have raised with these rules.
+    """
+    if suppressions is None:
+        suppressions = INLINE_SUPPRESSIONS
+    warnings = []
+    for site in sites:
+        for rule in rules.get(site.kind, ()):
+            if rule.check(*site.arguments) is False and not suppressions.is_suppressed(rule.id, site.text):
+                warnings.append(NamingWarning(rule.id, site.line, site.column, file))
+    return warnings
+
+
+class SummaryCache:
+    """
+    A persistent cache of the binding sites of each Python file, for each engine.
+
+    Entries are keyed by path and engine and validated by the modification time and size of
+    the file: when they match, the file is not even read. When they differ, the content is
+    hashed, so a file that was touched without being changed keeps its summary. Since the
+    summaries do not depend on the rules, changing the selected rules only re-runs the rules
+    over them, with neither tokenizing nor parsing.
+
+    Without a directory, the cache only lives in memory.
+
+    Attributes:
+        directory (Optional[str]): The directory the cache is saved in.
+        entries (Dict[Tuple[str, str], tuple]): The modification time, size, content hash
+                                                and sites of each file and engine.
+    """
+    def __init__(self, directory: Optional[str]):
+        self.directory = directory
+        self.fingerprint = rules_fingerprint()
+        self.entries: Dict[Tuple[str, str], tuple] = {}
+        self.changed = False
+        self.load()
+
+    def get(self, path: str, engine: str) -> Optional[List[Site]]:
+        """
+        Looks up the summary of a file.
+
+        Args:
+            path (str): The path of the file.
+            engine (str): The Python engine the summary was made with.
+
+        Returns:
+            Optional[List[Site]]: The binding sites, or None if the file changed since.
+        """
+        key = (os.path.abspath(path), engine)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        mtime, size, digest, sites = entry
+        if (stat.st_mtime_ns, stat.st_size) == (mtime, size):
+            return sites
+        if stat.st_size != size or content_digest(path) != digest:
+            return None
+        self.entries[key] = (stat.st_mtime_ns, size, digest, sites)
+        self.changed = True
+        return sites
+
+    def put(self, path: str, engine: str, sites: List[Site], stat: os.stat_result, digest: str) -> None:
+        """
+        Stores the summary of a file.
+
+        Args:
+            path (str): The path of the file.
+            engine (str): The Python engine the summary was made with.
+            sites (List[Site]): The binding sites.
+            stat (os.stat_result): The status of the file, taken before it was summarized.
+            digest (str): The hash of the content that was summarized.
+        """
+        self.entries[(os.path.abspath(path), engine)] = (stat.st_mtime_ns, stat.st_size, digest, sites)
+        self.changed = True
+
+    def load(self) -> None:
+        """
+        Loads the summaries saved in the directory. Missing or outdated summaries are ignored.
+        """
+        if self.directory is None:
+            return
+        import pickle
+
+        try:
+            with open(os.path.join(self.directory, SUMMARY_FILE_NAME), "rb") as file:
+                version, fingerprint, entries = pickle.load(file)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+            return
+        if (version, fingerprint) == (SUMMARY_FORMAT_VERSION, self.fingerprint):
+            self.entries = entries
+
+    def save(self) -> None:
+        """
+        Writes the summaries to the directory when they changed, through a temporary file moved in place.
+        """
+        if self.directory is None or not self.changed:
+            return
+        import pickle
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, SUMMARY_FILE_NAME)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            pickle.dump((SUMMARY_FORMAT_VERSION, self.fingerprint, self.entries), file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, path)
+        self.changed = False
+
+
+def content_digest(path: str) -> str:
+    """
+    Hashes the content of a file.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest of the content.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(READ_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,196 @@
+import json
+import os
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from naming_check.cache import rules_fingerprint
+from naming_check.lazy import LazyPattern
+from naming_check.reader import open_lines
+from naming_check.rules.registry import C, default_registry
+
+INDEX_FILE_NAME = "types.json"
+
+C_EXTENSIONS = frozenset([".c", ".h"])
+
+# The lines holding none of these cannot declare a struct type or change the lexer state,
+# unless they follow a continued line.
+SCANNED_MARKERS = ("struct", "}", "/*", "*/")
+
+INCLUDE_PATTERN = LazyPattern(r'[ \t]*#[ \t]*include[ \t]*"([^"]+)"')
+
+
+def scan_file(path: str) -> Tuple[List[str], List[str]]:
+    """
+    Finds the struct types a C file declares and the local headers it includes.
+
+    The types are found by running `CAnalyzer` without any rule, so they are exactly the
+    ones the analyzer would learn from the file. Only the lines that may declare a type or
+    change the state of the lexer (comment delimiters and continued directives) are
+    tokenized. The file is read as by the analysis: binary and oversized files declare nothing.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        Tuple[List[str], List[str]]: The declared types, in order, and the paths of the
+                                     headers included with `#include "..."`, resolved
+                                     against the directory of the file.
+    """
+    from naming_check.analyzers.c_analyzer import CAnalyzer
+
+    directory = os.path.dirname(path)
+    includes = []
+    analyzer = CAnalyzer([], path, default_registry().dispatch(C, ()))
+    continued = False
+    with open_lines(path) as lines:
+        for line in lines or ():
+            if "#" in line:
+                match = INCLUDE_PATTERN.match(line)
+                if match is not None:
+                    includes.append(os.path.normpath(os.path.join(directory, match.group(1))))
+            if continued or any(marker in line for marker in SCANNED_MARKERS) or line.endswith("\\"):
+                analyzer.check_line(line)
+                continued = line.endswith("\\")
+    return list(dict.fromkeys(analyzer.struct_types)), includes
+
+
+class TypeIndex:
+    """
+    A project-wide index of the struct types declared by each C file and of the local headers
+    it includes.
+
+    The index is built in a first pass over the `.c` and `.h` files, following their
+    `#include "..."` directives, and is persisted in the cache directory. Only the files whose
+    modification time or size changed since the previous run are scanned again. Each file is
+    then analyzed knowing the types declared by the headers it includes, directly or not,
+    looked up from a set computed once per file.
+
+    Attributes:
+        directory (Optional[str]): The directory the index is saved in, or None to keep it in memory.
+        entries (Dict[str, list]): The modification time, size, types and includes of each
+                                   scanned file, keyed by absolute path.
+    """
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        # Hashing the rules is only worth it when the index is persisted, so it is done by
+        # `load` and `save`.
+        self.fingerprint: Optional[str] = None
+        self.entries: Dict[str, list] = {}
+        self.closures: Dict[str, FrozenSet[str]] = {}
+        self.load()
+
+    def update(self, files: Iterable[str], jobs: int = 1) -> int:
+        """
+        Scans the C files that are new or changed, along with the headers they include.
+
+        Args:
+            files (Iterable[str]): The files about to be analyzed. Files that are not C
+                                   sources or headers are ignored.
+            jobs (int): The number of worker processes, `0` meaning one per CPU.
+
+        Returns:
+            int: The number of files scanned.
+        """
+        if jobs == 0:
+            jobs = os.cpu_count() or 1
+        queue = [os.path.abspath(path) for path in files if os.path.splitext(path)[1] in C_EXTENSIONS]
+        seen = set()
+        scanned = 0
+        while queue:
+            stale = []
+            for path in queue:
+                if path in seen:
+                    continue
+                seen.add(path)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    if self.entries.pop(path, None) is not None:
+                        self.closures.clear()
+                    continue
+                entry = self.entries.get(path)
+                if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+                    stale.append((path, stat))
+            if stale:
+                self.closures.clear()
+            for (path, stat), (types, includes) in zip(stale, self._scan([path for path, _ in stale], jobs)):
+                self.entries[path] = [stat.st_mtime_ns, stat.st_size, types, includes]
+            scanned += len(stale)
+            queue = [
+                include
+                for path in list(seen)
+                if path in self.entries
+                for include in self.entries[path][3]
+                if include not in seen
+            ]
+        return scanned
+
+    def _scan(self, paths: List[str], jobs: int) -> Iterable[Tuple[List[str], List[str]]]:
+        """
+        Scans files, in a process pool when there are enough of them.
+        """
+        if jobs == 1 or len(paths) <= 1:
+            return map(scan_file, paths)
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(scan_file, paths, chunksize=max(1, len(paths) // (jobs * 4))))
+
+    def types_for(self, path: str) -> FrozenSet[str]:
+        """
+        Returns the struct types declared by the headers a file includes, directly or not.
+
+        The types declared by the file itself are left out: the analyzer learns them as it
+        reads the file, in order.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            FrozenSet[str]: The types, computed once per file and then served from memory.
+        """
+        path = os.path.abspath(path)
+        types = self.closures.get(path)
+        if types is None:
+            found = set()
+            visited = {path}
+            stack = list(self.entries[path][3]) if path in self.entries else []
+            while stack:
+                include = stack.pop()
+                if include in visited or include not in self.entries:
+                    continue
+                visited.add(include)
+                _, _, include_types, include_includes = self.entries[include]
+                found.update(include_types)
+                stack.extend(include_includes)
+            types = self.closures[path] = frozenset(found)
+        return types
+
+    def load(self) -> None:
+        """
+        Loads the index saved in the directory. A missing or outdated index is ignored.
+        """
+        if self.directory is None:
+            return
+        self.fingerprint = rules_fingerprint()
+        try:
+            with open(os.path.join(self.directory, INDEX_FILE_NAME), "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if data.get("fingerprint") == self.fingerprint:
+            self.entries = data.get("entries", {})
+
+    def save(self) -> None:
+        """
+        Writes the index to the directory, through a temporary file moved in place.
+        """
+        if self.directory is None:
+            return
+        if self.fingerprint is None:
+            self.fingerprint = rules_fingerprint()
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, INDEX_FILE_NAME)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w") as file:
+            json.dump({"fingerprint": self.fingerprint, "entries": self.entries}, file)
+        os.replace(temporary_path, path)
@@ -0,0 +1,41 @@
+from collections import namedtuple
+
+from naming_check.constants import WARNING_MESSAGES
+
+
+class NamingWarning(namedtuple("NamingWarning", ["rule", "line", "column", "file"], defaults=[None])):
+    """
+    A warning found by one of the analyzers.
+
+    The record only holds which rule was broken and where; the message is looked up and
+    formatted when the warning is printed, so warnings that are filtered out or never
+    displayed cost no string formatting.
+
+    Attributes:
+        rule (str): The identifier of the broken rule (e.g., "c-variable-snake-case").
+        line (int): The line of the warning, starting at 1.
+        column (int): The column of the warning, starting at 1.
+        file (Optional[str]): The file of the warning, if known.
+    """
+    __slots__ = ()
+
+    @property
+    def message(self) -> str:
+        """
+        The message describing the broken rule.
+        """
+        return WARNING_MESSAGES[self.rule]
+
+    def format(self, label: str = "WARN") -> str:
+        """
+        Formats the warning the way the analyzers report it.
+
+        Args:
+            label (str): The label the warning starts with, which tells its severity.
+
+        Returns:
+            str: The warning, such as "WARN: [30] All constants should be declared in uppercase.".
+        """
+        return f"{label}: [{self.line}] {self.message}"
+
+    __str__ = format
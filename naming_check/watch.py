@@ -0,0 +1,443 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterator, List, Optional, Set, TextIO, Tuple
+
+from naming_check.baseline import normalize_line
+from naming_check.config import DEFAULT_SEVERITY
+from naming_check.main import ANALYZED_EXTENSIONS, DEFAULT_DEBOUNCE, analyze_files, discover_files
+from naming_check.output import SEVERITY_LABELS
+from naming_check.reader import open_lines
+from naming_check.type_index import C_EXTENSIONS, TypeIndex
+from naming_check.warning import NamingWarning
+
+# The seconds between two scans of the tree when inotify is not available.
+POLL_INTERVAL = 1.0
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+# struct inotify_event: int wd; uint32_t mask, cookie, len; char name[len].
+EVENT_HEADER = struct.Struct("iIII")
+
+READ_SIZE = 64 * 1024
+
+
+def _walk_directories(directory: str, is_excluded: Optional[Callable[[str], bool]] = None) -> Iterator[str]:
+    """
+    Yields a directory and every directory below it that `discover_files` walks into.
+    """
+    for root, directories, _ in os.walk(directory):
+        directories[:] = sorted(
+            name
+            for name in directories
+            if not name.startswith(".") and (is_excluded is None or not is_excluded(os.path.join(root, name)))
+        )
+        yield root
+
+
+class PollingWatcher:
+    """
+    Detects the files of a tree that changed by comparing their modification time and size
+    at a fixed interval. Used where inotify is not available.
+    """
+    name = "polling"
+
+    def __init__(self, directory: str, is_excluded: Optional[Callable[[str], bool]] = None, interval: float = POLL_INTERVAL):
+        self.directory = directory
+        self.is_excluded = is_excluded
+        self.interval = interval
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for input_file in discover_files([self.directory], self.is_excluded):
+            try:
+                stat = os.stat(input_file)
+            except OSError:
+                continue
+            snapshot[input_file] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def changes(self, timeout: Optional[float] = None) -> Optional[Set[str]]:
+        """
+        Waits for files to change.
+
+        Args:
+            timeout (Optional[float]): The seconds to wait at most. Waits until something
+                                       changes when None.
+
+        Returns:
+            Optional[Set[str]]: The files created, modified or deleted, empty if none changed
+                                before the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._snapshot()
+            changed = {path for path in snapshot.keys() | self.snapshot.keys() if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+            if changed:
+                return changed
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, deadline - time.monotonic())
+                if delay <= 0:
+                    return set()
+            time.sleep(delay)
+
+    def close(self) -> None:
+        """
+        Stops watching.
+        """
+
+
+class InotifyWatcher:
+    """
+    Detects the files of a tree that changed through the inotify API of Linux, called with
+    `ctypes`, so the process sleeps until the kernel reports a change.
+
+    Every directory of the tree is watched, and directories created later are watched as
+    they appear. When the kernel drops events because its queue overflowed, the whole tree
+    is reported as changed.
+
+    Raises:
+        OSError: If inotify is not available or the directories cannot be watched, for
+                 instance past the limit of watches of the user.
+    """
+    name = "inotify"
+
+    def __init__(self, directory: str, is_excluded: Optional[Callable[[str], bool]] = None):
+        self.directory = directory
+        self.is_excluded = is_excluded
+        self.directories: Dict[int, str] = {}
+        library = ctypes.util.find_library("c")
+        try:
+            self.libc = ctypes.CDLL(library or "libc.so.6", use_errno=True)
+            self.libc.inotify_init1.argtypes = [ctypes.c_int]
+            self.libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        except (OSError, AttributeError) as e:
+            raise OSError(f"inotify is not available: {str(e)}")
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        try:
+            self._watch_tree(directory)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, directory: str) -> None:
+        for path in _walk_directories(directory, self.is_excluded):
+            descriptor = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+            if descriptor < 0:
+                error = ctypes.get_errno()
+                raise OSError(error, f"Cannot watch '{path}': {os.strerror(error)}")
+            self.directories[descriptor] = path
+
+    def changes(self, timeout: Optional[float] = None) -> Optional[Set[str]]:
+        """
+        Waits for files to change.
+
+        Args:
+            timeout (Optional[float]): The seconds to wait at most. Waits until something
+                                       changes when None.
+
+        Returns:
+            Optional[Set[str]]: The files created, modified or deleted, and the directories
+                                deleted, empty if none changed before the timeout, or None
+                                if events were lost and anything may have changed.
+        """
+        changed = set()
+        while not changed:
+            readable, _, _ = select.select([self.fd], [], [], timeout)
+            if not readable:
+                return changed
+            try:
+                data = os.read(self.fd, READ_SIZE)
+            except BlockingIOError:
+                continue
+            offset = 0
+            overflowed = False
+            while offset < len(data):
+                descriptor, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b"\0")
+                offset += EVENT_HEADER.size + length
+                if mask & IN_Q_OVERFLOW:
+                    overflowed = True
+                    continue
+                if mask & IN_IGNORED:
+                    self.directories.pop(descriptor, None)
+                    continue
+                directory = self.directories.get(descriptor)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name))
+                if mask & IN_ISDIR:
+                    if os.path.basename(path).startswith(".") or (self.is_excluded is not None and self.is_excluded(path)):
+                        continue
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        # Files may have been written in the directory before it was watched.
+                        self._watch_tree(path)
+                        changed.update(discover_files([path], self.is_excluded))
+                    else:
+                        changed.add(path)
+                elif os.path.splitext(path)[1] in ANALYZED_EXTENSIONS:
+                    changed.add(path)
+            if overflowed:
+                return None
+        return changed
+
+    def close(self) -> None:
+        """
+        Stops watching.
+        """
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def open_watcher(directory: str, is_excluded: Optional[Callable[[str], bool]] = None):
+    """
+    Watches a tree with inotify, or by polling where inotify is not available.
+
+    Returns:
+        InotifyWatcher | PollingWatcher: The watcher.
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory, is_excluded)
+        except OSError:
+            pass
+    return PollingWatcher(directory, is_excluded)
+
+
+def wait_for_changes(watcher, debounce: float = DEFAULT_DEBOUNCE) -> Optional[Set[str]]:
+    """
+    Waits for a burst of changes to end: once a file changes, the changes keep being
+    collected until none comes for `debounce` seconds, so a save touching several files,
+    or an editor writing a file in several steps, triggers a single analysis.
+
+    Returns:
+        Optional[Set[str]]: The paths that changed, or None if anything may have changed.
+    """
+    changed = set()
+    while changed is not None and not changed:
+        changed = watcher.changes(None)
+    while True:
+        more = watcher.changes(debounce)
+        if more is not None and not more:
+            return changed
+        changed = None if changed is None or more is None else changed | more
+
+
+def _warning_keys(input_file: str, warnings: List[NamingWarning]) -> List[Tuple[str, str]]:
+    """
+    Identifies each warning by its rule and the normalized content of its line, so a warning
+    that only moved with its line is not reported as resolved and new again.
+    """
+    if not warnings:
+        return []
+    with open_lines(input_file, 0) as code:
+        lines = list(code or ())
+    return [
+        (warning.rule, normalize_line(lines[warning.line - 1]) if 0 < warning.line <= len(lines) else "")
+        for warning in warnings
+    ]
+
+
+def _difference(
+    warnings: List[NamingWarning], keys: List[Tuple[str, str]], other_keys: List[Tuple[str, str]]
+) -> List[NamingWarning]:
+    """
+    Returns the warnings whose key is not matched by one of the other keys.
+    """
+    remaining = Counter(other_keys)
+    difference = []
+    for warning, key in zip(warnings, keys):
+        if remaining[key]:
+            remaining[key] -= 1
+        else:
+            difference.append(warning)
+    return difference
+
+
+class WatchSession:
+    """
+    Keeps the warnings of every file of a tree and, when files change, analyzes again only
+    the files affected: the changed files, and the C files whose included headers declare
+    different types since.
+
+    Attributes:
+        directory (str): The watched directory.
+        warnings (Dict[str, List[NamingWarning]]): The current warnings of each file.
+    """
+    def __init__(
+        self,
+        directory: str,
+        is_excluded: Optional[Callable[[str], bool]] = None,
+        jobs: int = 1,
+        type_index: Optional[TypeIndex] = None,
+        **options,
+    ):
+        self.directory = directory
+        self.is_excluded = is_excluded
+        self.jobs = jobs
+        self.type_index = type_index
+        self.options = options
+        self.warnings: Dict[str, List[NamingWarning]] = {}
+        self.keys: Dict[str, List[Tuple[str, str]]] = {}
+
+    def _analyze(self, files: List[str]) -> Iterator[Tuple[str, List[NamingWarning]]]:
+        return analyze_files(files, self.jobs, type_index=self.type_index, **self.options)
+
+    def start(self) -> List[NamingWarning]:
+        """
+        Analyzes the whole tree.
+
+        Returns:
+            List[NamingWarning]: Every warning, in file order.
+        """
+        files = discover_files([self.directory], self.is_excluded)
+        if self.type_index is not None:
+            self.type_index.update(files, self.jobs)
+        found = []
+        for input_file, warnings in self._analyze(files):
+            self.warnings[input_file] = warnings
+            self.keys[input_file] = _warning_keys(input_file, warnings)
+            found.extend(warnings)
+        return found
+
+    def refresh(self, changed: Optional[Set[str]]) -> Tuple[List[NamingWarning], List[NamingWarning], int]:
+        """
+        Analyzes the files affected by a set of changes.
+
+        Args:
+            changed (Optional[Set[str]]): The files and deleted directories that changed, or
+                                          None if anything may have changed.
+
+        Returns:
+            Tuple[List[NamingWarning], List[NamingWarning], int]: The new warnings, the
+                                                                  resolved warnings, and the
+                                                                  number of files analyzed.
+        """
+        if changed is None:
+            changed = set(discover_files([self.directory], self.is_excluded)) | set(self.warnings)
+        for path in list(changed):
+            if path not in self.warnings and not os.path.exists(path):
+                # A deleted directory: everything that was below it is gone too.
+                prefix = os.path.join(path, "")
+                changed.update(input_file for input_file in self.warnings if input_file.startswith(prefix))
+        present = {
+            path
+            for path in changed
+            if os.path.isfile(path)
+            and os.path.splitext(path)[1] in ANALYZED_EXTENSIONS
+            and (self.is_excluded is None or not self.is_excluded(path))
+        }
+        removed = {path for path in changed if path in self.warnings and path not in present}
+        affected = set(present)
+        if self.type_index is not None:
+            c_files = [path for path in self.warnings if os.path.splitext(path)[1] in C_EXTENSIONS and path not in removed]
+            before = {path: self.type_index.types_for(path) for path in c_files}
+            self.type_index.update(sorted(present | removed), self.jobs)
+            affected.update(path for path in c_files if self.type_index.types_for(path) != before[path])
+
+        added, resolved = [], []
+        for path in sorted(removed):
+            resolved.extend(self.warnings.pop(path))
+            del self.keys[path]
+        for input_file, warnings in self._analyze(sorted(affected)):
+            keys = _warning_keys(input_file, warnings)
+            old_warnings, old_keys = self.warnings.get(input_file, []), self.keys.get(input_file, [])
+            added.extend(_difference(warnings, keys, old_keys))
+            resolved.extend(_difference(old_warnings, old_keys, keys))
+            self.warnings[input_file] = warnings
+            self.keys[input_file] = keys
+        return added, resolved, len(affected)
+
+    def count(self) -> int:
+        """
+        Returns the number of current warnings.
+        """
+        return sum(len(warnings) for warnings in self.warnings.values())
+
+
+def _format(sign: str, warning: NamingWarning, severities: Dict[str, str]) -> str:
+    label = SEVERITY_LABELS[severities.get(warning.rule, DEFAULT_SEVERITY)]
+    return f"{sign}{warning.file}: {warning.format(label)}\n"
+
+
+def watch(
+    directory: str,
+    stream: TextIO = sys.stdout,
+    severities: Optional[Dict[str, str]] = None,
+    is_excluded: Optional[Callable[[str], bool]] = None,
+    jobs: int = 1,
+    type_index: Optional[TypeIndex] = None,
+    debounce: float = DEFAULT_DEBOUNCE,
+    **options,
+) -> None:
+    """
+    Analyzes a tree, then keeps running and reports how the warnings change as files are
+    saved, until interrupted.
+
+    The whole report is written once. Afterwards, for each burst of changes, only the files
+    affected are analyzed again, and the resolved warnings are written prefixed with `-`
+    and the new ones with `+`. A warning whose line only moved is neither.
+
+    Args:
+        directory (str): The directory to watch.
+        stream (TextIO): Where the report and the changes are written.
+        severities (Optional[Dict[str, str]]): The severity of each rule.
+        is_excluded (Optional[Callable[[str], bool]]): Tells whether a path is excluded.
+        jobs (int): The number of worker processes, `0` meaning one per CPU.
+        type_index (Optional[TypeIndex]): The index of the struct types declared by headers.
+        debounce (float): The seconds without change that end a burst of changes.
+        **options: Keyword arguments forwarded to `analyze_file`.
+    """
+    severities = severities or {}
+    # Watching starts first, so the files saved during the first analysis are not missed.
+    watcher = open_watcher(directory, is_excluded)
+    session = WatchSession(directory, is_excluded, jobs, type_index, **options)
+    try:
+        for warning in session.start():
+            stream.write(_format("", warning, severities))
+        stream.flush()
+        print(
+            f"Watching {directory} ({watcher.name}): {session.count()} warnings in {len(session.warnings)} files.",
+            file=sys.stderr,
+        )
+        while True:
+            changed = wait_for_changes(watcher, debounce)
+            added, resolved, analyzed = session.refresh(changed)
+            for warning in resolved:
+                stream.write(_format("- ", warning, severities))
+            for warning in added:
+                stream.write(_format("+ ", warning, severities))
+            stream.flush()
+            print(
+                f"Analyzed {analyzed} files: {len(added)} new, {len(resolved)} resolved, "
+                f"{session.count()} warnings.",
+                file=sys.stderr,
+            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        if type_index is not None:
+            type_index.save()
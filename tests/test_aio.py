@@ -0,0 +1,58 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from naming_check import aio
+from naming_check.aio import analyze_many
+
+SLOW_SECONDS = 1.0
+
+
+def collect(*args, **kwargs):
+    async def run():
+        return [result async for result in analyze_many(*args, **kwargs)]
+
+    return asyncio.run(run())
+
+
+class AnalyzeManyTest(unittest.TestCase):
+    def test_paths_and_buffers_in_order(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "module.c")
+            with open(path, "w") as file:
+                file.write("int fooBar;\n")
+            missing = os.path.join(directory, "missing.c")
+            results = collect([path, ("snippet.py", "x = 1\n"), ("legacy.c", b"int y;\n"), missing], jobs=2)
+        self.assertEqual([result.name for result in results], [path, "snippet.py", "legacy.c", missing])
+        self.assertEqual(
+            [[warning.rule for warning in result.warnings] for result in results],
+            [["c-variable-snake-case"], ["py-variable-length"], ["c-variable-length"], []],
+        )
+        self.assertEqual([result.error for result in results[:3]], [None, None, None])
+        self.assertIsInstance(results[3].error, FileNotFoundError)
+
+    def test_timeout_does_not_expire_the_jobs_queued_behind(self):
+        analyze_buffer = aio._analyze_buffer
+
+        def slow_analyze_buffer(name, content, options):
+            if name == "slow.c":
+                time.sleep(SLOW_SECONDS)
+            return analyze_buffer(name, content, options)
+
+        sources = [("slow.c", "int x;\n")] + [(f"fast_{index}.c", "int y;\n") for index in range(3)]
+        with ThreadPoolExecutor(max_workers=1) as executor, mock.patch.object(aio, "_analyze_buffer", slow_analyze_buffer):
+            results = collect(sources, jobs=1, timeout=SLOW_SECONDS / 4, executor=executor)
+        self.assertIsInstance(results[0].error, TimeoutError)
+        self.assertEqual(results[0].warnings, [])
+        for result in results[1:]:
+            with self.subTest(name=result.name):
+                self.assertIsNone(result.error)
+                self.assertEqual([warning.rule for warning in result.warnings], ["c-variable-length"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+from naming_check.baseline import Baseline
+from naming_check.cache import ResultCache
+from naming_check.main import analyze_file, analyze_files
+
+C_SOURCE = """\
+int fooBar = 1;
+int x = 2;
+"""
+
+INLINE_C = """\
+int fooBar = 1; // naming-check: ignore
+int x = 2; // naming-check: ignore[c-variable-snake-case]
+int y = 3; // naming-check: ignore[c-variable-snake-case, c-variable-length]
+"""
+
+INLINE_PYTHON = """\
+class bad_class:  # naming-check: ignore
+    x = 1  # naming-check: ignore[py-class-pascal-case]
+    y = 2  # naming-check: ignore[py-variable-length]
+"""
+
+
+class SuppressionTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as file:
+            file.write(text)
+        return path
+
+    def rules(self, path, **options):
+        return [(warning.rule, warning.line) for warning in analyze_file(path, **options)]
+
+    def test_inline_comments(self):
+        self.assertEqual(self.rules(self.write("module.c", INLINE_C)), [("c-variable-length", 2)])
+        path = self.write("module.py", INLINE_PYTHON)
+        for engine in ("regex", "ast"):
+            with self.subTest(engine=engine):
+                self.assertEqual(self.rules(path, python_engine=engine), [("py-variable-length", 2)])
+
+    def test_baseline_survives_unrelated_edits(self):
+        path = self.write("module.c", C_SOURCE)
+        baseline_path = os.path.join(self.directory, "baseline.json")
+        Baseline.write(baseline_path, [(path, analyze_file(path))])
+        baseline = Baseline.load(baseline_path)
+        self.assertEqual(len(baseline.fingerprints), 2)
+        self.assertEqual(self.rules(path, baseline=baseline), [])
+
+        self.write("module.c", "#include <stdio.h>\n\n" + C_SOURCE.replace("int x = 2;", "  int   x = 2;"))
+        self.assertEqual(self.rules(path, baseline=baseline), [])
+        self.write("module.c", C_SOURCE.replace("int x = 2;", "int x = 3;") + "int otherName;\n")
+        self.assertEqual(
+            self.rules(path, baseline=baseline),
+            [("c-variable-length", 2), ("c-variable-snake-case", 3)],
+        )
+
+    def test_baseline_is_keyed_by_path(self):
+        path = self.write("module.c", C_SOURCE)
+        copy = self.write("copy.c", C_SOURCE)
+        baseline_path = os.path.join(self.directory, "baseline.json")
+        baseline = Baseline.write(baseline_path, [(path, analyze_file(path))])
+        cache = ResultCache(None)
+        for _ in range(2):
+            results = dict(analyze_files([path, copy], cache=cache, baseline=baseline))
+            self.assertEqual(results[path], [])
+            self.assertEqual(len(results[copy]), 2)
+
+    def test_invalid_baseline_is_refused(self):
+        with self.assertRaises(ValueError):
+            Baseline.load(self.write("baseline.json", '{"version": 0}'))
+        with self.assertRaises(FileNotFoundError):
+            Baseline.load(os.path.join(self.directory, "missing.json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+from naming_check.cache import ResultCache
+from naming_check.main import analyze_files
+
+MODULE = """\
+def badName():
+    X = 1
+"""
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.path = os.path.join(self.directory, "module.py")
+        self.write(MODULE)
+
+    def write(self, text):
+        with open(self.path, "w") as file:
+            file.write(text)
+
+    def analyze(self, cache, **options):
+        return [warning.rule for _, warnings in analyze_files([self.path], cache=cache, **options) for warning in warnings]
+
+    def test_unchanged_file_is_served_from_the_cache(self):
+        cache = ResultCache(None)
+        first = self.analyze(cache)
+        self.assertTrue(first)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(self.analyze(cache), first)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_changed_content_is_analyzed_again(self):
+        cache = ResultCache(None)
+        first = self.analyze(cache)
+        self.write(MODULE + "Y = 2\n")
+        warnings = self.analyze(cache)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+        self.assertEqual(len(warnings), len(first) + 1)
+
+    def test_changed_options_are_analyzed_again(self):
+        cache = ResultCache(None)
+        self.analyze(cache)
+        for options in ({"python_engine": "ast"}, {"enabled_rules": ("py-variable-length",)}):
+            with self.subTest(options=options):
+                misses = cache.misses
+                self.analyze(cache, **options)
+                self.assertEqual(cache.misses, misses + 1)
+        self.assertEqual(self.analyze(cache, enabled_rules=("py-variable-length",)), ["py-variable-length"])
+
+    def test_saved_entries_are_loaded_by_the_next_run(self):
+        cache_dir = os.path.join(self.directory, "cache")
+        cache = ResultCache(cache_dir)
+        first = self.analyze(cache)
+        cache.save()
+        cache = ResultCache(cache_dir)
+        self.assertEqual(self.analyze(cache), first)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = ResultCache(None, max_entries=1)
+        self.analyze(cache)
+        self.analyze(cache, python_engine="ast")
+        self.analyze(cache)
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+import unittest
+
+from naming_check.config import Config, find_config, load_config
+from naming_check.main import analyze
+
+CONFIG = """\
+select = ["c-variable-*"]
+ignore = ["c-variable-length"]
+exclude = ["build/**", "*_generated.c"]
+
+[severity]
+c-variable-snake-case = "error"
+"""
+
+SOURCE = """\
+int fooBar = 1;
+int x = 2;
+"""
+
+RULE_IDS = ["c-variable-snake-case", "c-variable-length", "py-variable-length"]
+
+
+class ConfigTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(text)
+        return path
+
+    def test_select_and_ignore_accept_globs(self):
+        self.assertEqual(Config().enabled_rules(RULE_IDS), None)
+        self.assertEqual(Config(select=("c-*",)).enabled_rules(RULE_IDS), ("c-variable-length", "c-variable-snake-case"))
+        self.assertEqual(Config(ignore=("*-length",)).enabled_rules(RULE_IDS), ("c-variable-snake-case",))
+        with self.assertRaises(ValueError):
+            Config(select=("c-unknown",)).enabled_rules(RULE_IDS)
+
+    def test_exclusion_filter(self):
+        is_excluded = Config(exclude=("build/**", "*_generated.c"), root=self.directory).exclusion_filter()
+        for name, excluded in [
+            ("build", True),
+            ("build/deep/main.c", True),
+            ("src/parser_generated.c", True),
+            ("src/main.c", False),
+        ]:
+            with self.subTest(name=name):
+                self.assertEqual(is_excluded(os.path.join(self.directory, name)), excluded)
+        self.assertIsNone(Config().exclusion_filter())
+
+    def test_configuration_is_found_upwards(self):
+        self.write("pyproject.toml", "[tool.naming_check]\n" + CONFIG.replace("[severity]", "[tool.naming_check.severity]"))
+        os.makedirs(os.path.join(self.directory, "src", "lib"))
+        config_file = find_config(os.path.join(self.directory, "src", "lib"))
+        self.assertEqual(config_file, os.path.join(self.directory, "pyproject.toml"))
+        config = load_config(config_file)
+        self.assertEqual(config.select, ("c-variable-*",))
+        self.assertEqual(config.severity, {"c-variable-snake-case": "error"})
+        self.assertEqual(config.root, self.directory)
+
+    def test_invalid_settings_are_refused(self):
+        for text in ['selected = ["c-*"]\n', 'select = "c-*"\n', '[severity]\nc-variable-length = "fatal"\n']:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    load_config(self.write(".naming_check.toml", text))
+
+    def test_run_applies_the_configuration(self):
+        config_file = self.write(".naming_check.toml", CONFIG)
+        self.write("src/main.c", SOURCE)
+        self.write("src/parser_generated.c", SOURCE)
+        self.write("build/out.c", SOURCE)
+        output = os.path.join(self.directory, "warnings.jsonl")
+        analyze([self.directory, "--config", config_file, "--format", "jsonl", "-o", output])
+        with open(output) as file:
+            records = [json.loads(line) for line in file]
+        self.assertEqual(
+            [(os.path.relpath(record["file"], self.directory), record["rule"], record["severity"]) for record in records],
+            [(os.path.join("src", "main.c"), "c-variable-snake-case", "error")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
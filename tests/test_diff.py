@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+from naming_check.diff import parse_unified_diff
+from naming_check.main import analyze_file
+
+TRY_STATEMENT = """\
+try:
+    a = 1
+except ValueError as e:
+    b = 2
+else:
+    c = 3
+finally:
+    d = 4
+for i in range(3):
+    f = 5
+else:
+    g = 6
+"""
+
+
+# Hunks whose removed and added lines look like file headers: "-- comment" and "++counter;"
+# become "--- comment" and "+++counter;" once the diff marks them.
+HEADER_LIKE_DIFF = """\
+diff --git a/src/counter.c b/src/counter.c
+--- a/src/counter.c
++++ b/src/counter.c
+@@ -1,3 +1,3 @@
+ int count;
+--- comment
++++ comment
+ int total;
+@@ -10 +10 @@
+-old_name = 1;
++new_name = 1;
+diff --git a/src/removed.c b/src/removed.c
+--- a/src/removed.c
++++ /dev/null
+@@ -1,2 +0,0 @@
+--- a/src/other.c
+-int x;
+"""
+
+
+class FilterChangedLinesTest(unittest.TestCase):
+    def test_every_changed_line_keeps_its_warnings(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "module.py")
+            with open(path, "w") as file:
+                file.write(TRY_STATEMENT)
+            for engine in ("regex", "ast"):
+                warnings = analyze_file(path, python_engine=engine)
+                self.assertTrue(warnings)
+                for line in {warning.line for warning in warnings}:
+                    with self.subTest(engine=engine, line=line):
+                        self.assertEqual(
+                            analyze_file(path, python_engine=engine, changed_lines={line}),
+                            [warning for warning in warnings if warning.line == line],
+                        )
+
+
+class ParseUnifiedDiffTest(unittest.TestCase):
+    def test_header_like_lines_inside_hunks(self):
+        self.assertEqual(
+            parse_unified_diff(HEADER_LIKE_DIFF.splitlines(keepends=True)),
+            {"src/counter.c": {2, 10}},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
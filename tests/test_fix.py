@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+
+from naming_check.fix import fix_files, to_pascal_case, to_snake_case, to_upper_case
+from naming_check.type_index import TypeIndex
+
+PYTHON_MODULE = """\
+class my_class:
+    pass
+
+
+def doWork(x):
+    return my_class()
+
+
+def do_work():
+    pass
+
+
+def runTask():
+    return f"{runTask.__name__}"
+
+
+print(doWork(1), runTask())
+"""
+
+C_SOURCE = """\
+int fooBar = 1;
+int takenName = 3;
+int taken_name = 4;
+/* fooBar */
+int main(void) { return fooBar + takenName; }
+"""
+
+HEADER = """\
+int sharedCount;
+"""
+
+FIRST_UNIT = """\
+#include "api.h"
+int compute(void) {
+    int localTotal = 1;
+    return localTotal + sharedCount;
+}
+"""
+
+SECOND_UNIT = """\
+int localTotal;
+int use(void) { return sharedCount; }
+"""
+
+OTHER_UNIT = """\
+int read_total(void) { return localTotal; }
+"""
+
+
+class ConversionTest(unittest.TestCase):
+    def test_conversions(self):
+        for convert, name, expected in [
+            (to_snake_case, "parseHTTPHeader", "parse_http_header"),
+            (to_snake_case, "__privateName__", "__private_name__"),
+            (to_pascal_case, "http_status", "HttpStatus"),
+            (to_pascal_case, "HTTP_STATUS", "HttpStatus"),
+            (to_pascal_case, "_private_class", "_PrivateClass"),
+            (to_upper_case, "maxSize", "MAX_SIZE"),
+        ]:
+            with self.subTest(name=name):
+                self.assertEqual(convert(name), expected)
+
+
+class FixFilesTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as file:
+            file.write(text)
+        return path
+
+    def read(self, path):
+        with open(path) as file:
+            return file.read()
+
+    def test_python_names_are_renamed_with_their_references(self):
+        path = self.write("module.py", PYTHON_MODULE)
+        report = fix_files([path], python_engine="ast")
+        self.assertEqual(report.renames, {path: {"my_class": "MyClass", "runTask": "run_task"}})
+        self.assertEqual(
+            self.read(path),
+            PYTHON_MODULE.replace("my_class", "MyClass").replace("runTask", "run_task"),
+        )
+
+    def test_names_already_taken_are_skipped(self):
+        path = self.write("module.c", C_SOURCE)
+        report = fix_files([path])
+        self.assertEqual(report, (({path: {"fooBar": "foo_bar"}}), 1, 2))
+        self.assertEqual(self.read(path), C_SOURCE.replace("int fooBar", "int foo_bar").replace("fooBar +", "foo_bar +"))
+
+    def test_c_names_are_renamed_in_their_declaring_file(self):
+        first = self.write("first.c", FIRST_UNIT)
+        second = self.write("second.c", SECOND_UNIT)
+        other = self.write("other.c", OTHER_UNIT)
+        header = self.write("api.h", HEADER)
+        fix_files([first, second, other])
+        self.assertEqual(self.read(first), FIRST_UNIT.replace("localTotal", "local_total"))
+        self.assertEqual(self.read(second), SECOND_UNIT.replace("localTotal", "local_total"))
+        self.assertEqual(self.read(other), OTHER_UNIT)
+        self.assertEqual(self.read(header), HEADER)
+
+    def test_names_declared_in_indexed_headers_are_renamed_across_the_project(self):
+        first = self.write("first.c", FIRST_UNIT)
+        second = self.write("second.c", SECOND_UNIT)
+        header = self.write("api.h", HEADER)
+        files = [header, first, second]
+        index = TypeIndex()
+        index.update(files)
+        report = fix_files(files, type_index=index)
+        self.assertEqual(report.renames[header], {"sharedCount": "shared_count"})
+        self.assertEqual(self.read(header), HEADER.replace("sharedCount", "shared_count"))
+        self.assertEqual(
+            self.read(first),
+            FIRST_UNIT.replace("localTotal", "local_total").replace("sharedCount", "shared_count"),
+        )
+        self.assertEqual(
+            self.read(second),
+            SECOND_UNIT.replace("localTotal", "local_total").replace("sharedCount", "shared_count"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import random
+import unittest
+
+from naming_check.incremental import IncrementalDocument
+from naming_check.main import create_analyzer
+
+C_SNIPPETS = [
+    "int value_{0} = {0};",
+    "int badName{0} = {0};",
+    "int x;",
+    "#define limit_{0} {0}",
+    "struct Point{0} {{",
+    "    int fieldName{0};",
+    "}};",
+    "/* int inComment{0};",
+    "   still a comment */",
+    "void doThing{0}(void);",
+    "",
+]
+
+PYTHON_SNIPPETS = [
+    "value_{0} = {0}",
+    "x = {0}",
+    '"""',
+    "y = {0}",
+    "def run_{0}():",
+    "    z = {0}",
+    "",
+]
+
+
+def offset(text, line, character):
+    """
+    Converts an editor position into an offset in a text.
+    """
+    lines = text.split("\n")
+    return sum(len(previous) + 1 for previous in lines[:line]) + character
+
+
+def generate(snippets, count, generator):
+    return [generator.choice(snippets).format(index) for index in range(count)]
+
+
+class IncrementalDocumentTest(unittest.TestCase):
+    def check_random_edits(self, path, snippets, **options):
+        generator = random.Random(0)
+        text = "\n".join(generate(snippets, 300, generator))
+        document = IncrementalDocument(path, text, checkpoint_interval=16, **options)
+        for _ in range(100):
+            lines = text.split("\n")
+            start_line = generator.randrange(len(lines))
+            end_line = min(len(lines) - 1, start_line + generator.choice([0, 0, 1, 5]))
+            start_character = generator.randint(0, len(lines[start_line]))
+            end_character = generator.randint(0, len(lines[end_line]))
+            if end_line == start_line:
+                start_character, end_character = sorted([start_character, end_character])
+            replacement = "\n".join(generate(snippets, generator.choice([0, 1, 3]), generator))
+            text = text[:offset(text, start_line, start_character)] + replacement + text[offset(text, end_line, end_character):]
+            document.apply_edit(start_line, start_character, end_line, end_character, replacement)
+            expected = create_analyzer(text.split("\n"), path, **options).analyze()
+            self.assertEqual(document.warnings, expected)
+
+    def test_c_edits_match_a_full_analysis(self):
+        self.check_random_edits("module.c", C_SNIPPETS)
+
+    def test_python_edits_match_a_full_analysis(self):
+        for engine in ("regex", "ast"):
+            with self.subTest(engine=engine):
+                self.check_random_edits("module.py", PYTHON_SNIPPETS, python_engine=engine)
+
+    def test_local_edit_stops_at_an_unchanged_checkpoint(self):
+        text = "\n".join(f"int value_{index} = {index};" for index in range(1000))
+        document = IncrementalDocument("module.c", text, checkpoint_interval=16)
+        document.apply_edit(500, 4, 500, 9, "badName")
+        self.assertLessEqual(document.lines_analyzed, 32)
+        self.assertEqual([(warning.rule, warning.line) for warning in document.warnings], [("c-variable-snake-case", 501)])
+        document.apply_edit(10, 0, 10, 0, "int x;\n")
+        self.assertLessEqual(document.lines_analyzed, 32)
+        self.assertEqual(
+            [(warning.rule, warning.line) for warning in document.warnings],
+            [("c-variable-length", 11), ("c-variable-snake-case", 502)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
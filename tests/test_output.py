@@ -0,0 +1,80 @@
+import io
+import json
+import unittest
+
+from naming_check.output import WRITERS
+from naming_check.warning import NamingWarning
+
+WARNINGS = [
+    NamingWarning("c-variable-snake-case", 3, 5, "src/main.c"),
+    NamingWarning("py-variable-length", 1, 1, "app/module.py"),
+]
+
+SEVERITIES = {"c-variable-snake-case": "error"}
+
+
+def write(format_name, warnings):
+    stream = io.StringIO()
+    writer = WRITERS[format_name](stream, True, SEVERITIES)
+    writer.begin()
+    for warning in warnings:
+        writer.write(warning)
+    writer.end()
+    return stream.getvalue()
+
+
+class OutputTest(unittest.TestCase):
+    def test_text(self):
+        self.assertEqual(
+            write("text", WARNINGS),
+            "src/main.c: ERROR: [3] Variables names should be declared in snake case.\n"
+            "app/module.py: WARN: [1] Variables names should have length greater than one.\n",
+        )
+
+    def test_json_lines(self):
+        records = [json.loads(line) for line in write("jsonl", WARNINGS).splitlines()]
+        self.assertEqual(records, [
+            {
+                "file": "src/main.c",
+                "line": 3,
+                "column": 5,
+                "rule": "c-variable-snake-case",
+                "severity": "error",
+                "message": "Variables names should be declared in snake case.",
+            },
+            {
+                "file": "app/module.py",
+                "line": 1,
+                "column": 1,
+                "rule": "py-variable-length",
+                "severity": "warning",
+                "message": "Variables names should have length greater than one.",
+            },
+        ])
+
+    def test_sarif(self):
+        log = json.loads(write("sarif", WARNINGS))
+        self.assertEqual(log["version"], "2.1.0")
+        self.assertIn("$schema", log)
+        [run] = log["runs"]
+        self.assertEqual(run["tool"]["driver"]["name"], "naming_check")
+        self.assertIn("c-variable-snake-case", [rule["id"] for rule in run["tool"]["driver"]["rules"]])
+        self.assertEqual(run["results"][0], {
+            "ruleId": "c-variable-snake-case",
+            "level": "error",
+            "message": {"text": "Variables names should be declared in snake case."},
+            "locations": [{
+                "physicalLocation": {
+                    "artifactLocation": {"uri": "src/main.c"},
+                    "region": {"startLine": 3, "startColumn": 5},
+                },
+            }],
+        })
+        self.assertEqual([result["level"] for result in run["results"]], ["error", "warning"])
+
+    def test_empty_sarif_is_valid(self):
+        self.assertEqual(json.loads(write("sarif", []))["runs"][0]["results"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
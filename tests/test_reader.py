@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from naming_check import reader
+from naming_check.main import analyze_file
+from naming_check.reader import iter_lines, open_lines
+
+
+class ReaderTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, data):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as file:
+            file.write(data)
+        return path
+
+    def read(self, path, max_size=reader.DEFAULT_MAX_FILE_SIZE):
+        with open_lines(path, max_size) as lines:
+            return None if lines is None else list(lines)
+
+    def test_each_line_falls_back_to_latin_1(self):
+        path = self.write("legacy.c", "/* café */\r\n".encode("utf-8") + "int count; /* naïve */\n".encode("latin-1") + b"int x;")
+        self.assertEqual(self.read(path), ["/* café */", "int count; /* naïve */", "int x;"])
+        self.assertEqual([warning.line for warning in analyze_file(path)], [3])
+
+    def test_byte_order_mark_is_dropped(self):
+        self.assertEqual(self.read(self.write("bom.py", b"\xef\xbb\xbfx = 1\n")), ["x = 1"])
+
+    def test_binary_and_oversized_files_are_skipped(self):
+        binary = self.write("data.c", b"int x;\n\0\1\2")
+        self.assertIsNone(self.read(binary))
+        self.assertEqual(analyze_file(binary), [])
+        large = self.write("large.c", b"int x;\n" * 10)
+        self.assertIsNone(self.read(large, 69))
+        self.assertEqual(len(self.read(large, 70)), 10)
+        self.assertEqual(len(self.read(large, 0)), 10)
+        self.assertEqual(analyze_file(large, max_file_size=69), [])
+
+    def test_empty_file_has_no_lines(self):
+        self.assertEqual(self.read(self.write("empty.c", b"")), [])
+
+    def test_lines_do_not_depend_on_block_boundaries(self):
+        data = "".join(f"int value_{index} = {index}; /* é */\n" for index in range(200)).encode("utf-8") + b"last"
+        expected = data.decode("utf-8").split("\n")
+        for block_size in (1, 7, 64, 1 << 16):
+            with self.subTest(block_size=block_size), mock.patch.object(reader, "BLOCK_SIZE", block_size):
+                self.assertEqual(list(iter_lines(data)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from naming_check.analyzers.python_analyzer import PythonAnalyzer
+from naming_check.constants import WARNING_MESSAGES
+from naming_check.rules.registry import BUILTIN_RULES, C, PYTHON, Rule, RuleRegistry, plugins_may_be_installed
+
+PLUGIN_MODULE = """\
+from naming_check.rules.registry import PYTHON, Rule
+
+
+def no_temporary_names(name, text):
+    return not name.startswith("tmp")
+
+
+def register(registry):
+    registry.register(Rule("plugin-no-temporary", PYTHON, "variable", no_temporary_names), "No temporary names.")
+"""
+
+ENTRY_POINTS = """\
+[naming_check.rules]
+temporary = naming_check_test_plugin:register
+"""
+
+
+def builtin_registry():
+    registry = RuleRegistry()
+    for rule in BUILTIN_RULES:
+        registry.register(rule)
+    return registry
+
+
+class RuleRegistryTest(unittest.TestCase):
+    def forget_message(self, rule_id):
+        self.addCleanup(WARNING_MESSAGES.pop, rule_id, None)
+
+    def test_dispatch_groups_rules_by_kind(self):
+        table = builtin_registry().dispatch(C)
+        self.assertEqual(
+            [rule.id for rule in table["declaration"]],
+            ["c-initialize-all-variables", "c-mixed-pointer-declaration", "c-variable-snake-case", "c-variable-length"],
+        )
+        self.assertEqual([rule.id for rule in table["struct_typedef"]], ["c-struct-lowercase"])
+        self.assertNotIn("variable", table)
+
+    def test_dispatch_keeps_enabled_rules(self):
+        table = builtin_registry().dispatch(PYTHON, ["py-class-pascal-case"])
+        self.assertEqual(table, {"variable": (), "function": (), "class": table["class"]})
+        self.assertEqual([rule.id for rule in table["class"]], ["py-class-pascal-case"])
+
+    def test_invalid_rules_are_refused(self):
+        registry = builtin_registry()
+        invalid = [
+            (Rule("c-variable-length", C, "declaration", bool), None),
+            (Rule("custom", "cobol", "variable", bool), "Message."),
+            (Rule("custom", PYTHON, "struct", bool), "Message."),
+            (Rule("custom", PYTHON, "variable", bool), None),
+        ]
+        for rule, message in invalid:
+            with self.subTest(rule=rule):
+                with self.assertRaises(ValueError):
+                    registry.register(rule, message)
+
+    def test_registered_rule_runs_without_changing_the_analyzer(self):
+        self.forget_message("py-no-temporary")
+        registry = builtin_registry()
+        registry.register(
+            Rule("py-no-temporary", PYTHON, "variable", lambda name, text: not name.startswith("tmp")),
+            "Variables should not be temporary.",
+        )
+        warnings = PythonAnalyzer(["tmp_value = 1", "value = 2"], "module.py", registry.dispatch(PYTHON)).analyze()
+        self.assertEqual([(warning.rule, warning.line) for warning in warnings], [("py-no-temporary", 1)])
+        self.assertEqual(warnings[0].message, "Variables should not be temporary.")
+
+    def test_plugins_are_loaded_from_entry_points(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "naming_check_test_plugin.py"), "w") as file:
+                file.write(PLUGIN_MODULE)
+            metadata = os.path.join(directory, "naming_check_test_plugin-1.0.dist-info")
+            os.mkdir(metadata)
+            with open(os.path.join(metadata, "METADATA"), "w") as file:
+                file.write("Metadata-Version: 2.1\nName: naming-check-test-plugin\nVersion: 1.0\n")
+            with open(os.path.join(metadata, "entry_points.txt"), "w") as file:
+                file.write(ENTRY_POINTS)
+            sys.path.insert(0, directory)
+            self.addCleanup(sys.modules.pop, "naming_check_test_plugin", None)
+            self.addCleanup(sys.path.remove, directory)
+            self.forget_message("plugin-no-temporary")
+
+            self.assertTrue(plugins_may_be_installed())
+            registry = builtin_registry()
+            registry.load_plugins()
+        self.assertIn("plugin-no-temporary", registry.rule_ids())
+        self.assertEqual(registry.plugins, ["temporary=naming_check_test_plugin:register 1.0"])
+        self.assertEqual([rule.id for rule in registry.dispatch(PYTHON)["variable"]][-1], "plugin-no-temporary")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from naming_check.main import analyze
+from naming_check.shard import assign_shards
+
+SHARD_COUNT = 3
+
+
+def run(argv):
+    with contextlib.redirect_stderr(io.StringIO()):
+        analyze(argv)
+
+
+class ShardTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.tree = os.path.join(self.directory, "src")
+        os.mkdir(self.tree)
+        for index in range(12):
+            with open(os.path.join(self.tree, f"unit_{index}.c"), "w") as file:
+                file.write("int value;\n" * index + "int badName;\nint x;\n")
+        with open(os.path.join(self.tree, "module.py"), "w") as file:
+            file.write("x = 1\n")
+
+    def read(self, path):
+        with open(path) as file:
+            return file.read()
+
+    def shard_files(self, output_format):
+        paths = []
+        for index in range(1, SHARD_COUNT + 1):
+            path = os.path.join(self.directory, f"shard-{index}.json")
+            run([self.tree, "--shard", f"{index}/{SHARD_COUNT}", "--shard-output", path, "--format", output_format, "-o", os.devnull])
+            paths.append(path)
+        return paths
+
+    def test_merged_shards_match_an_unsharded_run(self):
+        for output_format in ("text", "jsonl", "sarif"):
+            with self.subTest(output_format=output_format):
+                expected = os.path.join(self.directory, f"full.{output_format}")
+                run([self.tree, "--format", output_format, "-o", expected])
+                merged = os.path.join(self.directory, f"merged.{output_format}")
+                run(["merge", *reversed(self.shard_files(output_format)), "--format", output_format, "-o", merged])
+                self.assertEqual(self.read(merged), self.read(expected))
+
+    def test_merge_needs_every_shard_once(self):
+        paths = self.shard_files("text")
+        for shard_files in (paths[:-1], paths + paths[:1]):
+            with self.subTest(shard_files=shard_files):
+                with self.assertRaises(ValueError):
+                    run(["merge", *shard_files, "-o", os.devnull])
+
+    def test_assignment_is_balanced_and_stable(self):
+        files = sorted(os.path.join(self.tree, name) for name in os.listdir(self.tree))
+        shards = assign_shards(files, SHARD_COUNT)
+        self.assertEqual(sorted(set(shards)), list(range(SHARD_COUNT)))
+        sizes = [0] * SHARD_COUNT
+        for input_file, shard in zip(files, shards):
+            sizes[shard] += os.path.getsize(input_file)
+        self.assertLess(max(sizes) - min(sizes), max(os.path.getsize(input_file) for input_file in files))
+        self.assertEqual(assign_shards(list(reversed(files)), SHARD_COUNT), list(reversed(shards)))
+
+
+if __name__ == "__main__":
+    unittest.main()
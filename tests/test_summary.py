@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from naming_check import main
+from naming_check.main import analyze_files
+from naming_check.summary import SummaryCache
+
+MODULE = """\
+class bad_class:
+    def badMethod(self, x):
+        Y = 1  # naming-check: ignore[py-variable-length]
+        return x
+"""
+
+RULE_SETS = [None, ("py-variable-length",), ("py-class-pascal-case", "py-function-snake-case")]
+
+
+class SummaryCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.path = os.path.join(self.directory, "module.py")
+        self.write(MODULE)
+        summarize = mock.patch.object(main, "summarize", wraps=main.summarize)
+        self.summarize = summarize.start()
+        self.addCleanup(summarize.stop)
+
+    def write(self, text):
+        with open(self.path, "w") as file:
+            file.write(text)
+
+    def analyze(self, summaries, **options):
+        [(_, warnings)] = analyze_files([self.path], summaries=summaries, **options)
+        return warnings
+
+    def test_rules_run_over_the_summary(self):
+        for engine in ("regex", "ast"):
+            summaries = SummaryCache(None)
+            for enabled_rules in RULE_SETS:
+                with self.subTest(engine=engine, enabled_rules=enabled_rules):
+                    self.assertEqual(
+                        self.analyze(summaries, python_engine=engine, enabled_rules=enabled_rules),
+                        self.analyze(None, python_engine=engine, enabled_rules=enabled_rules),
+                    )
+        # The file is summarized once per engine, whatever the rules.
+        self.assertEqual(self.summarize.call_count, 2)
+
+    def test_saved_summaries_are_reused(self):
+        cache_dir = os.path.join(self.directory, "cache")
+        summaries = SummaryCache(cache_dir)
+        expected = self.analyze(summaries, python_engine="ast")
+        summaries.save()
+        self.assertEqual(self.analyze(SummaryCache(cache_dir), python_engine="ast"), expected)
+        self.assertEqual(self.summarize.call_count, 1)
+
+    def test_changed_content_is_summarized_again(self):
+        summaries = SummaryCache(None)
+        self.analyze(summaries)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.analyze(summaries)
+        self.assertEqual(self.summarize.call_count, 1)
+        self.write(MODULE.replace("Y = 1", "Z = 1"))
+        self.assertEqual(
+            [(warning.rule, warning.line) for warning in self.analyze(summaries)],
+            [(warning.rule, warning.line) for warning in self.analyze(None)],
+        )
+        self.assertEqual(self.summarize.call_count, 2)
+
+    def test_skipped_files_are_not_cached(self):
+        summaries = SummaryCache(None)
+        self.assertEqual(self.analyze(summaries, python_engine="ast", max_file_size=10), [])
+        self.assertEqual(self.analyze(summaries, python_engine="ast"), self.analyze(None, python_engine="ast"))
+
+
+if __name__ == "__main__":
+    unittest.main()
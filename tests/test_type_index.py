@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from naming_check.main import analyze_files
+from naming_check.type_index import TypeIndex, scan_file
+
+GEOMETRY_HEADER = """\
+typedef struct {
+    int x;
+} point;
+struct shape {
+    int y;
+};
+"""
+
+API_HEADER = """\
+#include "geometry.h"
+"""
+
+MAIN = """\
+#include "include/api.h"
+point badName;
+"""
+
+
+class TypeIndexTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.geometry = self.write("include/geometry.h", GEOMETRY_HEADER)
+        self.api = self.write("include/api.h", API_HEADER)
+        self.main = self.write("main.c", MAIN)
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(text)
+        return path
+
+    def test_scan_finds_types_and_local_includes(self):
+        self.assertEqual(scan_file(self.geometry), (["point", "shape"], []))
+        self.assertEqual(scan_file(self.main), ([], [self.api]))
+
+    def test_types_of_included_headers_are_known(self):
+        index = TypeIndex()
+        self.assertEqual(index.update([self.main]), 3)
+        self.assertEqual(index.types_for(self.main), frozenset(["point", "shape"]))
+        self.assertEqual(index.types_for(self.geometry), frozenset())
+        [(_, warnings)] = analyze_files([self.main], type_index=index)
+        self.assertEqual([(warning.rule, warning.line) for warning in warnings], [("c-variable-snake-case", 2)])
+        [(_, warnings)] = analyze_files([self.main])
+        self.assertEqual(warnings, [])
+
+    def test_saved_index_only_rescans_changed_files(self):
+        cache_dir = os.path.join(self.directory, "cache")
+        index = TypeIndex(cache_dir)
+        index.update([self.main])
+        index.save()
+
+        index = TypeIndex(cache_dir)
+        self.assertEqual(index.update([self.main]), 0)
+        self.write("include/geometry.h", "struct circle {\n    int radius;\n};\n")
+        os.utime(self.geometry, ns=(0, 0))
+        self.assertEqual(index.update([self.main]), 1)
+        self.assertEqual(index.types_for(self.main), frozenset(["circle"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+from naming_check.main import c_analyzer, py_analyzer
+from naming_check.warning import NamingWarning
+
+
+class NamingWarningTest(unittest.TestCase):
+    def test_analyzers_report_records(self):
+        self.assertEqual(
+            c_analyzer(["int fooBar = 1;", "int x;"], "module.c"),
+            [
+                NamingWarning("c-variable-snake-case", 1, 1, "module.c"),
+                NamingWarning("c-variable-length", 2, 1, "module.c"),
+            ],
+        )
+        self.assertEqual(
+            py_analyzer(["class foo_bar:", "    pass"], "ast", "module.py"),
+            [NamingWarning("py-class-pascal-case", 1, 1, "module.py")],
+        )
+
+    def test_message_is_looked_up_from_the_rule(self):
+        warning = NamingWarning("c-constant-uppercase", 30, 9)
+        self.assertIsNone(warning.file)
+        self.assertEqual(warning.message, "All constants should be declared in uppercase.")
+        self.assertEqual(str(warning), "WARN: [30] All constants should be declared in uppercase.")
+        self.assertEqual(warning.format("ERROR"), "ERROR: [30] All constants should be declared in uppercase.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from naming_check.type_index import TypeIndex
+from naming_check.watch import PollingWatcher, WatchSession, open_watcher
+
+MODULE = """\
+x = 1
+value = 2
+"""
+
+HEADER = """\
+typedef struct {
+    int offset;
+} point;
+"""
+
+UNIT = """\
+#include "types.h"
+point badName;
+"""
+
+
+def summary(warnings):
+    return sorted((os.path.basename(warning.file), warning.rule, warning.line) for warning in warnings)
+
+
+class WatchSessionTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.module = self.write("module.py", MODULE)
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(text)
+        return path
+
+    def test_only_new_and_resolved_warnings_are_reported(self):
+        session = WatchSession(self.directory)
+        self.assertEqual(summary(session.start()), [("module.py", "py-variable-length", 1)])
+
+        # The warning of "x = 1" only moves down a line, and "y = 3" is new.
+        self.write("module.py", "import os\n" + MODULE + "y = 3\n")
+        added, resolved, analyzed = session.refresh({self.module})
+        self.assertEqual((summary(added), summary(resolved), analyzed), ([("module.py", "py-variable-length", 4)], [], 1))
+
+        self.write("module.py", "import os\nvalue = 2\n")
+        added, resolved, _ = session.refresh({self.module})
+        self.assertEqual(summary(added), [])
+        self.assertEqual(summary(resolved), [("module.py", "py-variable-length", 2), ("module.py", "py-variable-length", 4)])
+        self.assertEqual(session.count(), 0)
+
+    def test_deleted_files_and_directories_resolve_their_warnings(self):
+        nested = self.write("package/nested.py", "z = 1\n")
+        session = WatchSession(self.directory)
+        self.assertEqual(session.count(), 0)
+        session.start()
+        self.assertEqual(session.count(), 2)
+        shutil.rmtree(os.path.dirname(nested))
+        added, resolved, analyzed = session.refresh({os.path.dirname(nested)})
+        self.assertEqual((summary(added), summary(resolved), analyzed), ([], [("nested.py", "py-variable-length", 1)], 0))
+        os.remove(self.module)
+        added, resolved, _ = session.refresh(None)
+        self.assertEqual(summary(resolved), [("module.py", "py-variable-length", 1)])
+        self.assertEqual(session.warnings, {})
+
+    def test_header_changes_reanalyze_the_files_including_them(self):
+        header = self.write("types.h", "")
+        self.write("unit.c", UNIT)
+        session = WatchSession(self.directory, type_index=TypeIndex())
+        self.assertNotIn("unit.c", [name for name, _, _ in summary(session.start())])
+        self.write("types.h", HEADER)
+        added, resolved, analyzed = session.refresh({header})
+        self.assertEqual(summary(added), [("unit.c", "c-variable-snake-case", 2)])
+        self.assertEqual((resolved, analyzed), ([], 2))
+
+
+class WatcherTest(unittest.TestCase):
+    def test_watchers_report_changed_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for factory in (lambda: PollingWatcher(directory, interval=0.01), lambda: open_watcher(directory)):
+                watcher = factory()
+                with self.subTest(watcher=watcher.name):
+                    path = os.path.join(directory, watcher.name + ".py")
+                    try:
+                        self.assertEqual(watcher.changes(0.05), set())
+                        with open(path, "a") as file:
+                            file.write("x = 1\n")
+                        self.assertIn(path, watcher.changes(1.0))
+                    finally:
+                        watcher.close()
+
+
+if __name__ == "__main__":
+    unittest.main()